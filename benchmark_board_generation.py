@@ -0,0 +1,54 @@
+import argparse
+import sys
+import time
+import numpy as np
+
+from src.board import Board
+
+DEFAULT_BOARD_SIZES = (8, 16, 32, 64, 128, 256, 500)
+
+
+def get_scaled_board_config(board_size):
+    # Tile counts grow with the number of cells, the river and exits with the length of a side.
+    cell_scale = (board_size * board_size) / 64
+    side_scale = board_size / 8
+    return dict(height=board_size, width=board_size, river_max_num_turns=2, num_marshes=round(8 * cell_scale),
+                num_river_tiles=round(12 * side_scale), num_hospitals=max(1, round(cell_scale)),
+                num_shops=max(1, round(cell_scale)), num_aa_portal_sets=max(1, round(cell_scale)),
+                num_ab_portal_sets=max(1, round(cell_scale)), num_abc_portal_sets=max(1, round(cell_scale)),
+                num_treasures=max(2, round(2 * cell_scale)), num_inner_walls=round(20 * cell_scale),
+                num_exits=max(2, round(2 * side_scale)))
+
+
+def time_board_generation(board_size, seed):
+    board_config = get_scaled_board_config(board_size)
+    start = time.perf_counter()
+    board = Board(**board_config, seed=seed, generation_time_limit_secs=600, narrate=False)
+    return time.perf_counter() - start, board.generation_budget.phase_times_secs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-s", "--board_sizes", help="Board side lengths to benchmark.", type=int, nargs='+',
+                        default=DEFAULT_BOARD_SIZES)
+    parser.add_argument("-r", "--num_repeats", help="Number of boards to generate per size (the fastest is kept).",
+                        type=int, default=3)
+    parser.add_argument("-m", "--max_slope", help="Fail if generation time grows faster than "
+                                                  "num_cells ** max_slope.", type=float, default=1.3)
+    args = parser.parse_args()
+
+    num_cells = []
+    generation_times_in_secs = []
+    for board_size in args.board_sizes:
+        timings = [time_board_generation(board_size, seed=seed) for seed in range(args.num_repeats)]
+        time_taken_in_secs, phase_times_secs = min(timings, key=lambda timing: timing[0])
+        phase_report = ', '.join(f"{phase}: {phase_time_secs:.4f}s" for phase, phase_time_secs in phase_times_secs.items())
+        print(f"{board_size}x{board_size}: {time_taken_in_secs:.4f}s ({phase_report})")
+        num_cells.append(board_size * board_size)
+        generation_times_in_secs.append(time_taken_in_secs)
+
+    slope, _ = np.polyfit(np.log(num_cells), np.log(generation_times_in_secs), 1)
+    print(f"Generation time grows like num_cells ** {slope:.2f}.")
+    if slope > args.max_slope:
+        print(f"Board generation is superlinear in the number of cells (slope {slope:.2f} > {args.max_slope}).")
+        sys.exit(1)
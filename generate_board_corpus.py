@@ -0,0 +1,62 @@
+import argparse
+import json
+import os
+import time
+
+from multiprocessing import Pool
+
+from src.board import Board
+from src.board_serialization import serialize_board
+from src.exceptions import ZeroRemainingSafeTiles, NoValidRiverPath, NoValidExitPlacement, GenerationBudgetExceeded
+from src.utils_favorites import GAME_SEED, BOARD_CONFIG
+
+BOARD = 'board'
+ERROR = 'error'
+
+
+def generate_board_record(seed_and_board_config):
+    seed, board_config = seed_and_board_config
+    record = {GAME_SEED: seed, BOARD_CONFIG: board_config}
+    try:
+        record[BOARD] = serialize_board(Board(**board_config, seed=seed, narrate=False))
+    except (ZeroRemainingSafeTiles, NoValidRiverPath, NoValidExitPlacement, GenerationBudgetExceeded) as e:
+        record[ERROR] = f"{type(e).__name__}: {e}"
+    return record
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-f", "--first_seed", help="First board seed to generate.", type=int, required=True)
+    parser.add_argument("-n", "--num_seeds", help="Number of consecutive seeds to generate boards for.", type=int,
+                        required=True)
+    parser.add_argument("-o", "--output", help="Path of the JSON lines file to write the board corpus to.", type=str,
+                        required=True)
+    parser.add_argument("-c", "--board_config", help="Board config as a JSON object of Board arguments "
+                                                     "(defaults to the standard board).", type=str, default='{}')
+    parser.add_argument("-w", "--num_workers", help="Number of worker processes (defaults to the number of cores).",
+                        type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    board_config = json.loads(args.board_config)
+    seeds = range(args.first_seed, args.first_seed + args.num_seeds)
+
+    start = time.time()
+    num_boards = 0
+    num_failures = 0
+    with Pool(processes=args.num_workers) as pool, open(args.output, 'w+') as f:
+        records = pool.imap_unordered(generate_board_record, [(seed, board_config) for seed in seeds],
+                                      chunksize=max(1, args.num_seeds // (args.num_workers * 8)))
+        for record in records:
+            if ERROR in record:
+                num_failures += 1
+                print(f"Could not generate a board for seed {record[GAME_SEED]}. {record[ERROR]}")
+                continue
+            f.write(json.dumps(record) + "\n")
+            num_boards += 1
+            if num_boards % 100 == 0:
+                f.flush()
+                print(f"Generated {num_boards} boards ({num_boards / (time.time() - start):.1f} boards/sec).")
+
+    time_taken_in_secs = time.time() - start
+    print(f"Wrote {num_boards} boards to {args.output} in {time_taken_in_secs:.1f} seconds "
+          f"({num_failures} seeds failed).")
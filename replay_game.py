@@ -0,0 +1,37 @@
+import argparse
+
+from src.replay import ReplayEngine
+from src.save_journal import load_game_from_journal
+from src.utils import get_backup_file_path
+from src.exceptions import ReplayDiverged
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-g", "--game_id", help="Enter a game id to replay a saved game.", type=str, required=True)
+    parser.add_argument("-t", "--turn", help="Turn to show the game at (defaults to the last saved turn).", type=int,
+                        default=None)
+    args = parser.parse_args()
+
+    backup_file_path = get_backup_file_path(game_id=args.game_id)
+    try:
+        game = load_game_from_journal(backup_file_path, auto_rng=True)
+    except FileNotFoundError:
+        print(f"No save file found for game {args.game_id} at {backup_file_path}.")
+        exit(1)
+
+    replay_engine = ReplayEngine(game)
+    turn = args.turn if args.turn is not None else replay_engine.num_turns
+    try:
+        replay_engine.seek(turn)
+    except ValueError as e:
+        print(e)
+        exit(1)
+    except ReplayDiverged as e:
+        print(f"{e} The save file does not match this version of the game.")
+        exit(1)
+
+    print(f"Game {game.game_id} at turn {turn} of {replay_engine.num_turns}.")
+    game.display_board()
+    game.display_player_statuses(reveal_secret_info=True)
+    if game.game_over:
+        print(f"{game.players[game.winner_index].name} won the game.")
@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import sys
+
+from src.batch_simulator import BatchSimulator, ks_statistic, ks_critical_value
+from src.board import Board
+from src.monte_carlo import run_monte_carlo
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-s", "--seed", help="Seed of the board to simulate games on.", type=int, required=True)
+    parser.add_argument("-c", "--board_config", help="Board config as a JSON object of Board arguments "
+                                                     "(defaults to the standard board).", type=str, default='{}')
+    parser.add_argument("-p", "--num_players", help="Number of random-policy players per game.", type=int, default=3)
+    parser.add_argument("-n", "--num_games", help="Number of games to simulate.", type=int, default=100000)
+    parser.add_argument("-k", "--num_slots", help="Number of games to advance in lockstep at a time.", type=int,
+                        default=4096)
+    parser.add_argument("-v", "--num_validation_games", help="Number of Game.run games to check the simulated game "
+                                                             "lengths against (0 to skip the check).",
+                        type=int, default=0)
+    parser.add_argument("-w", "--num_workers", help="Number of worker processes for the validation games "
+                                                    "(defaults to the number of cores).",
+                        type=int, default=os.cpu_count())
+    parser.add_argument("-a", "--alpha", help="Significance level of the Kolmogorov-Smirnov validation check.",
+                        type=float, default=0.01)
+    args = parser.parse_args()
+
+    board = Board(**json.loads(args.board_config), seed=args.seed, auto_rng=True, narrate=False)
+    player_names = [f"Player {i + 1}" for i in range(args.num_players)]
+
+    simulator = BatchSimulator(board=board, player_names=player_names, num_slots=args.num_slots, seed=args.seed)
+    stats = simulator.run(num_games=args.num_games)
+    print(stats.report())
+
+    if args.num_validation_games > 0:
+        print(f"Validating against {args.num_validation_games} Game.run games...")
+        reference_stats = run_monte_carlo(board=board, player_names=player_names,
+                                          num_games=args.num_validation_games, random_seed=args.seed,
+                                          num_workers=args.num_workers)
+        print(reference_stats.report())
+        statistic = ks_statistic(stats.executed_moves, reference_stats.executed_moves)
+        critical_value = ks_critical_value(args.num_games, args.num_validation_games, alpha=args.alpha)
+        print(f"Kolmogorov-Smirnov statistic of the game lengths: {statistic:.4f} "
+              f"(critical value {critical_value:.4f} at alpha={args.alpha}).")
+        if statistic > critical_value:
+            print(f"Simulated game lengths do not match Game.run.")
+            sys.exit(1)
@@ -1,5 +1,4 @@
 import json
-import numpy as np
 
 from abc import abstractmethod
 
@@ -7,6 +6,7 @@ from src.move import Move
 from src.utils import get_yes_or_no_response, response_is_yes, prompt_real_dice_roll_result
 from src.datatypes import Direction, MoveType, StatusType, TileType, XPExchangeType
 from src.location import Location
+from src.events import ShotEvent, ItemLostEvent
 
 
 class Action(Move):
@@ -29,13 +29,17 @@ class BuyItem(Action):
 
     def affect_player(self, player):
         if player.has_item():
-            print(f"You already have an item ({player.item}) and you cannot hold multiple items.")
+            if player.narrate:
+                print(f"You already have an item ({player.item}) and you cannot hold multiple items.")
             return None
 
-        print(f"Random Item Shop Catalog: {json.dumps(self.item_map, default=lambda x: str(x))}")
+        if player.narrate:
+            print(f"Random Item Shop Catalog: {json.dumps(self.item_map, default=lambda x: str(x))}")
 
-        if player.auto_rng:
-            chosen_item = np.random.choice(self.items)
+        if player.decisions.is_replaying():
+            chosen_item = self.items[player.decisions.next_decision()]
+        elif player.auto_rng:
+            chosen_item = player.rng.choice(self.items)
         else:
             chosen_item = None
             while chosen_item is None:
@@ -43,11 +47,12 @@ class BuyItem(Action):
                     number = prompt_real_dice_roll_result(player)
                     chosen_item = self.item_map[number]
                 except KeyError:
-                    print(f"Invalid dice roll. The shop only has the following items: "
-                          f"{json.dumps(self.item_map, indent=2)}")
-                    print(f"Please enter a dice roll that is one of these values: {self.item_map.keys()}")
-        print(f"Thank you for your purchase!")
-        player.acquire_item(chosen_item)
+                    if player.narrate:
+                        print(f"Invalid dice roll. The shop only has the following items: "
+                              f"{json.dumps(self.item_map, indent=2)}")
+                        print(f"Please enter a dice roll that is one of these values: {self.item_map.keys()}")
+        player.decisions.record(self.items.index(chosen_item))
+        player.acquire_item(chosen_item, bought=True)
 
     def description(self):
         return f"Buy a randomly chosen item from the shop."
@@ -87,7 +92,8 @@ class Heal(Action):
 
     def affect_player(self, player):
         if not player.is_injured():
-            print(f"You are already healthy.")
+            if player.narrate:
+                print(f"You are already healthy.")
 
         if self.source == TileType.HOSPITAL:
             player.heal_in_hospital()
@@ -183,22 +189,20 @@ class ShootBullet(Action):
 
     def affect_player(self, player):
         shot_destination, first_player_hit = self._get_shot_destination(player, self.direction)
-        if player.location.no_walls_block_straight_line_location(location=shot_destination,
-                                                                 walls=self.board.inner_walls,
-                                                                 board_height=self.board.height,
-                                                                 board_width=self.board.width):
+        if self.board.wall_index.no_walls_block_straight_line(player.location, shot_destination):
             if first_player_hit is not None:
-                if first_player_hit.status != StatusType.INJURED:
-                    print(f"{player.name} successfully shoots and injures {first_player_hit.name}.")
+                injured_other_player = first_player_hit.status != StatusType.INJURED
+                if player.events.enabled:
+                    player.events.emit(ShotEvent(player.name, self.direction, other_player_name=first_player_hit.name,
+                                                 injured_other_player=injured_other_player))
+                if injured_other_player:
                     first_player_hit.get_injured()
-                else:
-                    print(f"{player.name} shoots {first_player_hit.name}, but {first_player_hit.name} "
-                          f"is already injured.")
-            else:
-                print(f"{player.name} shoots 3 spaces {self.direction.name}, but hits nothing.")
-        else:
-            print(f"{player.name} shoots {self.direction.name}, but hits a wall.")
-        print(f"{player.name} has lost his/her Rusty Bullet.")
+            elif player.events.enabled:
+                player.events.emit(ShotEvent(player.name, self.direction))
+        elif player.events.enabled:
+            player.events.emit(ShotEvent(player.name, self.direction, hit_wall=True))
+        if player.events.enabled:
+            player.events.emit(ItemLostEvent(player.name, str(player.item)))
         player.lose_item()
 
     def description(self):
@@ -0,0 +1,64 @@
+import threading
+
+from src.game_snapshot import GameSnapshot
+
+
+class AutosaveWriter:
+    # Saves a game to a SaveJournal on a background thread so the turn loop never waits on disk. submit only queues a
+    # snapshot when the game changed since the last one, and a snapshot queued while a write is in progress replaces
+    # the previously queued one, so a burst of turns costs a single write of the latest state.
+    def __init__(self, game, save_journal):
+        self.game = game
+        self.save_journal = save_journal
+        self._condition = threading.Condition()
+        self._last_snapshot = None
+        self._queued_snapshot = None
+        self._writing = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_queued_snapshots, name=f"autosave-{game.game_id}",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self):
+        snapshot = self.game.snapshot()
+        if self._last_snapshot is not None and vars(snapshot) == vars(self._last_snapshot):
+            return False
+        self._last_snapshot = snapshot
+        with self._condition:
+            self._queued_snapshot = snapshot
+            self._condition.notify_all()
+        return True
+
+    def flush(self):
+        with self._condition:
+            while self._queued_snapshot is not None or self._writing:
+                self._condition.wait()
+
+    def close(self):
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _write_queued_snapshots(self):
+        while True:
+            with self._condition:
+                while self._queued_snapshot is None and not self._closed:
+                    self._condition.wait()
+                if self._queued_snapshot is None:
+                    return
+                snapshot = self._queued_snapshot
+                self._queued_snapshot = None
+                self._writing = True
+            self._write(snapshot)
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _write(self, snapshot: GameSnapshot):
+        try:
+            self.save_journal.append(self.game, snapshot=snapshot)
+        except Exception as e:
+            # The writer has to stay alive, or flush and close would wait on it forever.
+            print(f"Could not autosave game {self.game.game_id} to {self.save_journal.file_path}: {e}")
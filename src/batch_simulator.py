@@ -0,0 +1,315 @@
+import math
+import time
+import numpy as np
+
+from typing import List
+
+from src.actions import RevealClosestHospital, RevealClosestShop, RevealObstacle, HealInstantlyWithXP
+from src.board import Board
+from src.constants import MAX_XP
+from src.datatypes import Direction, ItemType, MoveOutcome, TileType
+from src.monte_carlo import MonteCarloStats
+from src.wall_index import DIRECTION_BITS
+
+NO_ITEM = 0
+SHOT_RANGE = 3
+NUM_SHOP_ITEMS = 3
+
+# The options a random-policy player picks from uniformly, in the order Player.request_move lists them. Acquiring
+# treasure is not one of them because a random player always takes treasure when it can.
+(MOVE, END_TURN, SHOOT, FIRST_AID, DROP_ITEM, FIGHT, BUY_ITEM, HOSPITAL_HEAL, REVEAL_HOSPITAL, REVEAL_SHOP,
+ REVEAL_OBSTACLE, HEAL_WITH_XP) = range(12)
+NUM_OPTIONS = 12
+ACQUIRE_TREASURE = NUM_OPTIONS
+
+REVEAL_HOSPITAL_XP_COST = RevealClosestHospital().xp_cost
+REVEAL_SHOP_XP_COST = RevealClosestShop().xp_cost
+REVEAL_OBSTACLE_XP_COST = RevealObstacle().xp_cost
+HEAL_WITH_XP_COST = HealInstantlyWithXP().xp_cost
+
+
+def _get_clear_shots(board: Board):
+    # clear_shots[cell, direction.value - 1, k - 1] is whether a bullet fired from cell travels k tiles in that direction
+    # without leaving the board or hitting a wall.
+    num_cells = board.width * board.height
+    blocked = board.wall_index.blocked.reshape(num_cells)
+    clear_shots = np.zeros((num_cells, len(Direction), SHOT_RANGE), dtype=bool)
+    for direction in Direction:
+        next_cells = np.asarray(board.next_cells[direction])
+        cells = np.arange(num_cells)
+        clear = np.ones(num_cells, dtype=bool)
+        for k in range(SHOT_RANGE):
+            clear &= (blocked[cells] & DIRECTION_BITS[direction]) == 0
+            clear_shots[:, direction.value - 1, k] = clear
+            cells = np.where(clear, next_cells[cells], cells)
+    return clear_shots
+
+
+class BatchSimulator:
+    # Plays random-policy games of one board in lockstep: every array holds one row per game slot (and one column per
+    # seat), and each step makes one decision for the active player of every unfinished game. Finished slots are
+    # refilled with new games until num_games have been played. The rules follow Player, the tile actions and the
+    # auto-play policy in Player.request_move.
+    def __init__(self, board: Board, player_names: List[str], num_slots: int = 4096, seed: int = 0):
+        self.board = board
+        self.num_players = len(player_names)
+        self.num_slots = num_slots
+        self.rng = np.random.default_rng(seed)
+
+        num_cells = board.width * board.height
+        self.num_cells = num_cells
+        kernel = board.transition_kernel
+        self.landing_cells = kernel.landing_cells
+        self.outcomes = kernel.outcomes
+        stepped_on_cells = np.stack([np.asarray(board.next_cells[direction]) for direction in Direction], axis=1)
+        stepped_on_cells = np.where(stepped_on_cells < 0, 0, stepped_on_cells)
+        self.tile_types = np.zeros(num_cells, dtype=np.int8)
+        self.initial_treasure = np.zeros(num_cells, dtype=np.int16)
+        tile_xp = np.zeros(num_cells, dtype=np.int8)
+        for cell, location in enumerate(board.all_locations):
+            tile = board.grid[location.x][location.y]
+            self.tile_types[cell] = tile.type.value
+            self.initial_treasure[cell] = tile.num_treasure
+            tile_xp[cell] = tile.xp
+        # The XP a move earns comes from the tile stepped onto, even when that tile flushes or teleports the player on.
+        self.move_xp = tile_xp[stepped_on_cells]
+        self.clear_shots = _get_clear_shots(board)
+        self.spawn_cells = np.array([board.get_cell(player.location)
+                                     for player in board.generate_safe_players(player_names=player_names)])
+
+        # Per-player state is flat and indexed by slot * num_players + seat.
+        num_seats = num_slots * self.num_players
+        self.cells = np.zeros(num_seats, dtype=np.int64)
+        self.injured = np.zeros(num_seats, dtype=bool)
+        self.items = np.zeros(num_seats, dtype=np.int8)
+        self.has_treasure = np.zeros(num_seats, dtype=bool)
+        self.xp = np.zeros(num_seats, dtype=np.int8)
+        self.can_move = np.ones(num_seats, dtype=bool)
+        self.lose_next_turn = np.zeros(num_seats, dtype=bool)
+        self.heal_next_turn = np.zeros(num_seats, dtype=bool)
+        self.acquired_item_this_turn = np.zeros(num_seats, dtype=bool)
+        self.can_request_hospital_location = np.ones(num_seats, dtype=bool)
+        self.can_request_shop_location = np.ones(num_seats, dtype=bool)
+        self.treasure = np.zeros(num_slots * num_cells, dtype=np.int16)
+        self.active_player = np.zeros(num_slots, dtype=np.int64)
+        self.turn_begun = np.zeros(num_slots, dtype=bool)
+        self.executed_moves = np.zeros(num_slots, dtype=np.int64)
+        self.winner_seats = np.full(num_slots, -1, dtype=np.int64)
+        self.slot_games = np.full(num_slots, -1, dtype=np.int64)
+
+    def run(self, num_games: int):
+        executed_moves = np.zeros(num_games, dtype=np.int64)
+        winner_seats = np.zeros(num_games, dtype=np.int64)
+        start = time.time()
+        num_started = min(num_games, self.num_slots)
+        self._start_games(np.arange(num_started), np.arange(num_started))
+        while True:
+            slots = np.flatnonzero(self.slot_games >= 0)
+            if len(slots) == 0:
+                break
+            self._step(slots)
+            finished_slots = slots[self.winner_seats[slots] >= 0]
+            if len(finished_slots) > 0:
+                finished_games = self.slot_games[finished_slots]
+                executed_moves[finished_games] = self.executed_moves[finished_slots]
+                winner_seats[finished_games] = self.winner_seats[finished_slots]
+                self.slot_games[finished_slots] = -1
+                num_new_games = min(len(finished_slots), num_games - num_started)
+                if num_new_games > 0:
+                    self._start_games(finished_slots[:num_new_games],
+                                      np.arange(num_started, num_started + num_new_games))
+                    num_started += num_new_games
+        return MonteCarloStats(executed_moves=executed_moves, winner_seats=winner_seats, num_seats=self.num_players,
+                               time_taken_in_secs=time.time() - start)
+
+    def _slot_rows(self, state, slots):
+        return state.reshape(self.num_slots, -1)[slots]
+
+    def _start_games(self, slots, games):
+        # Every game draws its own turn order, like Game does when it shuffles the players.
+        seat_spawns = np.argsort(self.rng.random((len(slots), self.num_players)), axis=1)
+        seats = (slots[:, None] * self.num_players + np.arange(self.num_players)).ravel()
+        self.cells[seats] = self.spawn_cells[seat_spawns].ravel()
+        for state in (self.injured, self.items, self.has_treasure, self.xp, self.lose_next_turn, self.heal_next_turn,
+                      self.acquired_item_this_turn):
+            state[seats] = 0
+        for state in (self.can_move, self.can_request_hospital_location, self.can_request_shop_location):
+            state[seats] = True
+        self.treasure.reshape(self.num_slots, -1)[slots] = self.initial_treasure
+        self.active_player[slots] = 0
+        self.turn_begun[slots] = False
+        self.executed_moves[slots] = 0
+        self.winner_seats[slots] = -1
+        self.slot_games[slots] = games
+
+    def _next_player(self, slots):
+        self.active_player[slots] = (self.active_player[slots] + 1) % self.num_players
+        self.turn_begun[slots] = False
+
+    def _add_xp(self, seats, amounts):
+        # Players cannot gain XP while holding treasure.
+        earns = ~self.has_treasure[seats]
+        seats = seats[earns]
+        self.xp[seats] = np.minimum(self.xp[seats] + amounts[earns], MAX_XP)
+
+    def _injure(self, slots, seats):
+        self.injured[seats] = True
+        drops = self.has_treasure[seats]
+        slots, seats = slots[drops], seats[drops]
+        self.has_treasure[seats] = False
+        self.treasure[slots * self.num_cells + self.cells[seats]] += 1
+
+    def _begin_turns(self, slots):
+        seats = slots * self.num_players + self.active_player[slots]
+        healing = self.heal_next_turn[seats]
+        self.injured[seats[healing]] = False
+        self.heal_next_turn[seats] = False
+        losing = self.lose_next_turn[seats]
+        self.lose_next_turn[seats] = False
+        self.acquired_item_this_turn[seats[losing]] = False
+        self._next_player(slots[losing])
+        self.turn_begun[slots[~losing]] = True
+
+    def _step(self, slots):
+        beginning = ~self.turn_begun[slots]
+        if beginning.any():
+            self._begin_turns(slots[beginning])
+            slots = slots[self.turn_begun[slots]]
+        players = self.active_player[slots]
+        seats = slots * self.num_players + players
+        num_slots = len(slots)
+        rows = np.arange(num_slots)
+
+        cells = self.cells[seats]
+        items = self.items[seats]
+        injured = self.injured[seats]
+        xp = self.xp[seats]
+        can_move = self.can_move[seats]
+        tile_types = self.tile_types[cells]
+        # Fights are offered against every healthy player on the same tile, in seat order.
+        opponents = (self._slot_rows(self.cells, slots) == cells[:, None]) & ~self._slot_rows(self.injured, slots) & \
+            ~injured[:, None]
+        opponents[rows, players] = False
+
+        counts = np.zeros((num_slots, NUM_OPTIONS), dtype=np.int64)
+        counts[:, MOVE] = len(Direction) * can_move
+        counts[:, END_TURN] = ~can_move
+        counts[:, SHOOT] = len(Direction) * (items == ItemType.RUSTY_BULLET.value)
+        counts[:, FIRST_AID] = items == ItemType.FIRST_AID_KIT.value
+        counts[:, DROP_ITEM] = (items != NO_ITEM) & ~self.acquired_item_this_turn[seats]
+        counts[:, FIGHT] = opponents.sum(axis=1)
+        counts[:, BUY_ITEM] = (tile_types == TileType.SHOP.value) & (items == NO_ITEM)
+        counts[:, HOSPITAL_HEAL] = (tile_types == TileType.HOSPITAL.value) & injured & ~self.heal_next_turn[seats]
+        counts[:, REVEAL_HOSPITAL] = (xp >= REVEAL_HOSPITAL_XP_COST) & self.can_request_hospital_location[seats]
+        counts[:, REVEAL_SHOP] = (xp >= REVEAL_SHOP_XP_COST) & self.can_request_shop_location[seats]
+        counts[:, REVEAL_OBSTACLE] = xp >= REVEAL_OBSTACLE_XP_COST
+        counts[:, HEAL_WITH_XP] = (xp >= HEAL_WITH_XP_COST) & injured
+
+        cumulative_counts = np.cumsum(counts, axis=1)
+        choices = (self.rng.random(num_slots) * cumulative_counts[:, -1]).astype(np.int64)
+        options = (choices[:, None] >= cumulative_counts).sum(axis=1)
+        sub_choices = choices - (cumulative_counts[rows, options] - counts[rows, options])
+        treasure_cells = slots * self.num_cells + cells
+        can_acquire = (self.treasure[treasure_cells] > 0) & ~self.has_treasure[seats] & ~injured
+        options[can_acquire] = ACQUIRE_TREASURE
+
+        chosen = options == MOVE
+        if chosen.any():
+            self._move(slots[chosen], players[chosen], seats[chosen], cells[chosen], sub_choices[chosen])
+        chosen = options == END_TURN
+        if chosen.any():
+            self.acquired_item_this_turn[seats[chosen]] = False
+            self.can_move[seats[chosen]] = True
+            self._next_player(slots[chosen])
+        chosen = options == SHOOT
+        if chosen.any():
+            self._shoot(slots[chosen], players[chosen], cells[chosen], sub_choices[chosen])
+        chosen = options == DROP_ITEM
+        self.items[seats[chosen]] = NO_ITEM
+        chosen = options == FIGHT
+        if chosen.any():
+            self._fight(slots[chosen], seats[chosen], opponents[chosen], sub_choices[chosen])
+        chosen = options == BUY_ITEM
+        if chosen.any():
+            self.items[seats[chosen]] = self.rng.integers(1, NUM_SHOP_ITEMS + 1, size=chosen.sum())
+            self.acquired_item_this_turn[seats[chosen]] = True
+        chosen = options == HOSPITAL_HEAL
+        self.lose_next_turn[seats[chosen]] = True
+        self.heal_next_turn[seats[chosen]] = True
+        chosen = options == REVEAL_HOSPITAL
+        self.xp[seats[chosen]] -= REVEAL_HOSPITAL_XP_COST
+        self.can_request_hospital_location[seats[chosen]] = False
+        chosen = options == REVEAL_SHOP
+        self.xp[seats[chosen]] -= REVEAL_SHOP_XP_COST
+        self.can_request_shop_location[seats[chosen]] = False
+        chosen = options == REVEAL_OBSTACLE
+        self.xp[seats[chosen]] -= REVEAL_OBSTACLE_XP_COST
+        chosen = options == HEAL_WITH_XP
+        self.xp[seats[chosen]] -= HEAL_WITH_XP_COST
+        self.injured[seats[chosen]] = False
+        chosen = options == ACQUIRE_TREASURE
+        self.treasure[treasure_cells[chosen]] -= 1
+        self.has_treasure[seats[chosen]] = True
+        # A first aid kit offers a heal that has no effect, so FIRST_AID needs no handling.
+
+    def _move(self, slots, players, seats, cells, direction_indices):
+        outcomes = self.outcomes[cells, direction_indices]
+        won = self.has_treasure[seats] & ((outcomes == MoveOutcome.EXIT.value) |
+                                          (outcomes == MoveOutcome.FLUSHED_INTO_EXIT.value))
+        moved = (outcomes != MoveOutcome.BLOCKED.value) & (outcomes != MoveOutcome.EXIT.value)
+        self.executed_moves[slots[moved]] += 1
+        self.winner_seats[slots[won]] = players[won]
+
+        moved &= ~won
+        seats, cells, direction_indices = seats[moved], cells[moved], direction_indices[moved]
+        self.cells[seats] = self.landing_cells[cells, direction_indices]
+        self.can_move[seats] = False
+        self.lose_next_turn[seats[outcomes[moved] == MoveOutcome.MARSH.value]] = True
+        self._add_xp(seats, self.move_xp[cells, direction_indices])
+
+    def _shoot(self, slots, players, cells, direction_indices):
+        # Like ShootBullet, the bullet is aimed at the first player in seat order standing within range in a straight
+        # line, and only reaches them when no wall is in the way.
+        height = self.board.height
+        rows = np.arange(len(slots))
+        x, y = cells // height, cells % height
+        other_cells = self._slot_rows(self.cells, slots)
+        other_x, other_y = other_cells // height, other_cells % height
+        directions = direction_indices[:, None] + 1
+        distances = np.select(
+            [directions == Direction.UP.value, directions == Direction.DOWN.value, directions == Direction.LEFT.value],
+            [other_y - y[:, None], y[:, None] - other_y, x[:, None] - other_x], other_x - x[:, None])
+        is_vertical = (directions == Direction.UP.value) | (directions == Direction.DOWN.value)
+        in_line = np.where(is_vertical, other_x == x[:, None], other_y == y[:, None])
+        in_range = in_line & (distances > 0) & (distances <= SHOT_RANGE)
+        in_range[rows, players] = False
+
+        has_target = in_range.any(axis=1)
+        targets = slots * self.num_players + np.argmax(in_range, axis=1)
+        target_distances = np.clip(distances[rows, np.argmax(in_range, axis=1)], 1, SHOT_RANGE)
+        hits = has_target & self.clear_shots[cells, direction_indices, target_distances - 1] & ~self.injured[targets]
+        self._injure(slots[hits], targets[hits])
+        self.items[slots * self.num_players + players] = NO_ITEM
+
+    def _fight(self, slots, seats, opponents, sub_choices):
+        others = slots * self.num_players + np.argmax(np.cumsum(opponents, axis=1) > sub_choices[:, None], axis=1)
+        # A rusty bullet is used half of the time and always wins. It is not used up.
+        shoots = (self.items[seats] == ItemType.RUSTY_BULLET.value) & (self.rng.random(len(slots)) < 0.5)
+        attacker_rolls = self.rng.integers(1, 7, size=len(slots))
+        defender_rolls = self.rng.integers(1, 7, size=len(slots))
+        wins = shoots | (attacker_rolls >= defender_rolls)
+        self._injure(slots[wins], others[wins])
+        self._injure(slots[~wins], seats[~wins])
+
+
+def ks_statistic(sample_1: np.ndarray, sample_2: np.ndarray):
+    # Two-sample Kolmogorov-Smirnov statistic: the largest gap between the two empirical distribution functions.
+    values = np.concatenate([sample_1, sample_2])
+    cdf_1 = np.searchsorted(np.sort(sample_1), values, side='right') / len(sample_1)
+    cdf_2 = np.searchsorted(np.sort(sample_2), values, side='right') / len(sample_2)
+    return np.abs(cdf_1 - cdf_2).max()
+
+
+def ks_critical_value(num_samples_1: int, num_samples_2: int, alpha: float = 0.01):
+    return math.sqrt(-math.log(alpha / 2) / 2) * math.sqrt((num_samples_1 + num_samples_2) /
+                                                           (num_samples_1 * num_samples_2))
@@ -1,23 +1,45 @@
 import random
-import timeout_decorator
 import numpy as np
 from typing import List
 
 from src.datatypes import TileType, TileCategories, Direction
 from src.tiles import TileFactory, Tile, Safe, PortalType
-from src.location import Location
-from src.borders import Wall, Exit
+from src.location import Location, LocationTable, CellLocations
+from src.borders import Exit, get_wall_edge_id, get_wall_edge_locations
 from src.player import Player
-from src.exceptions import ZeroRemainingSafeTiles
-from src.utils import create_placeholder_matrix, manhattan_distance
+from src.connectivity import WallConnectivity
+from src.wall_index import WallIndex, DIRECTION_DELTAS
+from src.board_arrays import BoardArrays, LazyGrid
+from src.transition_kernel import TransitionKernel
+from src.generation_budget import GenerationBudget
+from src.constants import MIN_GAME_SEED, MAX_GAME_SEED
+from src.exceptions import ZeroRemainingSafeTiles, NoValidExitPlacement, GenerationBudgetExceeded, \
+    GenerationAttemptsExceeded
+from src.utils import derive_seed
+
+NEIGHBOR_DIRECTIONS = (Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN)
+# Placements an exit search may try per candidate location before it gives up on finding one.
+MAX_PLACEMENT_EXPANSIONS_PER_CANDIDATE = 100
 
 
 class Board:
     def __init__(self, height=8, width=8, river_max_num_turns=2, num_marshes=8, num_river_tiles=12, num_hospitals=1,
                  num_shops=1, num_aa_portal_sets=1, num_ab_portal_sets=1, num_abc_portal_sets=1, num_treasures=2,
                  num_inner_walls=20, num_exits=2, inner_walls=None, exits=None, grid=None, generate_contents=True,
-                 border_locations=None, all_locations=None, safe_locations=None, auto_rng=False):
+                 border_locations=None, all_locations=None, safe_locations=None, auto_rng=False, seed=None,
+                 generation_time_limit_secs=15, max_generation_retries=3, next_cells=None, neighbor_cells=None,
+                 transition_kernel=None, treasure_cells=None, wall_index=None, board_arrays=None, narrate=True):
         self.auto_rng = auto_rng
+        # Whether generation reports its progress on the console.
+        self.narrate = narrate
+        if seed is None:
+            seed = random.randint(MIN_GAME_SEED, MAX_GAME_SEED)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.generation_time_limit_secs = generation_time_limit_secs
+        self.max_generation_retries = max_generation_retries
+        self.generation_budget = None
+        self._placement_pool = []
         self.height = height
         self.width = width
 
@@ -44,86 +66,112 @@ class Board:
         self.inner_walls = inner_walls
         self.exits = exits
         self.grid = grid
+        # board_arrays is set on boards built from arrays, whose grid and locations are filled in from it lazily.
+        self.board_arrays = board_arrays
+        # all_locations is the board's interned Location table, indexed by cell = x * height + y. next_cells[direction]
+        # holds the cell one step away from each cell (-1 off the board) and neighbor_cells the cells around it. Only
+        # generation walks neighbor_cells, so generate_contents builds it when the board does not have it yet.
+        if generate_contents or all_locations is None:
+            all_locations = [Location(x=x, y=y) for x in range(self.width) for y in range(self.height)]
+        self.all_locations = all_locations
+        if generate_contents or border_locations is None:
+            border_locations = self._get_border_locations()
+        self.border_locations = border_locations
+        if generate_contents or next_cells is None:
+            next_cells = self._get_next_cells()
+        self.next_cells = next_cells
+        self.neighbor_cells = neighbor_cells
         if generate_contents:
-            self.border_locations = self._get_border_locations()
-            self.all_locations = [Location(x=x, y=y) for x in range(self.width) for y in range(self.height)]
             self.safe_locations = self.generate_contents()
         else:
-            self.border_locations = border_locations
-            self.all_locations = all_locations
             self.safe_locations = safe_locations
+        if generate_contents or wall_index is None:
+            wall_index = WallIndex(height=self.height, width=self.width, wall_edge_ids=self.inner_walls)
+        self.wall_index = wall_index
+        if generate_contents or transition_kernel is None:
+            transition_kernel = TransitionKernel.from_board(self)
+        self.transition_kernel = transition_kernel
+        # The cells currently holding treasure, kept up to date by add_treasure and remove_treasure so treasure can be
+        # saved and restored without walking the whole grid.
+        if treasure_cells is None:
+            treasure_cells = {cell for cell, location in enumerate(self.all_locations)
+                              if self.get_tile(location).has_treasure()}
+        self.treasure_cells = treasure_cells
+
+    def get_config(self):
+        return dict(height=self.height, width=self.width, river_max_num_turns=self.river_max_num_turns,
+                    num_marshes=self.num_tiles[TileCategories.STATIC][TileType.MARSH],
+                    num_river_tiles=self.num_tiles[TileCategories.DYNAMIC][TileType.RIVER],
+                    num_hospitals=self.num_tiles[TileCategories.STATIC][TileType.HOSPITAL],
+                    num_shops=self.num_tiles[TileCategories.STATIC][TileType.SHOP],
+                    num_aa_portal_sets=self.num_tiles[TileCategories.DYNAMIC][TileType.PORTAL][PortalType.FAKE],
+                    num_ab_portal_sets=self.num_tiles[TileCategories.DYNAMIC][TileType.PORTAL][PortalType.AB],
+                    num_abc_portal_sets=self.num_tiles[TileCategories.DYNAMIC][TileType.PORTAL][PortalType.ABC],
+                    num_treasures=self.num_tiles[TileCategories.STATIC][TileType.TREASURE],
+                    num_inner_walls=self.num_inner_walls, num_exits=self.num_exits)
 
     @staticmethod
     def copy_from(board, auto_rng: bool = False):
-        return Board(height=board.height, width=board.width, river_max_num_turns=board.river_max_num_turns,
-                     num_marshes=board.num_tiles[TileCategories.STATIC][TileType.MARSH],
-                     num_river_tiles=board.num_tiles[TileCategories.DYNAMIC][TileType.RIVER],
-                     num_hospitals=board.num_tiles[TileCategories.STATIC][TileType.HOSPITAL],
-                     num_shops=board.num_tiles[TileCategories.STATIC][TileType.SHOP],
-                     num_aa_portal_sets=board.num_tiles[TileCategories.DYNAMIC][TileType.PORTAL][PortalType.FAKE],
-                     num_ab_portal_sets=board.num_tiles[TileCategories.DYNAMIC][TileType.PORTAL][PortalType.AB],
-                     num_abc_portal_sets=board.num_tiles[TileCategories.DYNAMIC][TileType.PORTAL][PortalType.ABC],
-                     num_treasures=board.num_tiles[TileCategories.STATIC][TileType.TREASURE],
-                     num_inner_walls=board.num_inner_walls, num_exits=board.num_exits,
-                     inner_walls=board.inner_walls, exits=board.exits, grid=board.grid, generate_contents=False,
-                     border_locations=board.border_locations, all_locations=board.all_locations,
-                     safe_locations=board.safe_locations, auto_rng=auto_rng)
+        return Board(**board.get_config(), inner_walls=board.inner_walls, exits=board.exits, grid=board.grid,
+                     generate_contents=False, border_locations=board.border_locations,
+                     all_locations=board.all_locations, safe_locations=board.safe_locations, auto_rng=auto_rng,
+                     seed=board.seed, next_cells=board.next_cells, neighbor_cells=board.neighbor_cells,
+                     transition_kernel=board.transition_kernel, treasure_cells=board.treasure_cells,
+                     wall_index=board.wall_index, board_arrays=board.board_arrays)
+
+    @staticmethod
+    def from_arrays(board_arrays: BoardArrays, auto_rng: bool = False, seed: int = None,
+                    transition_kernel: TransitionKernel = None):
+        # Tiles and locations are only created when they are first looked up, so a board of any size is ready to play
+        # as soon as its arrays are.
+        all_locations = LocationTable(height=board_arrays.height, width=board_arrays.width)
+        return Board(**board_arrays.config, inner_walls=board_arrays.to_inner_walls(), exits=board_arrays.to_exits(),
+                     grid=LazyGrid(board_arrays, all_locations), generate_contents=False, all_locations=all_locations,
+                     safe_locations=CellLocations(board_arrays.safe_cells, all_locations), auto_rng=auto_rng,
+                     seed=seed, transition_kernel=transition_kernel,
+                     treasure_cells=set(np.flatnonzero(board_arrays.treasures).tolist()),
+                     wall_index=WallIndex.from_blocked(board_arrays.wall_masks), board_arrays=board_arrays)
 
     def get_heat_map(self):
-        heat_map = create_placeholder_matrix(height=self.height, width=self.width, placeholder=0)
-        for location in self.all_locations:
-            neighbors = location.neighbors(board_height=self.height, board_width=self.width)
-            for neighbor_location in neighbors:
-                if location.no_walls_block_straight_line_location(location=neighbor_location, walls=self.inner_walls,
-                                                                  board_height=self.height, board_width=self.width):
-                    resting_location = neighbor_location
-                    x, y = neighbor_location.get_coordinates()
-                    tile = self.grid[x][y]
-                    if tile.type == TileType.RIVER:
-                        resting_location = neighbor_location.next_location(direction=tile.direction)
-                        if not resting_location.in_bounds(board_height=self.height, board_width=self.width):
-                            resting_location = neighbor_location
-                    if tile.type == TileType.PORTAL:
-                        resting_location = tile.exit_location
-
-                    final_x, final_y = resting_location.get_coordinates()
-                    heat_map[final_x][final_y] += 1
-        return np.flipud(np.array(heat_map).transpose())
-
-    def get_untraversable_locations_from_origin(self, inner_walls):
-        queue = [self.all_locations[0]]
-        visited = {}
-        for location in self.all_locations:
-            visited[location] = False
-        while len(queue) != 0:
-            location = queue.pop()
-            visited[location] = True
-            for neighbor in location.neighbors(board_height=self.height, board_width=self.width):
-                if not visited[neighbor] and location.no_walls_block_straight_line_location(location=neighbor,
-                                                                                            walls=inner_walls,
-                                                                                            board_height=self.height,
-                                                                                            board_width=self.width):
-                    queue.append(neighbor)
-
-        untraversed_locations = []
-        for k, v in visited.items():
-            if not visited[k]:
-                untraversed_locations.append(k)
-        return untraversed_locations
+        return BoardArrays.from_board(self).get_heat_map()
+
+    def get_cell(self, location: Location):
+        return location.x * self.height + location.y
+
+    def get_location(self, cell: int):
+        return self.all_locations[cell]
+
+    def _get_next_cells(self):
+        xs, ys = np.divmod(np.arange(self.width * self.height), self.height)
+        next_cells = {}
+        for direction in NEIGHBOR_DIRECTIONS:
+            x_delta, y_delta = DIRECTION_DELTAS[direction]
+            next_xs, next_ys = xs + x_delta, ys + y_delta
+            in_bounds = (0 <= next_xs) & (next_xs < self.width) & (0 <= next_ys) & (next_ys < self.height)
+            next_cells[direction] = np.where(in_bounds, next_xs * self.height + next_ys, -1).tolist()
+        return next_cells
+
+    def _get_neighbor_cells(self):
+        return [tuple(cell for cell in cells if cell != -1)
+                for cells in zip(*(self.next_cells[direction] for direction in NEIGHBOR_DIRECTIONS))]
 
     def _get_border_locations(self):
-        top_border = [Location(x=x, y=self.height - 1) for x in range(self.width)]
-        bottom_border = [Location(x=x, y=0) for x in range(self.width)]
-        left_border = [Location(x=0, y=y) for y in range(1, self.height)]
-        right_border = [Location(x=self.width - 1, y=y) for y in range(1, self.height)]
+        top_border = [self.all_locations[x * self.height + self.height - 1] for x in range(self.width)]
+        bottom_border = [self.all_locations[x * self.height] for x in range(self.width)]
+        left_border = [self.all_locations[y] for y in range(1, self.height)]
+        right_border = [self.all_locations[(self.width - 1) * self.height + y] for y in range(1, self.height)]
         return top_border + bottom_border + left_border + right_border
 
     def _assign_tile_to_grid(self, tile: Tile, remaining_locations: set):
         x, y = tile.location.get_coordinates()
+        tile.location = self.all_locations[x * self.height + y]
         self.grid[x][y] = tile
         remaining_locations.remove(tile.location)
         return remaining_locations
 
+    def _draw_safe_locations(self, num_locations: int):
+        return [self._placement_pool.pop() for _ in range(num_locations)]
+
     def _assign_river_tiles(self, river_tiles, safe_locations):
         if len(safe_locations) < len(river_tiles):
             raise ZeroRemainingSafeTiles(f"Not enough safe tiles remaining for {len(river_tiles)} {TileType.RIVER.name} tiles.")
@@ -136,14 +184,16 @@ class Board:
         if len(safe_locations) < num_fake_portals:
             raise ZeroRemainingSafeTiles(f"Not enough safe tiles remaining for {len(num_fake_portals)} fake portal tiles.")
         for _ in range(num_fake_portals):
-            aa_portal = TileFactory.create_type_a_portal_tile(location=random.choice(list(safe_locations)))
+            self.generation_budget.check()
+            aa_portal = TileFactory.create_type_a_portal_tile(location=self._draw_safe_locations(1)[0])
             safe_locations = self._assign_tile_to_grid(tile=aa_portal, remaining_locations=safe_locations)
 
         num_ab_portal_sets = self.num_tiles[TileCategories.DYNAMIC][TileType.PORTAL][PortalType.AB]
         if len(safe_locations) < num_ab_portal_sets * 2:
             raise ZeroRemainingSafeTiles(f"Not enough safe tiles remaining for {len(num_ab_portal_sets)} AB portal sets.")
         for _ in range(num_ab_portal_sets):
-            locations = random.sample(list(safe_locations), k=2)
+            self.generation_budget.check()
+            locations = self._draw_safe_locations(2)
             ab_portal, ba_portal = TileFactory.create_type_ab_portal_tiles(locations=locations)
             safe_locations = self._assign_tile_to_grid(tile=ab_portal, remaining_locations=safe_locations)
             safe_locations = self._assign_tile_to_grid(tile=ba_portal, remaining_locations=safe_locations)
@@ -152,7 +202,8 @@ class Board:
         if len(safe_locations) < num_abc_portal_sets * 3:
             raise ZeroRemainingSafeTiles(f"Not enough safe tiles remaining for {len(num_abc_portal_sets)} AB portal sets.")
         for _ in range(self.num_tiles[TileCategories.DYNAMIC][TileType.PORTAL][PortalType.ABC]):
-            locations = random.sample(list(safe_locations), k=3)
+            self.generation_budget.check()
+            locations = self._draw_safe_locations(3)
             ab_portal, bc_portal, ca_portal = TileFactory.create_type_abc_portal_tiles(locations=locations)
             safe_locations = self._assign_tile_to_grid(tile=ab_portal, remaining_locations=safe_locations)
             safe_locations = self._assign_tile_to_grid(tile=bc_portal, remaining_locations=safe_locations)
@@ -164,109 +215,94 @@ class Board:
             if len(safe_locations) < num_tiles:
                 raise ZeroRemainingSafeTiles(f"Not enough safe tiles remaining for {num_tiles} {tile_type.name} tiles.")
             for _ in range(num_tiles):
-                location = random.choice(list(safe_locations))
+                self.generation_budget.check()
+                location = self._draw_safe_locations(1)[0]
                 static_tile = TileFactory.create_static_tile(tile_type=tile_type, location=location)
                 safe_locations = self._assign_tile_to_grid(tile=static_tile, remaining_locations=safe_locations)
         return safe_locations
 
     def _generate_inner_walls(self, river_tiles):
         inner_walls = set()
-        river_locations = [river_tile.location for river_tile in river_tiles]
+        connectivity = WallConnectivity(height=self.height, width=self.width)
+        river_locations = set(river_tile.location for river_tile in river_tiles)
         while len(inner_walls) < self.num_inner_walls:
             valid_wall = False
             while not valid_wall:
-                first_loc = random.choice(self.all_locations)
-                second_loc = random.choice(first_loc.neighbors(board_height=self.height, board_width=self.width))
+                self.generation_budget.check()
+                first_cell = self.rng.randrange(len(self.all_locations))
+                second_cell = self.rng.choice(self.neighbor_cells[first_cell])
+                first_loc, second_loc = self.all_locations[first_cell], self.all_locations[second_cell]
                 while first_loc in river_locations and second_loc in river_locations:
-                    first_loc = random.choice(self.all_locations)
-                    second_loc = random.choice(first_loc.neighbors(board_height=self.height, board_width=self.width))
-                location_pair = (first_loc, second_loc)
-                wall = Wall(adjacent_locations=tuple(location_pair))
-                if wall not in inner_walls:
+                    first_cell = self.rng.randrange(len(self.all_locations))
+                    second_cell = self.rng.choice(self.neighbor_cells[first_cell])
+                    first_loc, second_loc = self.all_locations[first_cell], self.all_locations[second_cell]
+                wall_edge_id = get_wall_edge_id(first_loc, second_loc, board_height=self.height)
+                if wall_edge_id not in inner_walls:
                     valid_wall = True
-                    inner_walls.add(wall)
+                    inner_walls.add(wall_edge_id)
 
-                    if any([loc == river_tiles[-1].location for loc in wall.adjacent_locations]):
+                    if river_tiles[-1].location in (first_loc, second_loc):
                         valid_wall = False
-                        inner_walls.remove(wall)
-                    elif any([loc == river_tiles[0].location for loc in wall.adjacent_locations]):
+                        inner_walls.remove(wall_edge_id)
+                    elif river_tiles[0].location in (first_loc, second_loc):
                         valid_wall = False
-                        inner_walls.remove(wall)
-                    elif self._wall_forms_tunnel_next_to_river(wall, inner_walls):
+                        inner_walls.remove(wall_edge_id)
+                    elif self._wall_forms_tunnel_next_to_river(wall_edge_id, inner_walls):
                         valid_wall = False
-                        inner_walls.remove(wall)
-                    elif len(self.get_untraversable_locations_from_origin(list(inner_walls))) != 0:
+                        inner_walls.remove(wall_edge_id)
+                    elif connectivity.wall_disconnects_board(wall_edge_id):
                         valid_wall = False
-                        inner_walls.remove(wall)
-
-        return tuple(inner_walls)
-
-    def _wall_forms_tunnel_next_to_river(self, wall, inner_walls):
-        for other_wall in inner_walls:
-            loc_a1, loc_b1 = wall.adjacent_locations
-            loc_a2, loc_b2 = other_wall.adjacent_locations
-            x_a1, y_a1 = loc_a1.get_coordinates()
-            x_b1, y_b1 = loc_b1.get_coordinates()
-            x_a2, y_a2 = loc_a2.get_coordinates()
-            x_b2, y_b2 = loc_b2.get_coordinates()
-            if x_a1 == x_b1 == x_a2 == x_b2:
-                if y_a1 == y_a2 or y_a1 == y_b2:
-                    if x_a1 - 1 >= 0 and self.grid[x_a1 - 1][y_a1].type == TileType.RIVER:
-                        return True
-                    if x_a1 + 1 < self.width and self.grid[x_a1 + 1][y_a1].type == TileType.RIVER:
-                        return True
-                if y_a2 == y_b1 or y_a2 == y_b2:
-                    if x_a1 - 1 >= 0 and self.grid[x_a1 - 1][y_a2].type == TileType.RIVER:
-                        return True
-                    if x_a1 + 1 < self.width and self.grid[x_a1 + 1][y_a2].type == TileType.RIVER:
-                        return True
-            if y_a1 == y_b1 == y_a2 == y_b2:
-                if x_a1 == x_a2 or x_a1 == x_b2:
-                    if y_a1 - 1 >= 0 and self.grid[x_a1][y_a1 - 1].type == TileType.RIVER:
-                        return True
-                    if y_a1 + 1 < self.height and self.grid[x_a1][y_a1 + 1].type == TileType.RIVER:
-                        return True
-                if x_a2 == x_b1 or x_a2 == x_b2:
-                    if y_a1 - 1 >= 0 and self.grid[x_a2][y_a1 - 1].type == TileType.RIVER:
-                        return True
-                    if y_a1 + 1 < self.height and self.grid[x_a2][y_a2 + 1].type == TileType.RIVER:
-                        return True
+                        inner_walls.remove(wall_edge_id)
+                    else:
+                        connectivity.add_wall(wall_edge_id)
+
+        return frozenset(inner_walls)
+
+    def _wall_forms_tunnel_next_to_river(self, wall_edge_id: int, inner_walls: set):
+        # A wall forms a tunnel when it and a parallel wall enclose one of its cells on both sides.
+        loc_1, loc_2 = get_wall_edge_locations(wall_edge_id, board_height=self.height)
+        x_delta, y_delta = loc_2.x - loc_1.x, loc_2.y - loc_1.y
+        for location, outer_location in ((loc_1, Location(x=loc_1.x - x_delta, y=loc_1.y - y_delta)),
+                                         (loc_2, Location(x=loc_2.x + x_delta, y=loc_2.y + y_delta))):
+            if not outer_location.in_bounds(board_height=self.height, board_width=self.width) or \
+                    get_wall_edge_id(location, outer_location, board_height=self.height) not in inner_walls:
+                continue
+            for side_x, side_y in ((location.x + y_delta, location.y + x_delta),
+                                   (location.x - y_delta, location.y - x_delta)):
+                if 0 <= side_x < self.width and 0 <= side_y < self.height and \
+                        self.grid[side_x][side_y].type == TileType.RIVER:
+                    return True
         return False
 
     def _get_furthest_exits_from_treasure(self, river_tiles) -> List[Location]:
-        treasure_locations = []
-        for location in self.all_locations:
-            tile = self.get_tile(location=location)
-            if tile.has_treasure():
-                treasure_locations.append(location)
-
-        potential_exit_location_to_treasure_dists_map = {}
-        for potential_exit_location in self.border_locations:
-            distance_to_treasures = []
-            for treasure_location in treasure_locations:
-                distance_to_treasures.append(manhattan_distance(potential_exit_location, treasure_location))
-            potential_exit_location_to_treasure_dists_map[potential_exit_location] = tuple(distance_to_treasures)
-
+        min_treasure_distance = 3
         potential_exit_locations = []
-        for potential_exit_location, treasure_distances in potential_exit_location_to_treasure_dists_map.items():
-            if min(treasure_distances) >= 3:
+        for potential_exit_location in self.border_locations:
+            if not self._treasure_within_distance(potential_exit_location, min_treasure_distance - 1):
                 potential_exit_locations.append(potential_exit_location)
 
         valid_exit_locations = []
-        river_tile_locations = [river_tile.location for river_tile in river_tiles]
+        river_tile_locations = set(river_tile.location for river_tile in river_tiles)
         for potential_exit_location in potential_exit_locations:
             if potential_exit_location not in river_tile_locations:
                 valid_exit_locations.append(potential_exit_location)
 
-        min_manhattan_dist_between_exits = 5
-        distance_between_exits = 0
-        final_exit_locations = None
-        while final_exit_locations is None or distance_between_exits < min_manhattan_dist_between_exits:
-            final_exit_locations = random.sample(valid_exit_locations, k=self.num_exits)
-            exit_location_1, exit_location_2 = final_exit_locations
-            distance_between_exits = manhattan_distance(exit_location_1, exit_location_2)
-
-        return final_exit_locations
+        exit_locations = _sample_spread_out_locations(candidate_locations=valid_exit_locations,
+                                                      num_locations=self.num_exits, min_manhattan_distance=5,
+                                                      rng=self.rng, generation_budget=self.generation_budget)
+        if exit_locations is None:
+            raise NoValidExitPlacement(f"Cannot place {self.num_exits} exits on the border at least 5 tiles apart, "
+                                       f"at least 3 tiles from every treasure and off the river.")
+        return exit_locations
+
+    def _treasure_within_distance(self, location: Location, max_manhattan_distance: int):
+        for x in range(max(0, location.x - max_manhattan_distance),
+                       min(self.width, location.x + max_manhattan_distance + 1)):
+            max_y_delta = max_manhattan_distance - abs(x - location.x)
+            for y in range(max(0, location.y - max_y_delta), min(self.height, location.y + max_y_delta + 1)):
+                if self.grid[x][y].has_treasure():
+                    return True
+        return False
 
     def _generate_exits(self, river_tiles):
         exits = []
@@ -276,16 +312,16 @@ class Board:
             direction = None
             if x == 0:
                 if y == 0:
-                    direction = random.choice([Direction.LEFT, Direction.DOWN])
+                    direction = self.rng.choice([Direction.LEFT, Direction.DOWN])
                 elif y == self.width - 1:
-                    direction = random.choice([Direction.LEFT, Direction.UP])
+                    direction = self.rng.choice([Direction.LEFT, Direction.UP])
                 else:
                     direction = Direction.LEFT
             elif x == self.width - 1:
                 if y == 0:
-                    direction = random.choice([Direction.RIGHT, Direction.DOWN])
+                    direction = self.rng.choice([Direction.RIGHT, Direction.DOWN])
                 elif y == self.width - 1:
-                    direction = random.choice([Direction.RIGHT, Direction.UP])
+                    direction = self.rng.choice([Direction.RIGHT, Direction.UP])
                 else:
                     direction = Direction.RIGHT
             else:
@@ -297,38 +333,94 @@ class Board:
             exits.append(Exit(location=location, direction=direction))
         return exits
 
-    @timeout_decorator.timeout(15)
     def generate_contents(self):
-        self.grid = _create_safe_tile_matrix(width=self.width, height=self.height)
+        if self.neighbor_cells is None:
+            self.neighbor_cells = self._get_neighbor_cells()
+        # Only running out of attempts retries. Attempts are counted the same way on every run, so a seed always retries
+        # with the same derived seeds and still reproduces its board. Running out of time depends on the machine, so it
+        # gives up instead of moving on to a seed that a rerun would not reach.
+        for num_retries in range(self.max_generation_retries + 1):
+            generation_seed = self.seed if num_retries == 0 else derive_seed(self.seed, num_retries)
+            self.rng = random.Random(generation_seed)
+            self.generation_budget = GenerationBudget(time_limit_secs=self.generation_time_limit_secs,
+                                                      max_attempts_per_phase=1000 * self.width * self.height)
+            try:
+                safe_locations = self._generate_contents()
+                if self.narrate:
+                    print(f"Generated board. {self.generation_budget.report()}")
+                return safe_locations
+            except GenerationAttemptsExceeded as e:
+                if self.narrate:
+                    print(f"{e} Retrying with a seed derived from {self.seed}.")
+        raise GenerationBudgetExceeded(f"Could not generate the board within the generation budget after "
+                                       f"{self.max_generation_retries} retries.")
+
+    def _generate_contents(self):
+        self.grid = _create_safe_tile_matrix(all_locations=self.all_locations, width=self.width, height=self.height)
         safe_locations = set(self.grid[x][y].location for x in range(self.width) for y in range(self.height))
 
+        if self.narrate:
+            print(f"Generating river")
+        self.generation_budget.begin_phase('river')
         river_tiles = TileFactory.create_full_river(
             max_river_length=self.num_tiles[TileCategories.DYNAMIC][TileType.RIVER],
             max_num_turns=self.river_max_num_turns,
             board_height=self.height,
-            board_width=self.width)
-
-        print(f"Generating river")
+            board_width=self.width,
+            rng=self.rng,
+            generation_budget=self.generation_budget)
         safe_locations = self._assign_river_tiles(river_tiles, safe_locations)
-        print(f"Generating portals")
+        self._placement_pool = [location for location in self.all_locations if location in safe_locations]
+        self.rng.shuffle(self._placement_pool)
+        if self.narrate:
+            print(f"Generating portals")
+        self.generation_budget.begin_phase('portals')
         safe_locations = self._assign_portal_tiles(safe_locations)
-        print(f"Generating static tiles")
+        if self.narrate:
+            print(f"Generating static tiles")
+        self.generation_budget.begin_phase('static tiles')
         safe_locations = self._assign_static_tiles(safe_locations)
-        print(f"Generating inner walls")
+        if self.narrate:
+            print(f"Generating inner walls")
+        self.generation_budget.begin_phase('inner walls')
         self.inner_walls = self._generate_inner_walls(river_tiles=river_tiles)
-        print(f"Generating exits")
+        if self.narrate:
+            print(f"Generating exits")
+        self.generation_budget.begin_phase('exits')
         self.exits = self._generate_exits(river_tiles=river_tiles)
-        return random.sample(safe_locations, k=len(safe_locations))
+        self.generation_budget.end_phase()
+        return self.rng.sample(list(safe_locations), k=len(safe_locations))
 
     def get_tile(self, location):
         x, y = location.get_coordinates()
         return self.grid[x][y]
 
+    def add_treasure(self, location):
+        self.get_tile(location).add_treasure()
+        self.treasure_cells.add(self.get_cell(location))
+
+    def remove_treasure(self, location):
+        tile = self.get_tile(location)
+        tile.remove_treasure()
+        if not tile.has_treasure():
+            self.treasure_cells.discard(self.get_cell(location))
+
+    def get_treasure_counts(self):
+        return {cell: self.get_tile(self.all_locations[cell]).num_treasure for cell in self.treasure_cells}
+
+    def set_treasure_counts(self, treasure_counts):
+        for cell in self.treasure_cells.difference(treasure_counts):
+            self.get_tile(self.all_locations[cell]).num_treasure = 0
+        for cell, num_treasure in treasure_counts.items():
+            self.get_tile(self.all_locations[cell]).num_treasure = num_treasure
+        self.treasure_cells = set(treasure_counts)
+
     def generate_safe_players(self, player_names):
         num_players = len(player_names)
         if num_players > len(self.safe_locations):
             raise ZeroRemainingSafeTiles("Insufficient safe locations to spawn players on.")
-        player_locations = random.sample(self.safe_locations, k=num_players)
+        player_rng = random.Random(derive_seed(self.seed, 'players'))
+        player_locations = player_rng.sample(self.safe_locations, k=num_players)
         players = []
         for i in range(num_players):
             players.append(Player(name=player_names[i], location=player_locations[i].copy(), board=self,
@@ -337,6 +429,59 @@ class Board:
         return players
 
 
+def _sample_spread_out_locations(candidate_locations: List[Location], num_locations: int, min_manhattan_distance: int,
+                                 rng: random.Random, generation_budget: GenerationBudget):
+    candidate_locations = list(dict.fromkeys(candidate_locations))
+    candidate_set = set(candidate_locations)
+    conflicting_locations = {}
+    for location in candidate_locations:
+        conflicting_locations[location] = set()
+        for x_delta in range(-(min_manhattan_distance - 1), min_manhattan_distance):
+            max_y_delta = min_manhattan_distance - 1 - abs(x_delta)
+            for y_delta in range(-max_y_delta, max_y_delta + 1):
+                other_location = Location(x=location.x + x_delta, y=location.y + y_delta)
+                if other_location != location and other_location in candidate_set:
+                    conflicting_locations[location].add(other_location)
+
+    # Only locations that are far enough from at least num_locations - 1 other candidates can be part of a placement.
+    eligible_locations = [location for location in candidate_locations
+                          if len(candidate_locations) - 1 - len(conflicting_locations[location]) >= num_locations - 1]
+    ordered_locations = rng.sample(eligible_locations, k=len(eligible_locations))
+
+    chosen_locations = []
+    # Backtracking over k-tuples is exponential when no placement exists, so the search has its own bound instead of
+    # running until the generation budget gives up.
+    max_expansions = MAX_PLACEMENT_EXPANSIONS_PER_CANDIDATE * max(1, len(ordered_locations))
+    num_expansions = 0
+
+    def extend_placement(compatible_locations):
+        nonlocal num_expansions
+        if len(chosen_locations) == num_locations:
+            return True
+        for i, location in enumerate(compatible_locations):
+            # Stop once too few compatible candidates are left to complete the placement.
+            if len(compatible_locations) - i < num_locations - len(chosen_locations):
+                return False
+            num_expansions += 1
+            # Hitting the bound says nothing about whether a placement exists, so it is reported as running out of
+            # attempts, which generate_contents retries with another seed.
+            if num_expansions > max_expansions:
+                raise GenerationAttemptsExceeded(f"Gave up placing {num_locations} locations at least "
+                                                 f"{min_manhattan_distance} tiles apart after {max_expansions} "
+                                                 f"attempts.")
+            generation_budget.check()
+            chosen_locations.append(location)
+            if extend_placement([other_location for other_location in compatible_locations[i + 1:]
+                                 if other_location not in conflicting_locations[location]]):
+                return True
+            chosen_locations.pop()
+        return False
+
+    if extend_placement(ordered_locations):
+        return chosen_locations
+    return None
+
+
 def _exit_location_compatible_with_river(exit_locations, river_tiles):
     river_tile_locations = [river_tile.location for river_tile in river_tiles]
     for exit_location in exit_locations:
@@ -345,12 +490,12 @@ def _exit_location_compatible_with_river(exit_locations, river_tiles):
     return True
 
 
-def _create_safe_tile_matrix(width: int, height: int):
+def _create_safe_tile_matrix(all_locations: List[Location], width: int, height: int):
     matrix = []
     for x in range(width):
         matrix_row = []
         for y in range(height):
-            matrix_row.append(Safe(Location(x=x, y=y)))
+            matrix_row.append(Safe(all_locations[x * height + y]))
         matrix.append(matrix_row)
     return matrix
 
@@ -0,0 +1,92 @@
+import numpy as np
+
+from collections import deque
+
+from src.datatypes import MoveOutcome
+
+UNREACHABLE = -1
+
+
+class BoardPathMetrics:
+    # Path lengths are counted in moves. Every array is aligned with spawn_cells, the flat x * height + y indices of the
+    # board's safe locations, and holds UNREACHABLE where a spawn cannot finish the game.
+    def __init__(self, spawn_cells: np.ndarray, spawn_to_treasure: np.ndarray, treasure_to_exit: np.ndarray,
+                 total: np.ndarray):
+        self.spawn_cells = spawn_cells
+        self.spawn_to_treasure = spawn_to_treasure
+        self.treasure_to_exit = treasure_to_exit
+        self.total = total
+
+
+def get_move_transitions(board):
+    # For every cell, the cells a single move can leave the player on, plus whether some move from the cell leaves the
+    # maze when holding the treasure.
+    kernel = board.transition_kernel
+    exiting_moves = (kernel.outcomes == MoveOutcome.EXIT.value) | \
+                    (kernel.outcomes == MoveOutcome.FLUSHED_INTO_EXIT.value)
+    moving = (kernel.outcomes != MoveOutcome.BLOCKED.value) & (kernel.outcomes != MoveOutcome.EXIT.value)
+    landing_cells = [kernel.landing_cells[cell][moving[cell]].tolist() for cell in range(len(kernel.landing_cells))]
+    return landing_cells, exiting_moves.any(axis=1).tolist()
+
+
+def _reverse(landing_cells):
+    previous_cells = [[] for _ in range(len(landing_cells))]
+    for cell, cell_landing_cells in enumerate(landing_cells):
+        for landing_cell in cell_landing_cells:
+            previous_cells[landing_cell].append(cell)
+    return previous_cells
+
+
+def get_distances_to_exit(board, previous_cells=None, can_exit=None):
+    if previous_cells is None:
+        landing_cells, can_exit = get_move_transitions(board)
+        previous_cells = _reverse(landing_cells)
+    distances = np.full(len(previous_cells), UNREACHABLE, dtype=np.int32)
+    queue = deque()
+    for cell, cell_can_exit in enumerate(can_exit):
+        if cell_can_exit:
+            distances[cell] = 1
+            queue.append(cell)
+    while queue:
+        cell = queue.popleft()
+        for previous_cell in previous_cells[cell]:
+            if distances[previous_cell] == UNREACHABLE:
+                distances[previous_cell] = distances[cell] + 1
+                queue.append(previous_cell)
+    return distances
+
+
+def analyze_board_paths(board):
+    landing_cells, can_exit = get_move_transitions(board)
+    previous_cells = _reverse(landing_cells)
+    distances_to_exit = get_distances_to_exit(board, previous_cells=previous_cells, can_exit=can_exit)
+
+    # Dial's algorithm seeded from every treasure at its distance to an exit: each cell ends up with the shortest
+    # cell -> treasure -> exit route and the treasure that route goes through.
+    num_cells = len(landing_cells)
+    totals = np.full(num_cells, UNREACHABLE, dtype=np.int32)
+    route_treasures = np.full(num_cells, UNREACHABLE, dtype=np.int32)
+    buckets = [[] for _ in range(int(distances_to_exit.max(initial=0)) + num_cells + 1)]
+    for x in range(board.width):
+        for y in range(board.height):
+            cell = x * board.height + y
+            if board.grid[x][y].has_treasure() and distances_to_exit[cell] != UNREACHABLE:
+                buckets[distances_to_exit[cell]].append((cell, cell))
+    for distance, bucket in enumerate(buckets):
+        for cell, treasure_cell in bucket:
+            if totals[cell] != UNREACHABLE:
+                continue
+            totals[cell] = distance
+            route_treasures[cell] = treasure_cell
+            for previous_cell in previous_cells[cell]:
+                if totals[previous_cell] == UNREACHABLE:
+                    buckets[distance + 1].append((previous_cell, treasure_cell))
+
+    spawn_cells = np.array([location.x * board.height + location.y for location in board.safe_locations],
+                           dtype=np.int32)
+    total = totals[spawn_cells]
+    reachable = total != UNREACHABLE
+    treasure_to_exit = np.where(reachable, distances_to_exit[route_treasures[spawn_cells]], UNREACHABLE)
+    spawn_to_treasure = np.where(reachable, total - treasure_to_exit, UNREACHABLE)
+    return BoardPathMetrics(spawn_cells=spawn_cells, spawn_to_treasure=spawn_to_treasure.astype(np.int32),
+                            treasure_to_exit=treasure_to_exit.astype(np.int32), total=total)
@@ -0,0 +1,169 @@
+import numpy as np
+
+from src.borders import Exit
+from src.datatypes import TileType, Direction, PortalType
+from src.location import Location
+from src.symbols import PORTAL_F_SYMBOL, PORTAL_A_SYMBOL, PORTAL_B_SYMBOL, PORTAL_1_SYMBOL, PORTAL_2_SYMBOL, \
+    PORTAL_3_SYMBOL
+from src.tiles import TileFactory, River, Portal
+from src.wall_index import DIRECTION_BITS, DIRECTION_DELTAS
+
+NO_DIRECTION = 0
+NO_PORTAL = 0
+NO_PORTAL_EXIT = -1
+PORTAL_SYMBOLS = (None, PORTAL_F_SYMBOL, PORTAL_A_SYMBOL, PORTAL_B_SYMBOL, PORTAL_1_SYMBOL, PORTAL_2_SYMBOL,
+                  PORTAL_3_SYMBOL)
+
+
+class BoardArrays:
+    # Every per-tile array has shape (width, height) so it is indexed [x, y] like Board.grid. Cells are referred to by
+    # their flat index x * height + y, which is also their position in Board.all_locations.
+    def __init__(self, config: dict, tile_types: np.ndarray, river_directions: np.ndarray, portal_types: np.ndarray,
+                 portal_symbols: np.ndarray, portal_exits: np.ndarray, treasures: np.ndarray, wall_masks: np.ndarray,
+                 exits: np.ndarray, safe_cells: np.ndarray):
+        self.config = config
+        self.height = config['height']
+        self.width = config['width']
+        self.tile_types = tile_types
+        self.river_directions = river_directions
+        self.portal_types = portal_types
+        self.portal_symbols = portal_symbols
+        self.portal_exits = portal_exits
+        self.treasures = treasures
+        self.wall_masks = wall_masks
+        self.exits = exits
+        self.safe_cells = safe_cells
+
+    def cell_index(self, x: int, y: int):
+        return x * self.height + y
+
+    def cell_coordinates(self, cell: int):
+        return divmod(cell, self.height)
+
+    @staticmethod
+    def from_board(board):
+        shape = (board.width, board.height)
+        tile_types = np.zeros(shape, dtype=np.int8)
+        river_directions = np.full(shape, NO_DIRECTION, dtype=np.int8)
+        portal_types = np.full(shape, NO_PORTAL, dtype=np.int8)
+        portal_symbols = np.full(shape, NO_PORTAL, dtype=np.int8)
+        portal_exits = np.full(shape, NO_PORTAL_EXIT, dtype=np.int32)
+        treasures = np.zeros(shape, dtype=np.int8)
+
+        for x in range(board.width):
+            for y in range(board.height):
+                tile = board.grid[x][y]
+                tile_types[x, y] = tile.type.value
+                treasures[x, y] = tile.num_treasure
+                if tile.type == TileType.RIVER:
+                    river_directions[x, y] = tile.direction.value
+                elif tile.type == TileType.PORTAL:
+                    portal_types[x, y] = tile.portal_type.value
+                    portal_symbols[x, y] = PORTAL_SYMBOLS.index(tile.symbol)
+                    portal_exits[x, y] = tile.exit_location.x * board.height + tile.exit_location.y
+
+        exits = np.array([[ex.location.x, ex.location.y, ex.direction.value] for ex in board.exits],
+                         dtype=np.int32).reshape(-1, 3)
+        safe_cells = np.array([location.x * board.height + location.y for location in board.safe_locations],
+                              dtype=np.int32)
+        return BoardArrays(config=board.get_config(), tile_types=tile_types, river_directions=river_directions,
+                           portal_types=portal_types, portal_symbols=portal_symbols, portal_exits=portal_exits,
+                           treasures=treasures, wall_masks=board.wall_index.blocked.copy(), exits=exits,
+                           safe_cells=safe_cells)
+
+    def create_tile(self, x: int, y: int, location: Location = None):
+        if location is None:
+            location = Location(x=x, y=y)
+        tile_type = TileType(self.tile_types[x, y])
+        if tile_type == TileType.RIVER:
+            tile = River(location=location, direction=Direction(self.river_directions[x, y]))
+        elif tile_type == TileType.PORTAL:
+            exit_x, exit_y = self.cell_coordinates(int(self.portal_exits[x, y]))
+            tile = Portal(location=location, exit_location=Location(x=exit_x, y=exit_y),
+                          portal_type=PortalType(self.portal_types[x, y]),
+                          name=PORTAL_SYMBOLS[self.portal_symbols[x, y]])
+        else:
+            tile = TileFactory.create_static_tile(tile_type=tile_type, location=location)
+        tile.num_treasure = int(self.treasures[x, y])
+        return tile
+
+    def to_inner_walls(self):
+        right_xs, right_ys = np.nonzero(self.wall_masks[:self.width - 1, :] & DIRECTION_BITS[Direction.RIGHT])
+        up_xs, up_ys = np.nonzero(self.wall_masks[:, :self.height - 1] & DIRECTION_BITS[Direction.UP])
+        right_edge_ids = 2 * (right_xs * self.height + right_ys)
+        up_edge_ids = 2 * (up_xs * self.height + up_ys) + 1
+        return frozenset(np.concatenate([right_edge_ids, up_edge_ids]).tolist())
+
+    def get_landing_cells(self):
+        # The cell a player ends up on after stepping onto each cell: rivers push one tile downstream when that stays
+        # on the board and portals send the player to their exit.
+        xs, ys = np.meshgrid(np.arange(self.width), np.arange(self.height), indexing='ij')
+        x_deltas = np.zeros(len(Direction) + 1, dtype=np.int32)
+        y_deltas = np.zeros(len(Direction) + 1, dtype=np.int32)
+        for direction, (x_delta, y_delta) in DIRECTION_DELTAS.items():
+            x_deltas[direction.value] = x_delta
+            y_deltas[direction.value] = y_delta
+
+        downstream_xs = xs + x_deltas[self.river_directions]
+        downstream_ys = ys + y_deltas[self.river_directions]
+        downstream_in_bounds = (0 <= downstream_xs) & (downstream_xs < self.width) & \
+                               (0 <= downstream_ys) & (downstream_ys < self.height)
+        landing_cells = np.where(downstream_in_bounds, downstream_xs * self.height + downstream_ys,
+                                 xs * self.height + ys)
+        return np.where(self.tile_types == TileType.PORTAL.value, self.portal_exits, landing_cells)
+
+    def get_heat_map(self):
+        landing_cells = self.get_landing_cells()
+        heat_map = np.zeros(self.width * self.height, dtype=np.int64)
+        for direction, bit in DIRECTION_BITS.items():
+            x_delta, y_delta = DIRECTION_DELTAS[direction]
+            # The border bits in wall_masks guarantee every open side leads to a neighbor on the board.
+            xs, ys = np.nonzero((self.wall_masks & bit) == 0)
+            heat_map += np.bincount(landing_cells[xs + x_delta, ys + y_delta],
+                                    minlength=self.width * self.height)
+        return np.flipud(heat_map.reshape(self.width, self.height).transpose())
+
+    def to_exits(self):
+        return [Exit(location=Location(x=int(x), y=int(y)), direction=Direction(direction))
+                for x, y, direction in self.exits]
+
+
+class LazyGrid:
+    # Board.grid for a board built from arrays: grid[x][y] creates the tile from the arrays the first time it is looked
+    # up and returns that same tile afterwards.
+    def __init__(self, board_arrays: BoardArrays, all_locations):
+        self._columns = [LazyGridColumn(board_arrays, x, all_locations) for x in range(board_arrays.width)]
+
+    def __len__(self):
+        return len(self._columns)
+
+    def __getitem__(self, x: int):
+        return self._columns[x]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+
+class LazyGridColumn:
+    def __init__(self, board_arrays: BoardArrays, x: int, all_locations):
+        self._board_arrays = board_arrays
+        self._x = x
+        self._all_locations = all_locations
+        self._tiles = [None] * board_arrays.height
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def __getitem__(self, y: int):
+        tile = self._tiles[y]
+        if tile is None:
+            y = y % len(self._tiles)
+            location = self._all_locations[self._board_arrays.cell_index(self._x, y)]
+            tile = self._tiles[y] = self._board_arrays.create_tile(self._x, y, location=location)
+        return tile
+
+    def __setitem__(self, y: int, tile):
+        self._tiles[y] = tile
+
+    def __iter__(self):
+        return (self[y] for y in range(len(self._tiles)))
@@ -0,0 +1,73 @@
+import os
+import json
+import zlib
+import hashlib
+
+from src.board import Board
+from src.board_serialization import serialize_board, deserialize_board, BOARD_FORMAT_VERSION
+from src.constants import BOARD_CACHE_DIR, BOARD_CACHE_MAX_BYTES, BOARD_GENERATOR_VERSION
+
+BOARD_CACHE_FILE_EXTENSION = '.board.z'
+
+
+class BoardCache:
+    def __init__(self, cache_dir: str = BOARD_CACHE_DIR, max_bytes: int = BOARD_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(seed: int, board_config: dict):
+        canonical_key = json.dumps({'seed': seed, 'board_config': board_config,
+                                    'generator_version': BOARD_GENERATOR_VERSION,
+                                    'format_version': BOARD_FORMAT_VERSION},
+                                   sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical_key.encode()).hexdigest()
+
+    def _get_file_path(self, key: str):
+        return os.path.join(self.cache_dir, f'{key}{BOARD_CACHE_FILE_EXTENSION}')
+
+    def get(self, seed: int, board_config: dict, auto_rng: bool = False):
+        file_path = self._get_file_path(self.key(seed, board_config))
+        try:
+            with open(file_path, 'rb') as f:
+                board_data = json.loads(zlib.decompress(f.read()))
+            board = deserialize_board(board_data, auto_rng=auto_rng)
+        except FileNotFoundError:
+            return None
+        except (zlib.error, ValueError, KeyError):
+            os.remove(file_path)
+            return None
+        os.utime(file_path)
+        return board
+
+    def put(self, seed: int, board_config: dict, board: Board):
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        file_path = self._get_file_path(self.key(seed, board_config))
+        tmp_file_path = f'{file_path}.{os.getpid()}.tmp'
+        with open(tmp_file_path, 'wb') as f:
+            f.write(zlib.compress(json.dumps(serialize_board(board), separators=(',', ':')).encode()))
+        os.replace(tmp_file_path, file_path)
+        self._evict()
+
+    def get_or_generate(self, seed: int, board_config: dict, auto_rng: bool = False):
+        board = self.get(seed, board_config, auto_rng=auto_rng)
+        if board is None:
+            board = Board(**board_config, auto_rng=auto_rng, seed=seed)
+            self.put(seed, board_config, board)
+        return board
+
+    def _evict(self):
+        cache_entries = []
+        total_bytes = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(BOARD_CACHE_FILE_EXTENSION):
+                stat = entry.stat()
+                cache_entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+        for _, size, file_path in sorted(cache_entries):
+            if total_bytes <= self.max_bytes:
+                break
+            os.remove(file_path)
+            total_bytes -= size
+
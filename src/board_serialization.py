@@ -0,0 +1,77 @@
+from src.board import Board
+from src.borders import Exit
+from src.datatypes import TileType, Direction, PortalType
+from src.location import Location
+from src.tiles import TileFactory, River, Portal
+
+BOARD_FORMAT_VERSION = 3
+
+VERSION = 'version'
+SEED = 'seed'
+CONFIG = 'config'
+TILES = 'tiles'
+INNER_WALLS = 'inner_walls'
+EXITS = 'exits'
+SAFE_LOCATIONS = 'safe_locations'
+
+TILE_TYPE = 'type'
+NUM_TREASURE = 'num_treasure'
+DIRECTION = 'direction'
+PORTAL_TYPE = 'portal_type'
+PORTAL_SYMBOL = 'symbol'
+PORTAL_EXIT = 'exit'
+
+
+def _serialize_tile(tile):
+    tile_data = {TILE_TYPE: tile.type.name}
+    if tile.num_treasure > 0:
+        tile_data[NUM_TREASURE] = tile.num_treasure
+    if tile.type == TileType.RIVER:
+        tile_data[DIRECTION] = tile.direction.name
+    elif tile.type == TileType.PORTAL:
+        tile_data[PORTAL_TYPE] = tile.portal_type.name
+        tile_data[PORTAL_SYMBOL] = tile.symbol
+        tile_data[PORTAL_EXIT] = list(tile.exit_location.get_coordinates())
+    return tile_data
+
+
+def _deserialize_tile(tile_data, location: Location):
+    tile_type = TileType[tile_data[TILE_TYPE]]
+    if tile_type == TileType.RIVER:
+        tile = River(location=location, direction=Direction[tile_data[DIRECTION]])
+    elif tile_type == TileType.PORTAL:
+        exit_x, exit_y = tile_data[PORTAL_EXIT]
+        tile = Portal(location=location, exit_location=Location(x=exit_x, y=exit_y),
+                      portal_type=PortalType[tile_data[PORTAL_TYPE]], name=tile_data[PORTAL_SYMBOL])
+    else:
+        tile = TileFactory.create_static_tile(tile_type=tile_type, location=location)
+    tile.num_treasure = tile_data.get(NUM_TREASURE, 0)
+    return tile
+
+
+def serialize_board(board: Board):
+    return {
+        VERSION: BOARD_FORMAT_VERSION,
+        SEED: board.seed,
+        CONFIG: board.get_config(),
+        TILES: [[_serialize_tile(board.grid[x][y]) for y in range(board.height)] for x in range(board.width)],
+        INNER_WALLS: sorted(board.inner_walls),
+        EXITS: [[list(ex.location.get_coordinates()), ex.direction.name] for ex in board.exits],
+        SAFE_LOCATIONS: [list(location.get_coordinates()) for location in board.safe_locations]
+    }
+
+
+def deserialize_board(board_data, auto_rng: bool = False):
+    if board_data[VERSION] != BOARD_FORMAT_VERSION:
+        raise ValueError(f"Unsupported board format version {board_data[VERSION]}. "
+                         f"Expected version {BOARD_FORMAT_VERSION}.")
+    config = board_data[CONFIG]
+    height, width = config['height'], config['width']
+    grid = [[_deserialize_tile(board_data[TILES][x][y], Location(x=x, y=y)) for y in range(height)]
+            for x in range(width)]
+    inner_walls = frozenset(board_data[INNER_WALLS])
+    exits = [Exit(location=Location(x=x, y=y), direction=Direction[direction])
+             for (x, y), direction in board_data[EXITS]]
+    safe_locations = [Location(x=x, y=y) for x, y in board_data[SAFE_LOCATIONS]]
+    return Board(**config, inner_walls=inner_walls, exits=exits, grid=grid, generate_contents=False,
+                 safe_locations=safe_locations, auto_rng=auto_rng, seed=board_data[SEED])
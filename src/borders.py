@@ -3,22 +3,25 @@ from typing import Tuple
 from src.location import Location
 from src.datatypes import Direction
 
-class Wall:
-    def __init__(self, adjacent_locations: Tuple[Location, Location]):
-        self.adjacent_locations = adjacent_locations
 
-    def __eq__(self, other):
-        exactly_equal = self.adjacent_locations == other.adjacent_locations
-        reverse_equal = self.adjacent_locations == other.adjacent_locations[::-1]
-        return exactly_equal or reverse_equal
+# Inner walls are identified by the edge they sit on. The edge between (x, y) and (x + 1, y) has id 2 * cell and the
+# edge between (x, y) and (x, y + 1) has id 2 * cell + 1, where cell = x * board_height + y is the lower-left tile.
+def get_wall_edge_id(location_1: Location, location_2: Location, board_height: int):
+    x, y = min(location_1.x, location_2.x), min(location_1.y, location_2.y)
+    if location_1.y == location_2.y and abs(location_1.x - location_2.x) == 1:
+        return 2 * (x * board_height + y)
+    if location_1.x == location_2.x and abs(location_1.y - location_2.y) == 1:
+        return 2 * (x * board_height + y) + 1
+    raise ValueError(f"Locations {location_1} and {location_2} are not adjacent.")
 
-    def __hash__(self):
-        loc_1, loc_2 = self.adjacent_locations
-        loc_r1, loc_r2 = self.adjacent_locations[::-1]
-        return hash((loc_1.x^loc_r1.x, loc_2.y^loc_r2.y))
 
-    def __str__(self):
-        return f'({str(self.adjacent_locations[0])}, {str(self.adjacent_locations[1])})'
+def get_wall_edge_locations(edge_id: int, board_height: int) -> Tuple[Location, Location]:
+    cell, is_up_edge = divmod(edge_id, 2)
+    x, y = divmod(cell, board_height)
+    if is_up_edge:
+        return Location(x=x, y=y), Location(x=x, y=y + 1)
+    return Location(x=x, y=y), Location(x=x + 1, y=y)
+
 
 class Exit:
     def __init__(self, location: Location, direction: Direction):
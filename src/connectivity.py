@@ -0,0 +1,36 @@
+# Walls are tracked on the lattice of tile corners, with every outer border corner merged into one node. A new wall
+# disconnects the board exactly when its two end corners are already joined by other walls (it closes a loop).
+class WallConnectivity:
+
+    def __init__(self, height: int, width: int):
+        self.height = height
+        self.width = width
+        self._border_corner = (width + 1) * (height + 1)
+        self._parent = list(range(self._border_corner + 1))
+
+    def _corner(self, x: int, y: int):
+        if x == 0 or y == 0 or x == self.width or y == self.height:
+            return self._border_corner
+        return x * (self.height + 1) + y
+
+    def _find(self, corner: int):
+        parent = self._parent
+        while parent[corner] != corner:
+            parent[corner] = parent[parent[corner]]
+            corner = parent[corner]
+        return corner
+
+    def _wall_corners(self, wall_edge_id: int):
+        cell, is_up_edge = divmod(wall_edge_id, 2)
+        x, y = divmod(cell, self.height)
+        if is_up_edge:
+            return self._corner(x, y + 1), self._corner(x + 1, y + 1)
+        return self._corner(x + 1, y), self._corner(x + 1, y + 1)
+
+    def wall_disconnects_board(self, wall_edge_id: int):
+        corner_1, corner_2 = self._wall_corners(wall_edge_id)
+        return self._find(corner_1) == self._find(corner_2)
+
+    def add_wall(self, wall_edge_id: int):
+        corner_1, corner_2 = self._wall_corners(wall_edge_id)
+        self._parent[self._find(corner_1)] = self._find(corner_2)
@@ -1,6 +1,15 @@
 MIN_GAME_SEED = 0
 MAX_GAME_SEED = 2**32
+MAX_XP = 7
 
 GAME_BACKUP_DIR = '/var/tmp/labyrinth_game'
 FAVORITE_GAMES_FILE_PATH = '/var/tmp/labyrinth_game_favorite_boards.json'
 STR_GAME_BOARDS_DIR = '/var/tmp/str_game_boards'
+BOARD_CACHE_DIR = '/var/tmp/labyrinth_game_board_cache'
+BOARD_CACHE_MAX_BYTES = 256 * 2**20
+
+# Bump whenever a change to board generation makes the same seed and config produce a different board.
+BOARD_GENERATOR_VERSION = 2
+
+# Turns between the checkpoints a replay keeps, so seeking to any turn replays at most this many turns.
+REPLAY_CHECKPOINT_INTERVAL = 100
@@ -66,3 +66,34 @@ class XPExchangeType(Enum):
     REVEAL_SHOP = 2
     REVEAL_OBSTACLE = 3
     HEAL_INSTANTLY = 4
+
+
+class MoveOutcome(Enum):
+    MOVED = 1
+    BLOCKED = 2
+    EXIT = 3
+    FLUSHED = 4
+    FLUSHED_INTO_EXIT = 5
+    TELEPORTED = 6
+    MARSH = 7
+
+
+class EventType(Enum):
+    MOVED = 1
+    BLOCKED = 2
+    FLUSHED = 3
+    TELEPORTED = 4
+    FOUGHT = 5
+    INJURED = 6
+    TREASURE_ACQUIRED = 7
+    XP_SPENT = 8
+    GAME_OVER = 9
+    TILE_ENTERED = 10
+    ENCOUNTERED = 11
+    SHOT = 12
+    ITEM_ACQUIRED = 13
+    ITEM_LOST = 14
+    TREASURE_DROPPED = 15
+    HEALED = 16
+    TURN_LOST = 17
+    XP_GAINED = 18
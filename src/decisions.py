@@ -0,0 +1,48 @@
+from typing import List
+
+from src.exceptions import ReplayDiverged
+
+
+class DecisionStream:
+    # Every choice a game depends on, in the order it was made: the index of each chosen move, whether a rusty bullet
+    # was used, dice rolls and the item drawn from a shop. turn_starts[turn] is the number of decisions made before that
+    # turn began. While recording, choices are appended as they are made. While replaying, they are read back from
+    # replay_position onwards instead of being made again.
+    def __init__(self, decisions: List[int] = None, turn_starts: List[int] = None, replay_position: int = None):
+        self.decisions = decisions if decisions is not None else []
+        self.turn_starts = turn_starts if turn_starts is not None else []
+        self.replay_position = replay_position
+        self.num_turns = len(self.turn_starts) if replay_position is None else 0
+
+    def is_replaying(self):
+        return self.replay_position is not None
+
+    def begin_turn(self):
+        if not self.is_replaying():
+            self.turn_starts.append(len(self.decisions))
+        self.num_turns += 1
+
+    def next_decision(self):
+        if self.replay_position >= len(self.decisions):
+            raise ReplayDiverged(f"The replay needed more than the {len(self.decisions)} recorded decisions.")
+        decision = self.decisions[self.replay_position]
+        self.replay_position += 1
+        return decision
+
+    def record(self, decision: int):
+        if not self.is_replaying():
+            self.decisions.append(decision)
+        return decision
+
+    def get_num_decisions(self):
+        return len(self.decisions) if not self.is_replaying() else self.replay_position
+
+    def rewind(self, num_turns: int, num_decisions: int):
+        # Goes back to the point where num_turns turns had begun and num_decisions decisions had been made. A recording
+        # forgets what came after it, a replay reads on from there.
+        if self.is_replaying():
+            self.replay_position = num_decisions
+        else:
+            del self.decisions[num_decisions:]
+            del self.turn_starts[num_turns:]
+        self.num_turns = num_turns
@@ -0,0 +1,366 @@
+import json
+
+from abc import ABC, abstractmethod
+from collections import Counter
+from enum import Enum
+
+from src.datatypes import EventType, TileType, StatusType
+
+
+TILE_ENTRY_DESCRIPTIONS = {
+    TileType.SAFE: f"walks into a {TileType.SAFE.name} clearing.",
+    TileType.MARSH: f"sinks into a {TileType.MARSH.name}.",
+    TileType.SHOP: f"enters a RANDOM ITEM {TileType.SHOP.name}.",
+    TileType.HOSPITAL: f"enters a {TileType.HOSPITAL.name}.",
+    TileType.PORTAL: "enters and exits a portal.",
+    TileType.RIVER: f"swims into the {TileType.RIVER.name}."
+}
+
+
+# Events are only built when a sink is attached, so emitters guard with `if events.enabled:` and a game without sinks
+# pays a single attribute check per event.
+class GameEvent:
+    __slots__ = ('player_name',)
+    event_type = None
+
+    def __init__(self, player_name: str):
+        self.player_name = player_name
+
+    def describe(self):
+        return None
+
+    def to_dict(self):
+        event_dict = {'type': self.event_type.name}
+        for cls in reversed(type(self).__mro__):
+            for slot in getattr(cls, '__slots__', ()):
+                value = getattr(self, slot)
+                event_dict[slot] = value.name if isinstance(value, Enum) else value
+        return event_dict
+
+
+class MovedEvent(GameEvent):
+    __slots__ = ('direction', 'x', 'y')
+    event_type = EventType.MOVED
+
+    def __init__(self, player_name, direction, x, y):
+        super().__init__(player_name)
+        self.direction = direction
+        self.x = x
+        self.y = y
+
+    def describe(self):
+        return f'{self.player_name} moves {self.direction.name}.'
+
+
+class BlockedEvent(GameEvent):
+    __slots__ = ('direction', 'reached_exit')
+    event_type = EventType.BLOCKED
+
+    def __init__(self, player_name, direction, reached_exit=False):
+        super().__init__(player_name)
+        self.direction = direction
+        self.reached_exit = reached_exit
+
+    def describe(self):
+        if self.reached_exit:
+            return f"{self.player_name} has found an exit, but has no treasure."
+        return f'{self.player_name} cannot move {self.direction.name}. Blocked by wall.'
+
+
+class FlushedEvent(GameEvent):
+    __slots__ = ('direction', 'moved', 'reached_exit')
+    event_type = EventType.FLUSHED
+
+    def __init__(self, player_name, direction, moved, reached_exit=False):
+        super().__init__(player_name)
+        self.direction = direction
+        self.moved = moved
+        self.reached_exit = reached_exit
+
+    def describe(self):
+        if self.moved:
+            return f"{self.player_name} is flushed by the river one tile."
+        if self.reached_exit:
+            return f"{self.player_name} has been flushed into an exit, but has no treasure, so does not move farther."
+        return f"The river tries to flush {self.player_name}, but a wall prevents him/her from moving."
+
+
+class TeleportedEvent(GameEvent):
+    # The portal announces itself when it is entered, and where it leads stays secret, so there is nothing to print.
+    __slots__ = ('x', 'y')
+    event_type = EventType.TELEPORTED
+
+    def __init__(self, player_name, x, y):
+        super().__init__(player_name)
+        self.x = x
+        self.y = y
+
+
+class FoughtEvent(GameEvent):
+    __slots__ = ('other_player_name', 'won', 'used_bullet')
+    event_type = EventType.FOUGHT
+
+    def __init__(self, player_name, other_player_name, won, used_bullet=False):
+        super().__init__(player_name)
+        self.other_player_name = other_player_name
+        self.won = won
+        self.used_bullet = used_bullet
+
+    def describe(self):
+        if self.used_bullet:
+            return f"{self.player_name} shoots and injures {self.other_player_name}."
+        if self.won:
+            return f"{self.player_name} overpowers {self.other_player_name} and wins the fight."
+        return f"{self.other_player_name} fights back and overcomes {self.player_name}."
+
+
+class InjuredEvent(GameEvent):
+    __slots__ = ()
+    event_type = EventType.INJURED
+
+    def describe(self):
+        return f"{self.player_name} has been injured."
+
+
+class TreasureAcquiredEvent(GameEvent):
+    __slots__ = ()
+    event_type = EventType.TREASURE_ACQUIRED
+
+    def describe(self):
+        return f"{self.player_name} has acquired a pile of treasure."
+
+
+class XPSpentEvent(GameEvent):
+    __slots__ = ('amount', 'xp')
+    event_type = EventType.XP_SPENT
+
+    def __init__(self, player_name, amount, xp):
+        super().__init__(player_name)
+        self.amount = amount
+        self.xp = xp
+
+    def describe(self):
+        return f"{self.player_name} has spent {self.amount} XP and now has {self.xp} XP."
+
+
+class GameOverEvent(GameEvent):
+    __slots__ = ('executed_moves',)
+    event_type = EventType.GAME_OVER
+
+    def __init__(self, player_name, executed_moves):
+        super().__init__(player_name)
+        self.executed_moves = executed_moves
+
+    def describe(self):
+        return f"{self.player_name} has exited the maze with the treasure and won the game."
+
+
+class TileEnteredEvent(GameEvent):
+    __slots__ = ('tile_type', 'x', 'y', 'found_treasure', 'injured')
+    event_type = EventType.TILE_ENTERED
+
+    def __init__(self, player_name, tile_type, x, y, found_treasure=False, injured=False):
+        super().__init__(player_name)
+        self.tile_type = tile_type
+        self.x = x
+        self.y = y
+        self.found_treasure = found_treasure
+        self.injured = injured
+
+    def describe(self):
+        lines = [f"{self.player_name} {TILE_ENTRY_DESCRIPTIONS[self.tile_type]}"]
+        if self.found_treasure:
+            lines.append(f"{self.player_name} also stumbles across a pile of {TileType.TREASURE.name}")
+            if self.injured:
+                lines.append(f"However, {self.player_name} is {StatusType.INJURED.name} so he/she cannot acquire the "
+                             f"treasure.")
+        return '\n'.join(lines)
+
+
+class EncounteredEvent(GameEvent):
+    __slots__ = ('other_player_name', 'other_player_status')
+    event_type = EventType.ENCOUNTERED
+
+    def __init__(self, player_name, other_player_name, other_player_status):
+        super().__init__(player_name)
+        self.other_player_name = other_player_name
+        self.other_player_status = other_player_status
+
+    def describe(self):
+        status = self.other_player_status.name
+        article = 'an' if status[0].lower() in 'aeiou' else 'a'
+        return f"{self.player_name} has stumbled across {article} {status} {self.other_player_name}."
+
+
+class ShotEvent(GameEvent):
+    __slots__ = ('direction', 'other_player_name', 'injured_other_player', 'hit_wall')
+    event_type = EventType.SHOT
+
+    def __init__(self, player_name, direction, other_player_name=None, injured_other_player=False, hit_wall=False):
+        super().__init__(player_name)
+        self.direction = direction
+        self.other_player_name = other_player_name
+        self.injured_other_player = injured_other_player
+        self.hit_wall = hit_wall
+
+    def describe(self):
+        if self.hit_wall:
+            return f"{self.player_name} shoots {self.direction.name}, but hits a wall."
+        if self.other_player_name is None:
+            return f"{self.player_name} shoots 3 spaces {self.direction.name}, but hits nothing."
+        if self.injured_other_player:
+            return f"{self.player_name} successfully shoots and injures {self.other_player_name}."
+        return f"{self.player_name} shoots {self.other_player_name}, but {self.other_player_name} is already injured."
+
+
+class ItemAcquiredEvent(GameEvent):
+    __slots__ = ('item_name', 'bought')
+    event_type = EventType.ITEM_ACQUIRED
+
+    def __init__(self, player_name, item_name, bought=False):
+        super().__init__(player_name)
+        self.item_name = item_name
+        self.bought = bought
+
+    def describe(self):
+        description = f"{self.player_name} has acquired a {self.item_name}."
+        if self.bought:
+            return f"Thank you for your purchase!\n{description}"
+        return description
+
+
+class ItemLostEvent(GameEvent):
+    __slots__ = ('item_name', 'dropped')
+    event_type = EventType.ITEM_LOST
+
+    def __init__(self, player_name, item_name, dropped=False):
+        super().__init__(player_name)
+        self.item_name = item_name
+        self.dropped = dropped
+
+    def describe(self):
+        if self.dropped:
+            return f"{self.player_name} has dropped his/her {self.item_name}."
+        return f"{self.player_name} has lost his/her {self.item_name}."
+
+
+class TreasureDroppedEvent(GameEvent):
+    __slots__ = ()
+    event_type = EventType.TREASURE_DROPPED
+
+    def describe(self):
+        return f"{self.player_name} has dropped his/her pile of treasure."
+
+
+class HealedEvent(GameEvent):
+    # A hospital heals over the player's next turn, so entering one only schedules the heal.
+    __slots__ = ('scheduled',)
+    event_type = EventType.HEALED
+
+    def __init__(self, player_name, scheduled=False):
+        super().__init__(player_name)
+        self.scheduled = scheduled
+
+    def describe(self):
+        if self.scheduled:
+            return f"{self.player_name} will heal spend his/her next turn healing."
+        return f"{self.player_name} is healed and is now HEALTHY."
+
+
+class TurnLostEvent(GameEvent):
+    # Landing in a marsh costs the next turn, which is skipped when it comes around.
+    __slots__ = ('skipped',)
+    event_type = EventType.TURN_LOST
+
+    def __init__(self, player_name, skipped=False):
+        super().__init__(player_name)
+        self.skipped = skipped
+
+    def describe(self):
+        if self.skipped:
+            return f"Sorry {self.player_name}, you have lost your turn."
+        return f"{self.player_name} loses his/her turn."
+
+
+class XPGainedEvent(GameEvent):
+    __slots__ = ('amount', 'xp', 'reached_max', 'holding_treasure')
+    event_type = EventType.XP_GAINED
+
+    def __init__(self, player_name, amount, xp, reached_max=False, holding_treasure=False):
+        super().__init__(player_name)
+        self.amount = amount
+        self.xp = xp
+        self.reached_max = reached_max
+        self.holding_treasure = holding_treasure
+
+    def describe(self):
+        if self.holding_treasure:
+            return f"{self.player_name} cannot gain XP while holding treasure."
+        if self.reached_max:
+            return f"{self.player_name} has gained {self.amount} XP to reach the maximum of {self.xp}."
+        return f"{self.player_name} has gained {self.amount} XP for a total of {self.xp}."
+
+
+class EventSink(ABC):
+
+    @abstractmethod
+    def handle(self, event: GameEvent):
+        pass
+
+    def close(self):
+        pass
+
+
+class ConsoleSink(EventSink):
+
+    def handle(self, event: GameEvent):
+        description = event.describe()
+        if description is not None:
+            print(description)
+
+
+class JsonlSink(EventSink):
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, 'a')
+
+    def handle(self, event: GameEvent):
+        self._file.write(json.dumps(event.to_dict()) + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+class CounterSink(EventSink):
+
+    def __init__(self):
+        self.counts = Counter()
+        self.player_counts = Counter()
+
+    def handle(self, event: GameEvent):
+        self.counts[event.event_type] += 1
+        self.player_counts[(event.player_name, event.event_type)] += 1
+
+
+class EventDispatcher:
+
+    def __init__(self, sinks=None):
+        self.sinks = list(sinks) if sinks is not None else []
+        self.enabled = len(self.sinks) > 0
+
+    def add_sink(self, sink: EventSink):
+        self.sinks.append(sink)
+        self.enabled = True
+
+    def remove_sink(self, sink: EventSink):
+        self.sinks.remove(sink)
+        self.enabled = len(self.sinks) > 0
+
+    def emit(self, event: GameEvent):
+        for sink in self.sinks:
+            sink.handle(event)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
@@ -36,3 +36,23 @@ class InvalidDirection(Exception):
 
 class ZeroRemainingSafeTiles(Exception):
 	pass
+
+
+class NoValidRiverPath(Exception):
+    pass
+
+
+class NoValidExitPlacement(Exception):
+    pass
+
+
+class GenerationBudgetExceeded(Exception):
+    pass
+
+
+class GenerationAttemptsExceeded(GenerationBudgetExceeded):
+    pass
+
+
+class ReplayDiverged(Exception):
+    pass
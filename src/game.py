@@ -5,35 +5,55 @@ from typing import List
 from signal import signal, SIGINT
 
 from src.board import Board
+from src.borders import get_wall_edge_locations
 from src.player import Player
 from src.movement import Movement
 from src.datatypes import Direction, TileType
 from src.symbols import *
 from tabulate import tabulate
+from src.autosave import AutosaveWriter
+from src.decisions import DecisionStream
+from src.events import EventDispatcher, EventSink, ConsoleSink, GameOverEvent
 from src.exceptions import GameOver
-from src.utils import ask_player_for_multiple_choice_input, save_game_backup
+from src.game_snapshot import GameSnapshot, PLAYER_ID
+from src.utils import ask_player_for_multiple_choice_input, derive_seed
 
 
 class Game:
     def __init__(self, board: Board = None, players: List[Player] = None, randomize_player_order=True,
                  game_id: str = '', random_seed: int = 0, active_player_index: int = 0, game_over: bool = False,
-                 display_all_info_each_turn=False, auto_rng: bool = False):
+                 display_all_info_each_turn=False, auto_rng: bool = False, rng: random.Random = None,
+                 event_sinks: List[EventSink] = None, winner_index: int = None,
+                 initial_snapshot: GameSnapshot = None, decisions: DecisionStream = None):
         self.auto_rng = auto_rng
-        self.original_board = Board.copy_from(board=board, auto_rng=self.auto_rng)
         self.board = board
         self.random_seed = random_seed
+        if rng is None:
+            rng = random.Random(derive_seed(random_seed, 'game'))
+        self.rng = rng
+        if decisions is None:
+            decisions = DecisionStream()
+        self.decisions = decisions
+        if players is not None:
+            for player in players:
+                player.rng = self.rng
+                player.decisions = self.decisions
         if randomize_player_order:
             self.players = self._randomize_player_order(players)
         else:
             self.players = players
-        if players is not None:
-            self.original_players = [Player.copy_from(player=player, auto_rng=auto_rng) for player in players]
-        else:
-            self.original_players = players
         self.active_player_index = active_player_index
         self.game_over = game_over
+        self.winner_index = winner_index
         self.game_id = game_id
         self.display_all_info_each_turn = display_all_info_each_turn
+        self.event_sinks = event_sinks if event_sinks is not None else []
+        self.events = EventDispatcher(sinks=self.event_sinks)
+        self.autosave = None
+        self.executed_moves = 0
+        if initial_snapshot is None and players is not None:
+            initial_snapshot = self.snapshot()
+        self.initial_snapshot = initial_snapshot
 
     @staticmethod
     def copy_from(game, auto_rng: bool = False):
@@ -44,14 +64,32 @@ class Game:
             players.append(player)
         return Game(board=board, players=players, game_id=game.game_id, randomize_player_order=False,
                     random_seed=game.random_seed, active_player_index=game.active_player_index,
-                    game_over=game.game_over, display_all_info_each_turn=game.display_all_info_each_turn)
+                    game_over=game.game_over, display_all_info_each_turn=game.display_all_info_each_turn,
+                    rng=game.rng, event_sinks=game.event_sinks, winner_index=game.winner_index,
+                    initial_snapshot=game.initial_snapshot,
+                    decisions=DecisionStream(decisions=list(game.decisions.decisions),
+                                             turn_starts=list(game.decisions.turn_starts)))
+
+    def snapshot(self):
+        return GameSnapshot(active_player_index=self.active_player_index, game_over=self.game_over,
+                            winner_index=self.winner_index,
+                            player_states=[player.get_state() for player in self.players],
+                            treasure_counts=self.board.get_treasure_counts(), num_turns=self.decisions.num_turns,
+                            num_decisions=self.decisions.get_num_decisions())
+
+    def restore(self, snapshot: GameSnapshot):
+        players_by_id = {str(player.player_id): player for player in self.players}
+        self.players = [players_by_id[player_state[PLAYER_ID]] for player_state in snapshot.player_states]
+        for player, player_state in zip(self.players, snapshot.player_states):
+            player.set_state(player_state)
+        self.board.set_treasure_counts(snapshot.treasure_counts)
+        self.active_player_index = snapshot.active_player_index
+        self.game_over = snapshot.game_over
+        self.winner_index = snapshot.winner_index
+        self.decisions.rewind(num_turns=snapshot.num_turns, num_decisions=snapshot.num_decisions)
 
     def reset(self):
-        self.board = Board.copy_from(board=self.original_board, auto_rng=self.auto_rng)
-        self.players = [Player.copy_from(player=player) for player in self.original_players]
-        self.random_seed = self.random_seed
-        self.active_player_index = 0
-        self.game_over = False
+        self.restore(self.initial_snapshot)
 
     def display_player_statuses(self, reveal_secret_info=False):
         headers = ['Active', 'Name', 'Status', 'Item', 'Has Treasure', 'Can Move', 'Lost Next Turn', 'XP']
@@ -180,8 +218,8 @@ class Game:
                 empty_wall_row.append(VERTICAL_WALL)
                 grid_middle_rows.append(empty_wall_row)
 
-        for wall in self.board.inner_walls:
-            loc_1, loc_2 = wall.adjacent_locations
+        for wall_edge_id in self.board.inner_walls:
+            loc_1, loc_2 = get_wall_edge_locations(wall_edge_id, board_height=self.board.height)
             db_coord_1_x, db_coord_1_y = self._location_to_display_board_coords(loc_1)
             db_coord_2_x, db_coord_2_y = self._location_to_display_board_coords(loc_2)
             higher_x = max(db_coord_1_x, db_coord_2_x)
@@ -241,9 +279,8 @@ class Game:
                 print(block, end=" ")
             print()
 
-    @staticmethod
-    def _randomize_player_order(players):
-        random.shuffle(players)
+    def _randomize_player_order(self, players):
+        self.rng.shuffle(players)
         return players
 
     def next_player(self):
@@ -268,71 +305,113 @@ class Game:
 
     def sigint_handler(self, signal_received, frame):
         print()
+        if self.autosave is not None:
+            self.autosave.close()
+        self.events.close()
         print(f"Quitting game {self.game_id}. Run `./restore_game {self.game_id}` to restore this game. Or run "
               f"`./restore_game_omniscient {self.game_id}` to restore a game in omniscient mode")
         exit(0)
 
-    def run(self, auto_play=False, auto_turn_time_secs=1):
-        signal(SIGINT, self.sigint_handler)
-        print()
-        print('Beginning game...\n')
+    def run(self, auto_play=False, auto_turn_time_secs=1, headless=False, save_journal=None):
+        # Headless games are simulations: nothing is printed, nobody is waited on and no backup is written. Otherwise
+        # every turn that changed the game is saved to save_journal, when one is given, in the background.
+        if headless:
+            if not auto_play or not all(player.auto_rng for player in self.players):
+                raise ValueError("Headless games need auto_play and players with auto_rng, since nobody can be "
+                                 "asked for input.")
+            auto_turn_time_secs = 0
+        else:
+            signal(SIGINT, self.sigint_handler)
+            print()
+            print('Beginning game...\n')
+        if headless:
+            self.events = EventDispatcher(sinks=self.event_sinks)
+        else:
+            self.events = EventDispatcher(sinks=[ConsoleSink()] + self.event_sinks)
+        for player in self.players:
+            player.narrate = not headless
+            player.events = self.events
+        if save_journal is not None and not headless:
+            self.autosave = AutosaveWriter(self, save_journal)
         start = time.time()
-        executed_moves = 0
+        self.executed_moves = 0
 
         while not self.game_over:
-            active_player = self.players[self.active_player_index]
-            other_players = [player for player in self.players if player != active_player]
-            active_player.begin_turn()
-            tile = self.board.get_tile(active_player.location)
-            available_tile_actions = tile.get_optional_actions(active_player)
-            save_game_backup(game=self, game_id=self.game_id)
-            if not auto_play:
-                if not self.display_all_info_each_turn:
-                    self.ask_to_peek_at_game_info(active_player=active_player)
+            if self.autosave is not None:
+                self.autosave.submit()
             try:
-                while not active_player.is_turn_over(other_players=other_players,
-                                                     board=self.board,
-                                                     available_tile_actions=available_tile_actions):
-                    if self.display_all_info_each_turn:
-                        print()
-                        self.display_board()
-                        self.display_player_statuses(reveal_secret_info=True)
-                    original_location = active_player.location.copy()
-                    chosen_move = active_player.request_move(other_players=other_players,
-                                                             board=self.board,
-                                                             available_tile_actions=available_tile_actions,
-                                                             auto_play=auto_play,
-                                                             auto_turn_time_secs=auto_turn_time_secs)
-                    active_player.execute_move(chosen_move)
-                    if active_player.location != original_location:
-                        if isinstance(chosen_move, Movement):
-                            executed_moves += 1
-                            tile = self.board.get_tile(active_player.location)
-                            active_player.assign_most_recently_encountered_tile(tile=tile)
-                            tile.announce_tile(active_player)
-                            if tile.type == TileType.HOSPITAL:
-                                if not active_player.is_injured():
-                                    print(f"{active_player.name} is not injured, so there is no need to heal.")
-                            elif tile.type == TileType.SHOP:
-                                if active_player.has_item():
-                                    print(f"{active_player.name} is already holding an item, so he/she cannot acquire "
-                                          f"another until the held item is dropped.")
-                            active_player.execute_mandatory_actions()
-                            active_player.show_colliding_players(other_players=other_players)
-                    tile = self.board.get_tile(active_player.location)
-                    available_tile_actions = tile.get_optional_actions(active_player)
-                self.next_player()
+                self.play_turn(auto_play=auto_play, auto_turn_time_secs=auto_turn_time_secs, headless=headless)
             except GameOver:
-                print(f"{active_player.name} has exited the maze with the treasure and won the game.")
-                self.display_board()
-                self.display_player_statuses(reveal_secret_info=True)
                 end = time.time()
                 time_taken_in_secs = end - start
+                if self.events.enabled:
+                    self.events.emit(GameOverEvent(self.players[self.winner_index].name, self.executed_moves))
+                # Closing the dispatcher flushes sinks that write to files, such as JsonlSink.
+                self.events.close()
+                if self.autosave is not None:
+                    self.autosave.submit()
+                    self.autosave.close()
+                    self.autosave = None
+                if headless:
+                    return time_taken_in_secs, self.executed_moves
+                self.display_board()
+                self.display_player_statuses(reveal_secret_info=True)
                 str_start_time = time.strftime("%A, %D %B %Y, %r", time.localtime(start))
                 str_end_time = time.strftime("%A, %D %B %Y, %r", time.localtime(end))
                 str_total_time = time.strftime("%H:%M:%S", time.gmtime(time_taken_in_secs))
                 print(f"Game started on {str_start_time}")
                 print(f"Game ended on {str_end_time}")
                 print(f"Time elapsed {str_total_time}")
-                print(f"Total moves executed {executed_moves}")
-                return time_taken_in_secs, executed_moves
+                print(f"Total moves executed {self.executed_moves}")
+                return time_taken_in_secs, self.executed_moves
+
+    def play_turn(self, auto_play=False, auto_turn_time_secs=1, headless=False):
+        # Plays out the active player's turn, counting movements in executed_moves. When the active player wins, the
+        # game is marked as over before GameOver is raised.
+        active_player = self.players[self.active_player_index]
+        other_players = [player for player in self.players if player != active_player]
+        self.decisions.begin_turn()
+        active_player.begin_turn()
+        tile = self.board.get_tile(active_player.location)
+        available_tile_actions = tile.get_optional_actions(active_player)
+        if not auto_play:
+            if not self.display_all_info_each_turn:
+                self.ask_to_peek_at_game_info(active_player=active_player)
+        try:
+            while not active_player.is_turn_over(other_players=other_players,
+                                                 board=self.board,
+                                                 available_tile_actions=available_tile_actions,
+                                                 auto_play=auto_play):
+                if self.display_all_info_each_turn and not headless:
+                    print()
+                    self.display_board()
+                    self.display_player_statuses(reveal_secret_info=True)
+                original_location = active_player.location.copy()
+                chosen_move = active_player.request_move(other_players=other_players,
+                                                         board=self.board,
+                                                         available_tile_actions=available_tile_actions,
+                                                         auto_play=auto_play,
+                                                         auto_turn_time_secs=auto_turn_time_secs)
+                active_player.execute_move(chosen_move)
+                if active_player.location != original_location:
+                    if isinstance(chosen_move, Movement):
+                        self.executed_moves += 1
+                        tile = self.board.get_tile(active_player.location)
+                        active_player.assign_most_recently_encountered_tile(tile=tile)
+                        tile.announce_tile(active_player)
+                        if tile.type == TileType.HOSPITAL:
+                            if active_player.narrate and not active_player.is_injured():
+                                print(f"{active_player.name} is not injured, so there is no need to heal.")
+                        elif tile.type == TileType.SHOP:
+                            if active_player.narrate and active_player.has_item():
+                                print(f"{active_player.name} is already holding an item, so he/she cannot acquire "
+                                      f"another until the held item is dropped.")
+                        active_player.execute_mandatory_actions()
+                        active_player.show_colliding_players(other_players=other_players)
+                tile = self.board.get_tile(active_player.location)
+                available_tile_actions = tile.get_optional_actions(active_player)
+            self.next_player()
+        except GameOver:
+            self.game_over = True
+            self.winner_index = self.active_player_index
+            raise
@@ -0,0 +1,45 @@
+from typing import Dict, List
+
+PLAYER_ID = 'player_id'
+LOCATION = 'location'
+ITEM = 'item'
+STATUS = 'status'
+TILE_MOST_RECENTLY_ENCOUNTERED = 'tile_most_recently_encountered'
+
+
+class GameSnapshot:
+    # Everything that changes while a game is played, as plain data: player_states holds one dict per seat (see
+    # Player.get_state) and treasure_counts maps each cell holding treasure to its number of piles. num_turns and
+    # num_decisions say how far into the game's DecisionStream the snapshot was taken. Walls, tiles and exits never
+    # change, so they are not part of it.
+    def __init__(self, active_player_index: int, game_over: bool, winner_index: int, player_states: List[Dict],
+                 treasure_counts: Dict[int, int], num_turns: int = 0, num_decisions: int = 0):
+        self.active_player_index = active_player_index
+        self.game_over = game_over
+        self.winner_index = winner_index
+        self.player_states = player_states
+        self.treasure_counts = treasure_counts
+        self.num_turns = num_turns
+        self.num_decisions = num_decisions
+
+
+def serialize_snapshot(snapshot: GameSnapshot):
+    return {
+        'active_player_index': snapshot.active_player_index,
+        'game_over': snapshot.game_over,
+        'winner_index': snapshot.winner_index,
+        'player_states': [dict(player_state, **{LOCATION: list(player_state[LOCATION])})
+                          for player_state in snapshot.player_states],
+        'treasure_counts': sorted([cell, num_treasure] for cell, num_treasure in snapshot.treasure_counts.items()),
+        'num_turns': snapshot.num_turns,
+        'num_decisions': snapshot.num_decisions
+    }
+
+
+def deserialize_snapshot(snapshot_data):
+    return GameSnapshot(active_player_index=snapshot_data['active_player_index'],
+                        game_over=snapshot_data['game_over'], winner_index=snapshot_data['winner_index'],
+                        player_states=[dict(player_state, **{LOCATION: tuple(player_state[LOCATION])})
+                                       for player_state in snapshot_data['player_states']],
+                        treasure_counts={cell: num_treasure for cell, num_treasure in snapshot_data['treasure_counts']},
+                        num_turns=snapshot_data['num_turns'], num_decisions=snapshot_data['num_decisions'])
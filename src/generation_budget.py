@@ -0,0 +1,47 @@
+import time
+
+from src.exceptions import GenerationBudgetExceeded, GenerationAttemptsExceeded
+
+UNPHASED = 'unphased'
+
+
+class GenerationBudget:
+    def __init__(self, time_limit_secs: float = 15, max_attempts_per_phase: int = 1000000):
+        self.time_limit_secs = time_limit_secs
+        self.max_attempts_per_phase = max_attempts_per_phase
+        self.phase_attempts = {}
+        self.phase_times_secs = {}
+        self.current_phase = None
+        self._start_time = time.perf_counter()
+        self._phase_start_time = None
+
+    def begin_phase(self, phase: str):
+        self.end_phase()
+        self.current_phase = phase
+        self.phase_attempts[phase] = 0
+        self._phase_start_time = time.perf_counter()
+
+    def end_phase(self):
+        if self.current_phase is not None:
+            self.phase_times_secs[self.current_phase] = time.perf_counter() - self._phase_start_time
+            self.current_phase = None
+
+    def check(self):
+        # Attempts made outside begin_phase, such as a helper used on its own, are counted under UNPHASED.
+        phase = self.current_phase if self.current_phase is not None else UNPHASED
+        self.phase_attempts[phase] = self.phase_attempts.get(phase, 0) + 1
+        if self.phase_attempts[phase] > self.max_attempts_per_phase:
+            self.end_phase()
+            raise GenerationAttemptsExceeded(f"Gave up generating the board after {self.max_attempts_per_phase} "
+                                             f"attempts. {self.report()}")
+        if time.perf_counter() - self._start_time > self.time_limit_secs:
+            self.end_phase()
+            raise GenerationBudgetExceeded(f"Gave up generating the board after {self.time_limit_secs} seconds. "
+                                           f"{self.report()}")
+
+    def report(self):
+        phase_reports = []
+        for phase, num_attempts in self.phase_attempts.items():
+            phase_time_secs = self.phase_times_secs.get(phase, 0)
+            phase_reports.append(f"{phase}: {num_attempts} attempts in {phase_time_secs:.3f}s")
+        return f"({', '.join(phase_reports)})"
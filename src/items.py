@@ -67,3 +67,10 @@ class PileOfJunk(Item):
         if not player.acquired_item_this_turn:
             actions.append(self.drop_item_action)
         return actions
+
+
+ITEMS_BY_TYPE = {
+    ItemType.RUSTY_BULLET: RustyBullet,
+    ItemType.FIRST_AID_KIT: FirstAidKit,
+    ItemType.PILE_OF_JUNK: PileOfJunk
+}
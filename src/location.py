@@ -1,6 +1,6 @@
-import random
+from collections.abc import Sequence
 
-from src.datatypes import Direction
+from src.datatypes import Direction, MoveOutcome
 from src.exceptions import MoveBlockedByWall, ExitFound
 
 
@@ -28,85 +28,44 @@ class Location:
         self.x = location.x
         self.y = location.y
 
-    def no_walls_block_straight_line_location(self, location, walls, board_height, board_width):
-        assert self != location, f"Cannot ask for blockers between the same locations."
-        assert self.x == location.x or self.y == location.y, \
-            f"There is no straight path between this location {str(self)} and {str(location)}"
-        if not self.in_bounds(board_height=board_height, board_width=board_width) or \
-            not location.in_bounds(board_height=board_height, board_width=board_width):
-            return False
-        wall_adj_locations = [wall.adjacent_locations for wall in walls]
-        if self.x == location.x:
-            higher_loc_y = max(self.y, location.y)
-            lower_loc_y = min(self.y, location.y)
-            for i in range(1, higher_loc_y - lower_loc_y + 1):
-                loc_1 = Location(self.x, lower_loc_y)
-                loc_2 = Location(location.x, lower_loc_y + i)
-                adj_locations = (loc_1, loc_2)
-                rev_adj_locations = (loc_2, loc_1)
-                if adj_locations in wall_adj_locations or rev_adj_locations in wall_adj_locations:
-                    return False
-        if self.y == location.y:
-            higher_loc_x = max(self.x, location.x)
-            lower_loc_x = min(self.x, location.x)
-            for i in range(1, higher_loc_x - lower_loc_x + 1):
-                loc_1 = Location(lower_loc_x, self.y)
-                loc_2 = Location(lower_loc_x + i, location.y)
-                adj_locations = (loc_1, loc_2)
-                rev_adj_locations = (loc_2, loc_1)
-                if adj_locations in wall_adj_locations or rev_adj_locations in wall_adj_locations:
-                    return False
-        return True
-
     def move(self, direction: Direction, board):
-        walls = board.inner_walls
-        next_location = self.next_location(direction=direction)
-        no_walls_blocking = self.no_walls_block_straight_line_location(location=next_location,
-                                                                       walls=board.inner_walls,
-                                                                       board_height=board.height,
-                                                                       board_width=board.width)
-        in_bounds = self.next_location(direction=direction).in_bounds(board_height=board.height,
-                                                                      board_width=board.width)
-
-        if not in_bounds:
-            for ex in board.exits:
-                if self == ex.location and direction == ex.direction:
-                    raise ExitFound(f'Exit found.')
-
-        if no_walls_blocking and in_bounds:
-                self.teleport(self.next_location(direction))
-        else:
+        cell = self.x * board.height + self.y
+        outcome = board.transition_kernel.outcome(cell, direction)
+        if outcome == MoveOutcome.EXIT:
+            raise ExitFound(f'Exit found.')
+        if outcome == MoveOutcome.BLOCKED:
             raise MoveBlockedByWall(f'Cannot move {direction.name}. Blocked by wall.')
+        self.teleport(board.all_locations[board.next_cells[direction][cell]])
 
     def in_bounds(self, board_height: int, board_width: int):
         return 0 <= self.x < board_width and 0 <= self.y < board_height
 
-    def next_location(self, direction: Direction):
-        if direction == Direction.UP:
-            x_delta = 0
-            y_delta = 1
-        elif direction == Direction.DOWN:
-            x_delta = 0
-            y_delta = -1
-        elif direction == Direction.RIGHT:
-            x_delta = 1
-            y_delta = 0
-        elif direction == Direction.LEFT:
-            x_delta = -1
-            y_delta = 0
-        else:
-            raise ValueError(f"Invalid direction: {direction}")
-        return Location(self.x + x_delta, self.y + y_delta)
-
-    def neighbors(self, board_height: int, board_width: int):
-        candidate_neighbors = [Location(self.x + 1, self.y),
-                               Location(self.x - 1, self.y),
-                               Location(self.x, self.y + 1),
-                               Location(self.x, self.y - 1)]
-        random.shuffle(candidate_neighbors)
-
-        valid_neighbors = []
-        for candidate_neighbor in candidate_neighbors:
-            if candidate_neighbor.in_bounds(board_height=board_height, board_width=board_width):
-                valid_neighbors.append(candidate_neighbor)
-        return valid_neighbors
+
+class LocationTable(Sequence):
+    # A lazily filled Board.all_locations: the Location of a cell is created the first time it is looked up and the
+    # same object is returned from then on, so a large board loaded from a save does not create one per tile up front.
+    def __init__(self, height: int, width: int):
+        self.height = height
+        self._locations = [None] * (width * height)
+
+    def __len__(self):
+        return len(self._locations)
+
+    def __getitem__(self, cell: int):
+        location = self._locations[cell]
+        if location is None:
+            location = self._locations[cell] = Location(*divmod(int(cell) % len(self._locations), self.height))
+        return location
+
+
+class CellLocations(Sequence):
+    # The locations of an array of cells, looked up in a board's location table as they are read.
+    def __init__(self, cells, all_locations):
+        self.cells = cells
+        self.all_locations = all_locations
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, index: int):
+        return self.all_locations[self.cells[index]]
@@ -0,0 +1,92 @@
+import os
+import random
+import time
+import numpy as np
+
+from multiprocessing import Pool
+from typing import List
+
+from src.board import Board
+from src.board_serialization import serialize_board, deserialize_board
+from src.game import Game
+from src.utils import derive_seed
+
+MOVE_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Set once per worker process by _init_worker, so the board is shipped to each worker only once.
+_worker_board_data = None
+_worker_player_names = None
+
+
+class MonteCarloStats:
+    # Arrays are indexed by game number, so the results do not depend on which worker finished first. Seats are the
+    # turn order each game drew, so seat 0 moved first.
+    def __init__(self, executed_moves: np.ndarray, winner_seats: np.ndarray, num_seats: int,
+                 time_taken_in_secs: float):
+        self.executed_moves = executed_moves
+        self.winner_seats = winner_seats
+        self.num_seats = num_seats
+        self.time_taken_in_secs = time_taken_in_secs
+
+    @property
+    def num_games(self):
+        return len(self.executed_moves)
+
+    def games_per_sec(self):
+        return self.num_games / self.time_taken_in_secs
+
+    def move_percentiles(self):
+        return dict(zip(MOVE_PERCENTILES, np.percentile(self.executed_moves, MOVE_PERCENTILES)))
+
+    def seat_win_rates(self):
+        return np.bincount(self.winner_seats, minlength=self.num_seats) / self.num_games
+
+    def report(self):
+        percentiles = ', '.join(f"p{percentile}: {moves:.0f}" for percentile, moves in self.move_percentiles().items())
+        win_rates = ', '.join(f"seat {seat}: {win_rate:.1%}" for seat, win_rate in enumerate(self.seat_win_rates()))
+        return f"Played {self.num_games} games in {self.time_taken_in_secs:.2f} seconds " \
+            f"({self.games_per_sec():.1f} games/sec).\n" \
+            f"Moves per game: mean {self.executed_moves.mean():.1f}, median {np.median(self.executed_moves):.0f} " \
+            f"({percentiles}).\n" \
+            f"Win rates by seat: {win_rates}."
+
+
+def _init_worker(board_data, player_names):
+    global _worker_board_data, _worker_player_names
+    _worker_board_data = board_data
+    _worker_player_names = player_names
+
+
+def play_game(board_data, player_names: List[str], game_seed: int):
+    # Every game gets a freshly built board so treasure moved around by earlier games does not carry over.
+    board = deserialize_board(board_data, auto_rng=True)
+    players = board.generate_safe_players(player_names=player_names)
+    game = Game(board=board, players=players, auto_rng=True, random_seed=game_seed,
+                rng=random.Random(game_seed))
+    _, executed_moves = game.run(auto_play=True, headless=True)
+    return game.winner_index, executed_moves
+
+
+def _play_worker_game(game_index_and_seed):
+    game_index, game_seed = game_index_and_seed
+    winner_seat, executed_moves = play_game(_worker_board_data, _worker_player_names, game_seed)
+    return game_index, winner_seat, executed_moves
+
+
+def run_monte_carlo(board: Board, player_names: List[str], num_games: int, random_seed: int,
+                    num_workers: int = os.cpu_count()):
+    # Game i always plays with the seed derived from (random_seed, i), whatever the number of workers.
+    game_seeds = [(i, derive_seed(random_seed, 'monte_carlo', i)) for i in range(num_games)]
+    board_data = serialize_board(board)
+    executed_moves = np.zeros(num_games, dtype=np.int64)
+    winner_seats = np.zeros(num_games, dtype=np.int64)
+
+    start = time.time()
+    with Pool(processes=num_workers, initializer=_init_worker, initargs=(board_data, player_names)) as pool:
+        results = pool.imap_unordered(_play_worker_game, game_seeds,
+                                      chunksize=max(1, num_games // (num_workers * 8)))
+        for game_index, winner_seat, num_executed_moves in results:
+            executed_moves[game_index] = num_executed_moves
+            winner_seats[game_index] = winner_seat
+    return MonteCarloStats(executed_moves=executed_moves, winner_seats=winner_seats, num_seats=len(player_names),
+                           time_taken_in_secs=time.time() - start)
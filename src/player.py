@@ -1,7 +1,9 @@
-import numpy as np
+import random
 import uuid
 import time
 
+from src.constants import MAX_XP
+from src.decisions import DecisionStream
 from src.datatypes import StatusType, ItemType, Direction, MoveType, TileType, XPExchangeType
 from src.move import Move
 from src.movement import Movement
@@ -12,7 +14,16 @@ from src.exceptions import MoveBlockedByWall, ExitFound, GameOver
 from src.actions import Fight, EndTurn, AcquireTreasure, DropTreasure, RevealClosestHospital, RevealClosestShop, \
     RevealObstacle, HealInstantlyWithXP, Heal
 
+from src.events import EventDispatcher, ConsoleSink, MovedEvent, BlockedEvent, FlushedEvent, TeleportedEvent, \
+    FoughtEvent, InjuredEvent, TreasureAcquiredEvent, XPSpentEvent, EncounteredEvent, ItemAcquiredEvent, \
+    ItemLostEvent, TreasureDroppedEvent, HealedEvent, TurnLostEvent, XPGainedEvent
 from src.exceptions import ItemAlreadyHeldError, NoItemHeldError, TreasureAlreadyHeldError, NoTreasureHeldError
+from src.game_snapshot import PLAYER_ID, LOCATION, ITEM, STATUS, TILE_MOST_RECENTLY_ENCOUNTERED
+from src.items import ITEMS_BY_TYPE
+
+# Player attributes that change during a game and are already plain data.
+PLAYER_STATE_FIELDS = ('has_treasure', 'can_move', 'heal_next_turn', 'active', 'lose_next_turn',
+                       'acquired_item_this_turn', 'xp', 'can_request_hospital_location', 'can_request_shop_location')
 
 
 class Player:
@@ -20,7 +31,8 @@ class Player:
                  can_move=True, heal_next_turn=False, active=False, lose_next_turn=False, player_id=None,
                  status=StatusType.HEALTHY, acquired_item_this_turn=False, xp: int = 0,
                  tile_most_recently_encountered=None, can_request_hospital_location=True,
-                 can_request_shop_location=True, auto_rng: bool = False):
+                 can_request_shop_location=True, auto_rng: bool = False, rng: random.Random = None,
+                 narrate: bool = True, events: EventDispatcher = None, decisions: DecisionStream = None):
         self.name = name
         self.location = location
         self.board = board
@@ -36,10 +48,24 @@ class Player:
             self.player_id = player_id
         self.status = status
         self.auto_rng = auto_rng
+        if rng is None:
+            rng = random.Random()
+        self.rng = rng
+        self.narrate = narrate
+        if events is None:
+            events = EventDispatcher(sinks=[ConsoleSink()] if narrate else None)
+        self.events = events
+        if decisions is None:
+            decisions = DecisionStream()
+        self.decisions = decisions
         self.acquired_item_this_turn = acquired_item_this_turn
         self.xp = xp
         self.tile_most_recently_encountered = tile_most_recently_encountered
         self.xp_exchange_options = [RevealClosestHospital(), RevealClosestShop(), RevealObstacle(), HealInstantlyWithXP()]
+        self.end_turn_action = EndTurn()
+        self.drop_treasure_action = DropTreasure()
+        self._possible_actions = None
+        self._possible_actions_inputs = None
         self.can_request_hospital_location = can_request_hospital_location
         self.can_request_shop_location = can_request_shop_location
 
@@ -48,32 +74,56 @@ class Player:
 
     @staticmethod
     def copy_from(player, auto_rng: bool = False):
-        return Player(name=player.name, location=player.location, board=player.board, item=player.item,
+        return Player(name=player.name, location=player.location.copy(), board=player.board, item=player.item,
                       has_treasure=player.has_treasure, can_move=player.can_move, heal_next_turn=player.heal_next_turn,
                       active=player.active, lose_next_turn=player.lose_next_turn, player_id=player.player_id,
                       status=player.status, acquired_item_this_turn=player.acquired_item_this_turn, xp=player.xp,
                       tile_most_recently_encountered=player.tile_most_recently_encountered,
                       can_request_hospital_location=player.can_request_hospital_location,
-                      can_request_shop_location=player.can_request_shop_location, auto_rng=auto_rng)
+                      can_request_shop_location=player.can_request_shop_location, auto_rng=auto_rng,
+                      rng=player.rng, narrate=player.narrate)
+
+    def get_state(self):
+        state = {field: getattr(self, field) for field in PLAYER_STATE_FIELDS}
+        state[PLAYER_ID] = str(self.player_id)
+        state[LOCATION] = self.location.get_coordinates()
+        state[ITEM] = self.item.type.value if self.has_item() else None
+        state[STATUS] = self.status.value
+        tile = self.tile_most_recently_encountered
+        state[TILE_MOST_RECENTLY_ENCOUNTERED] = self.board.get_cell(tile.location) if tile is not None else None
+        return state
+
+    def set_state(self, state):
+        for field in PLAYER_STATE_FIELDS:
+            setattr(self, field, state[field])
+        self.location = Location(*state[LOCATION])
+        self.item = ITEMS_BY_TYPE[ItemType(state[ITEM])]() if state[ITEM] is not None else None
+        self.status = StatusType(state[STATUS])
+        tile_cell = state[TILE_MOST_RECENTLY_ENCOUNTERED]
+        self.tile_most_recently_encountered = \
+            self.board.get_tile(self.board.get_location(tile_cell)) if tile_cell is not None else None
+        self.invalidate_possible_actions()
 
     def begin_turn(self):
         if self.heal_next_turn:
             self.heal()
             self.heal_next_turn = False
         if self.lose_next_turn:
-            print(f"Sorry {self.name}, you have lost your turn.")
+            if self.events.enabled:
+                self.events.emit(TurnLostEvent(self.name, skipped=True))
             self.can_move = False
             self.lose_next_turn = False
             self.end_turn()
         else:
             self.active = True
 
-    def is_turn_over(self, other_players, board, available_tile_actions):
+    def is_turn_over(self, other_players, board, available_tile_actions, auto_play=False):
         if not self.active:
             return True
         possible_actions = self.get_possible_actions(other_players=other_players,
                                                      board=board,
-                                                     available_tile_actions=available_tile_actions)
+                                                     available_tile_actions=available_tile_actions,
+                                                     auto_play=auto_play)
         no_more_actions = len(possible_actions) == 0
         only_end_turn_remaining = len(possible_actions) == 1 and possible_actions[0].move_type == MoveType.END_TURN
         if not self.can_move and (no_more_actions or only_end_turn_remaining):
@@ -83,24 +133,30 @@ class Player:
 
     def end_turn(self):
         if self.can_move:
-            print(f"{self.name} must move at least once this turn.")
+            if self.narrate:
+                print(f"{self.name} must move at least once this turn.")
         else:
             self.acquired_item_this_turn = False
             self.active = False
             self.can_move = True
+            self.invalidate_possible_actions()
 
     def move(self, direction: Direction):
         try:
             self.location.move(direction, self.board)
+            self.invalidate_possible_actions()
             self.can_move = False
-            print(f'{self.name} moves {direction.name}.')
+            if self.events.enabled:
+                self.events.emit(MovedEvent(self.name, direction, self.location.x, self.location.y))
         except ExitFound as e:
             if self.has_treasure:
                 raise GameOver(f"{self.name} has exited the maze with the treasure and won the game.")
             else:
-                print(f"{self.name} has found an exit, but has no treasure.")
+                if self.events.enabled:
+                    self.events.emit(BlockedEvent(self.name, direction, reached_exit=True))
         except MoveBlockedByWall as e:
-            print(f'{self.name} cannot move {direction.name}. Blocked by wall.')
+            if self.events.enabled:
+                self.events.emit(BlockedEvent(self.name, direction))
             self.can_move = True
 
     def execute_mandatory_actions(self):
@@ -120,7 +176,7 @@ class Player:
                 colliding_players.append(player)
         return colliding_players
 
-    def _get_possible_fights(self, other_players):
+    def _get_possible_fights(self, other_players, auto_play=False):
         possible_fights = []
         if self.status == StatusType.HEALTHY:
             colliding_players = self.get_colliding_players(other_players=other_players)
@@ -128,7 +184,7 @@ class Player:
                 for i in range(len(colliding_players)):
                     other_player = colliding_players[i]
                     if not other_player.is_injured():
-                        possible_fights.append(Fight(other_player=colliding_players[i]))
+                        possible_fights.append(Fight(other_player=colliding_players[i], auto_play=auto_play))
         return possible_fights
 
     def _get_possible_xp_exchange_options(self):
@@ -147,11 +203,21 @@ class Player:
                 possible_xp_exchange_options.append(xp_exchange_option)
         return possible_xp_exchange_options
 
-    def get_possible_actions(self, other_players, board, available_tile_actions):
-        possible_actions = [EndTurn()]
+    def invalidate_possible_actions(self):
+        self._possible_actions = None
+
+    def get_possible_actions(self, other_players, board, available_tile_actions, auto_play=False):
+        # is_turn_over and request_move ask for the same actions before every decision, so they are only worked out
+        # again for new arguments or after a change to the player (see invalidate_possible_actions). The returned list
+        # is shared and must not be modified.
+        inputs = self._possible_actions_inputs
+        if self._possible_actions is not None and inputs[0] is other_players and inputs[1] is board and \
+                inputs[2] is available_tile_actions and inputs[3] == auto_play:
+            return self._possible_actions
+        possible_actions = [self.end_turn_action]
         if self.item is not None:
             possible_actions.extend(self.item.get_actions(self, other_players, board))
-        possible_actions.extend(self._get_possible_fights(other_players=other_players))
+        possible_actions.extend(self._get_possible_fights(other_players=other_players, auto_play=auto_play))
 
         valid_tile_actions = []
         for tile_action in available_tile_actions:
@@ -163,24 +229,28 @@ class Player:
         possible_actions.extend(self._get_possible_xp_exchange_options())
 
         if self.has_treasure:
-            possible_actions.extend([DropTreasure()])
+            possible_actions.append(self.drop_treasure_action)
 
         valid_possible_actions = []
         for i in range(len(possible_actions)):
             if not ((self.has_treasure or self.is_injured()) and isinstance(possible_actions[i], AcquireTreasure)):
                 valid_possible_actions.append(possible_actions[i])
+        self._possible_actions = valid_possible_actions
+        self._possible_actions_inputs = (other_players, board, available_tile_actions, auto_play)
         return valid_possible_actions
 
     def request_move(self, other_players, board, available_tile_actions, auto_play=False, auto_turn_time_secs=1) -> Move:
-        print(f"\n{'='*100}\n")
-        print(f"\n{self.name}'s Turn.")
+        if self.narrate:
+            print(f"\n{'='*100}\n")
+            print(f"\n{self.name}'s Turn.")
         possible_movements = []
         if self.can_move:
             possible_movements = [Movement(Direction.UP), Movement(Direction.DOWN),
                                   Movement(Direction.LEFT), Movement(Direction.RIGHT)]
         possible_actions = self.get_possible_actions(other_players=other_players,
                                                      board=board,
-                                                     available_tile_actions=available_tile_actions)
+                                                     available_tile_actions=available_tile_actions,
+                                                     auto_play=auto_play)
         possible_moves = possible_movements + possible_actions
 
         def get_invalid_move_msg(name, move_choice, possible_choices):
@@ -191,22 +261,27 @@ class Player:
         range_of_possible_moves = range(len(possible_moves))
         move_index = None
 
-        if not auto_play:
+        if self.decisions.is_replaying():
+            move_index = self.decisions.next_decision()
+        elif not auto_play:
             while not valid_move:
                 move_index = ask_for_options(possible_moves)
                 try:
                     if int(move_index) in range_of_possible_moves:
                         valid_move = True
                     else:
-                        print(get_invalid_move_msg(self.name, move_index, tuple(range_of_possible_moves)))
+                        if self.narrate:
+                            print(get_invalid_move_msg(self.name, move_index, tuple(range_of_possible_moves)))
                 except ValueError:
-                    print(get_invalid_move_msg(self.name, move_index, tuple(range_of_possible_moves)))
+                    if self.narrate:
+                        print(get_invalid_move_msg(self.name, move_index, tuple(range_of_possible_moves)))
         else:
-            display_options(possible_moves)
+            if self.narrate:
+                display_options(possible_moves)
 
             invalid_move = True
             while invalid_move:
-                move_index = np.random.choice(range(len(possible_moves)))
+                move_index = self.rng.randrange(len(possible_moves))
                 chosen_move = possible_moves[move_index]
                 invalid_move = False
                 if isinstance(chosen_move, AcquireTreasure):
@@ -227,11 +302,14 @@ class Player:
                     invalid_move = True
                     continue
 
-            time.sleep(auto_turn_time_secs)
-            print(f"Move chosen: {move_index}")
+            if auto_turn_time_secs > 0:
+                time.sleep(auto_turn_time_secs)
+            if self.narrate:
+                print(f"Move chosen: {move_index}")
 
-        print(f"\n{'='*100}\n")
-        return possible_moves[int(move_index)]
+        if self.narrate:
+            print(f"\n{'='*100}\n")
+        return possible_moves[self.decisions.record(int(move_index))]
 
     def has_item(self):
         return self.item is not None
@@ -239,34 +317,40 @@ class Player:
     def acquire_treasure(self):
         x, y = self.location.get_coordinates()
         tile = self.board.grid[x][y]
-        print(f"tile.num_treasure: {tile.num_treasure}")
         assert tile.has_treasure()
         assert not self.is_injured()
         assert not self.has_treasure
         if not self.has_treasure:
-            print(f"{self.name} has acquired a pile of treasure.")
+            if self.events.enabled:
+                self.events.emit(TreasureAcquiredEvent(self.name))
             self.has_treasure = True
-            tile.remove_treasure()
+            self.board.remove_treasure(self.location)
+            self.invalidate_possible_actions()
         else:
             raise TreasureAlreadyHeldError
 
-    def acquire_item(self, item: ItemType):
+    def acquire_item(self, item: ItemType, bought: bool = False):
         if not self.has_item():
-            print(f"{self.name} has acquired a {str(item)}.")
+            if self.events.enabled:
+                self.events.emit(ItemAcquiredEvent(self.name, str(item), bought=bought))
             self.item = item
             self.acquired_item_this_turn = True
+            self.invalidate_possible_actions()
         else:
             raise ItemAlreadyHeldError
 
     def lose_item(self):
         self.item = None
+        self.invalidate_possible_actions()
 
     def drop_item(self):
         if self.item is not None:
-            print(f"{self.name} has dropped his/her {self.item}.")
+            if self.events.enabled:
+                self.events.emit(ItemLostEvent(self.name, str(self.item), dropped=True))
             self.lose_item()
         else:
-            print(f"{self.name} has no {item} to drop.")
+            if self.narrate:
+                print(f"{self.name} has no {item} to drop.")
             raise NoItemHeldError
 
     def drop_treasure(self):
@@ -274,30 +358,42 @@ class Player:
         tile = self.board.grid[x][y]
         if self.has_treasure:
             self.has_treasure = False
-            tile.add_treasure()
-            print(f"{self.name} has dropped his/her pile of treasure.")
+            self.board.add_treasure(self.location)
+            self.invalidate_possible_actions()
+            if self.events.enabled:
+                self.events.emit(TreasureDroppedEvent(self.name))
         else:
-            print(f"{self.name} has no treasure to drop.")
+            if self.narrate:
+                print(f"{self.name} has no treasure to drop.")
             raise NoTreasureHeldError
 
     def teleport_to(self, location: Location):
         self.location.teleport(location)
+        self.invalidate_possible_actions()
+        if self.events.enabled:
+            self.events.emit(TeleportedEvent(self.name, location.x, location.y))
 
     def flush_one_tile(self, direction: Direction):
         try:
             self.location.move(direction, self.board)
-            print(f"{self.name} is flushed by the river one tile.")
+            self.invalidate_possible_actions()
+            if self.events.enabled:
+                self.events.emit(FlushedEvent(self.name, direction, moved=True))
         except ExitFound as e:
             if self.has_treasure:
                 raise GameOver(f"{self.name} has been flushed out of the maze with the treasure and won the game.")
             else:
-                print(f"{self.name} has been flushed into an exit, but has no treasure, so does not move farther.")
+                if self.events.enabled:
+                    self.events.emit(FlushedEvent(self.name, direction, moved=False, reached_exit=True))
         except MoveBlockedByWall as e:
-            print(f"The river tries to flush {self.name}, but a wall prevents him/her from moving.")
+            if self.events.enabled:
+                self.events.emit(FlushedEvent(self.name, direction, moved=False))
 
     def get_injured(self):
-        print(f"{self.name} has been injured.")
+        if self.events.enabled:
+            self.events.emit(InjuredEvent(self.name))
         self.status = StatusType.INJURED
+        self.invalidate_possible_actions()
         if self.has_treasure:
             self.drop_treasure()
 
@@ -306,76 +402,101 @@ class Player:
 
     def lose_turn(self):
         self.lose_next_turn = True
-        print(f"{self.name} loses his/her turn.")
+        if self.events.enabled:
+            self.events.emit(TurnLostEvent(self.name))
 
     def heal(self):
         self.status = StatusType.HEALTHY
-        print(f"{self.name} is healed and is now {self.status.name}.")
+        self.invalidate_possible_actions()
+        if self.events.enabled:
+            self.events.emit(HealedEvent(self.name))
 
     def do_nothing(self):
-        print(f'{self.name} does nothing')
+        if self.narrate:
+            print(f'{self.name} does nothing')
 
     def show_colliding_players(self, other_players):
         colliding_players = self.get_colliding_players(other_players=other_players)
-        for player in colliding_players:
-            status = player.status
-            article = 'an' if status.name[0].lower() in 'aeiou' else 'a'
-            print(f"{self.name} has stumbled across {article} {status.name} {player.name}.")
+        if self.events.enabled:
+            for player in colliding_players:
+                self.events.emit(EncounteredEvent(self.name, player.name, player.status))
 
     def fight(self, other_player, auto_play=False):
-        print(f"{self.name} surprises {other_player.name}, so {self.name} has attacker's advantage.")
+        # Whoever loses is injured, which also changes who this player can fight.
+        self.invalidate_possible_actions()
+        if self.narrate:
+            print(f"{self.name} surprises {other_player.name}, so {self.name} has attacker's advantage.")
         if self.has_item() and self.item.type == ItemType.RUSTY_BULLET:
-            if not auto_play:
+            if self.decisions.is_replaying():
+                use_bullet = bool(self.decisions.next_decision())
+            elif not auto_play:
                 prompt = f"Would you like to use your {str(self.item)} to automatically win the fight " \
                     f"(Choose 'n' to take a chance with hand to hand combat)? (y/n): "
                 choose_to_act = get_yes_or_no_response(prompt)
                 use_bullet = response_is_yes(choose_to_act)
             else:
-                use_bullet = np.random.choice([True, False])
+                use_bullet = self.rng.choice([True, False])
+            self.decisions.record(int(use_bullet))
             if use_bullet:
-                print(f"{self.name} shoots and injures {other_player.name}.")
+                if self.events.enabled:
+                    self.events.emit(FoughtEvent(self.name, other_player.name, won=True, used_bullet=True))
                 if other_player.has_item() and other_player.item.type == ItemType.RUSTY_BULLET:
-                    print(f"{other_player.name} has a {str(other_player.item)}, but is taken by surprise, "
-                          f"so cannot use it.")
+                    if self.narrate:
+                        print(f"{other_player.name} has a {str(other_player.item)}, but is taken by surprise, "
+                              f"so cannot use it.")
                 other_player.get_injured()
                 return None
-        if self.auto_rng:
-            dice = range(6)
-            attacker_roll = np.random.choice(dice) + 1
-            defender_roll = np.random.choice(dice) + 1
+        if self.decisions.is_replaying():
+            attacker_roll = self.decisions.next_decision()
+            defender_roll = self.decisions.next_decision()
+        elif self.auto_rng:
+            attacker_roll = self.rng.randint(1, 6)
+            defender_roll = self.rng.randint(1, 6)
         else:
             attacker_roll = prompt_real_dice_roll_result(self)
             defender_roll = prompt_real_dice_roll_result(other_player)
+        self.decisions.record(attacker_roll)
+        self.decisions.record(defender_roll)
 
-        print(
-            f"{self.name} attacks {other_player.name}. {self.name} attacks with a power level of ({attacker_roll}/6). "
-            f"{other_player.name} defends with a power level of ({defender_roll}/6).")
+        if self.narrate:
+            print(
+                f"{self.name} attacks {other_player.name}. {self.name} attacks with a power level of ({attacker_roll}/6). "
+                f"{other_player.name} defends with a power level of ({defender_roll}/6).")
         if attacker_roll >= defender_roll:
-            print(f"{self.name} overpowers {other_player.name} and wins the fight.")
+            if self.events.enabled:
+                self.events.emit(FoughtEvent(self.name, other_player.name, won=True))
             if other_player.has_item() and other_player.item.type == ItemType.RUSTY_BULLET:
-                print(f"{other_player.name} has a {str(other_player.item)}, but is taken by surprise, "
-                      f"so cannot use it.")
+                if self.narrate:
+                    print(f"{other_player.name} has a {str(other_player.item)}, but is taken by surprise, "
+                          f"so cannot use it.")
             other_player.get_injured()
         else:
-            print(f"{other_player.name} fights back and overcomes {self.name}.")
+            if self.events.enabled:
+                self.events.emit(FoughtEvent(self.name, other_player.name, won=False))
             self.get_injured()
 
     def add_xp(self, amount):
+        self.invalidate_possible_actions()
         if not self.has_treasure:
-            if self.xp + amount > 7:
-                max_amount = 7 - self.xp
+            if self.xp + amount > MAX_XP:
+                max_amount = MAX_XP - self.xp
                 self.xp += max_amount
-                print(f"{self.name} has gained {max_amount} XP to reach the maximum of {self.xp}.")
+                if self.events.enabled:
+                    self.events.emit(XPGainedEvent(self.name, max_amount, self.xp, reached_max=True))
             else:
                 self.xp += amount
-                print(f"{self.name} has gained {amount} XP for a total of {self.xp}.")
+                if self.events.enabled:
+                    self.events.emit(XPGainedEvent(self.name, amount, self.xp))
         else:
-            print(f"{self.name} cannot gain XP while holding treasure.")
+            if self.events.enabled:
+                self.events.emit(XPGainedEvent(self.name, 0, self.xp, holding_treasure=True))
 
     def spend_xp(self, amount):
         assert amount <= self.xp
         self.xp -= amount
-        print(f"{self.name} has spent {amount} XP and now has {self.xp} XP.")
+        self.invalidate_possible_actions()
+        if self.events.enabled:
+            self.events.emit(XPSpentEvent(self.name, amount, self.xp))
 
     def _reveal_closest_building(self, tile_type: TileType):
         assert tile_type == TileType.HOSPITAL or tile_type == TileType.SHOP
@@ -420,30 +541,38 @@ class Player:
 
             full_distance_phrase = f'{horizontal_distance_phrase}{conjunction}{vertical_distance_phrase}'
 
-        print(f"The closest {tile_type.name} to {self.name} is "
-              f"{full_distance_phrase} spaces "
-              f"from {self.name}'s current location.\n")
+        if self.narrate:
+            print(f"The closest {tile_type.name} to {self.name} is "
+                  f"{full_distance_phrase} spaces "
+                  f"from {self.name}'s current location.\n")
 
     def reveal_closest_hospital(self):
         self._reveal_closest_building(tile_type=TileType.HOSPITAL)
         self.can_request_hospital_location = False
+        self.invalidate_possible_actions()
 
     def reveal_closest_shop(self):
         self._reveal_closest_building(tile_type=TileType.SHOP)
         self.can_request_shop_location = False
+        self.invalidate_possible_actions()
 
     def reveal_obstacle(self):
         most_recent_tile = self.tile_most_recently_encountered
-        print(f"The tile {self.name} most recently encountered was a {most_recent_tile.type.name} tile.")
+        if self.narrate:
+            print(f"The tile {self.name} most recently encountered was a {most_recent_tile.type.name} tile.")
         if most_recent_tile.type == TileType.PORTAL:
-            print(f"That portal was a {most_recent_tile.portal_type.name} portal.")
+            if self.narrate:
+                print(f"That portal was a {most_recent_tile.portal_type.name} portal.")
         elif most_recent_tile.type == TileType.RIVER:
-            print(f"That river tile was pointing {most_recent_tile.direction.name}.")
+            if self.narrate:
+                print(f"That river tile was pointing {most_recent_tile.direction.name}.")
 
     def assign_most_recently_encountered_tile(self, tile):
         self.tile_most_recently_encountered = tile
 
     def heal_in_hospital(self):
-        print(f"{self.name} will heal spend his/her next turn healing.")
+        if self.events.enabled:
+            self.events.emit(HealedEvent(self.name, scheduled=True))
         self.lose_next_turn = True
         self.heal_next_turn = True
+        self.invalidate_possible_actions()
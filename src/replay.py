@@ -0,0 +1,66 @@
+from src.constants import REPLAY_CHECKPOINT_INTERVAL
+from src.decisions import DecisionStream
+from src.events import EventDispatcher
+from src.exceptions import GameOver, ReplayDiverged
+from src.game import Game
+
+
+class ReplayEngine:
+    # Plays a recorded game again from its initial snapshot, headless and reading every choice from the game's
+    # decisions instead of asking for it. A snapshot is kept every checkpoint_interval turns, so seeking to a turn
+    # replays at most checkpoint_interval turns from the nearest checkpoint before it. The engine takes over the game it
+    # is given: it is reset and only moves through seek.
+    def __init__(self, game: Game, checkpoint_interval: int = REPLAY_CHECKPOINT_INTERVAL):
+        if checkpoint_interval < 1:
+            raise ValueError(f"checkpoint_interval must be at least 1, got {checkpoint_interval}.")
+        self.game = game
+        self.checkpoint_interval = checkpoint_interval
+        self.recording = game.decisions
+        self.num_turns = len(self.recording.turn_starts)
+        self.decisions = DecisionStream(decisions=self.recording.decisions, turn_starts=self.recording.turn_starts,
+                                        replay_position=0)
+        game.decisions = self.decisions
+        game.events = EventDispatcher()
+        for player in game.players:
+            player.decisions = self.decisions
+            player.narrate = False
+            player.events = game.events
+        game.reset()
+        self.checkpoints = {0: game.initial_snapshot}
+
+    def get_turn(self):
+        return self.decisions.num_turns
+
+    def seek(self, turn: int):
+        if not 0 <= turn <= self.num_turns:
+            raise ValueError(f"Turn {turn} is out of range. The recorded game has {self.num_turns} turns.")
+        checkpoint_turn = max(checkpoint_turn for checkpoint_turn in self.checkpoints if checkpoint_turn <= turn)
+        # Playing on from the current turn is never slower than going back to a checkpoint behind it.
+        if not checkpoint_turn <= self.get_turn() <= turn:
+            self.game.restore(self.checkpoints[checkpoint_turn])
+        while self.get_turn() < turn:
+            self._replay_turn()
+        return self.game
+
+    def run(self):
+        return self.seek(self.num_turns)
+
+    def _replay_turn(self):
+        turn = self.get_turn()
+        if self.game.game_over:
+            raise ReplayDiverged(f"Game {self.game.game_id} was already over after {turn} of its {self.num_turns} "
+                                 f"recorded turns.")
+        try:
+            self.game.play_turn(auto_play=True, auto_turn_time_secs=0, headless=True)
+        except GameOver:
+            pass
+        if turn + 1 < self.num_turns:
+            expected_num_decisions = self.recording.turn_starts[turn + 1]
+        else:
+            expected_num_decisions = len(self.recording.decisions)
+        if self.decisions.replay_position != expected_num_decisions:
+            turn_start = self.recording.turn_starts[turn]
+            raise ReplayDiverged(f"Game {self.game.game_id} made {self.decisions.replay_position - turn_start} "
+                                 f"decisions in turn {turn}, but {expected_num_decisions - turn_start} were recorded.")
+        if (turn + 1) % self.checkpoint_interval == 0:
+            self.checkpoints.setdefault(turn + 1, self.game.snapshot())
@@ -0,0 +1,172 @@
+import json
+import mmap
+import struct
+import uuid
+import zlib
+import numpy as np
+
+from src.board import Board
+from src.board_arrays import BoardArrays
+from src.decisions import DecisionStream
+from src.game import Game
+from src.game_snapshot import serialize_snapshot, deserialize_snapshot
+from src.player import Player
+from src.transition_kernel import TransitionKernel
+
+# A save image is a fixed header, a JSON metadata block and then one section per array, each starting on a
+# SECTION_ALIGNMENT byte boundary so it can be read in place through a memory map. The header holds the magic, the
+# format version, flags, the length of the metadata and the length of the whole image, all little-endian. Anything
+# written after the image (such as the deltas of a SaveJournal) is left to the caller.
+SAVE_FILE_MAGIC = b'LABYSAVE'
+SAVE_FORMAT_VERSION = 2
+SAVE_FILE_HEADER = struct.Struct('<8sHHIQ')
+SECTION_ALIGNMENT = 64
+COMPRESSED = 1
+
+GAME = 'game'
+BOARD = 'board'
+SEED = 'seed'
+CONFIG = 'config'
+PLAYERS = 'players'
+INITIAL_SNAPSHOT = 'initial_snapshot'
+SNAPSHOT = 'snapshot'
+SECTIONS = 'sections'
+
+TREASURES = 'treasures'
+LANDING_CELLS = 'landing_cells'
+OUTCOMES = 'outcomes'
+DECISIONS = 'decisions'
+TURN_STARTS = 'turn_starts'
+BOARD_ARRAY_SECTIONS = ('tile_types', 'river_directions', 'portal_types', 'portal_symbols', 'portal_exits',
+                        TREASURES, 'wall_masks', 'exits', 'safe_cells')
+
+
+def _align(offset: int):
+    return -(-offset // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+
+def get_board_sections(board: Board):
+    # Everything about a board that stays the same while a game is played. Treasure is added from the snapshot when an
+    # image is encoded.
+    board_arrays = board.board_arrays if board.board_arrays is not None else BoardArrays.from_board(board)
+    sections = {name: getattr(board_arrays, name) for name in BOARD_ARRAY_SECTIONS if name != TREASURES}
+    sections[LANDING_CELLS] = board.transition_kernel.landing_cells
+    sections[OUTCOMES] = board.transition_kernel.outcomes
+    return sections
+
+
+def encode_save(metadata: dict, sections: dict, compress: bool = False):
+    section_directory = {}
+    section_data = []
+    num_section_bytes = 0
+    for name, array in sections.items():
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+        data = array.tobytes()
+        if compress:
+            data = zlib.compress(data)
+        offset = _align(num_section_bytes)
+        section_directory[name] = [array.dtype.str, list(array.shape), offset, len(data)]
+        section_data.append((offset, data))
+        num_section_bytes = offset + len(data)
+
+    metadata_bytes = json.dumps(dict(metadata, **{SECTIONS: section_directory}), separators=(',', ':')).encode()
+    sections_start = _align(SAVE_FILE_HEADER.size + len(metadata_bytes))
+    image = bytearray(sections_start + num_section_bytes)
+    SAVE_FILE_HEADER.pack_into(image, 0, SAVE_FILE_MAGIC, SAVE_FORMAT_VERSION, COMPRESSED if compress else 0,
+                               len(metadata_bytes), len(image))
+    image[SAVE_FILE_HEADER.size:SAVE_FILE_HEADER.size + len(metadata_bytes)] = metadata_bytes
+    for offset, data in section_data:
+        image[sections_start + offset:sections_start + offset + len(data)] = data
+    return bytes(image)
+
+
+def encode_game(game: Game, snapshot_data: dict = None, board_sections: dict = None, compress: bool = False):
+    if snapshot_data is None:
+        snapshot_data = serialize_snapshot(game.snapshot())
+    if board_sections is None:
+        board_sections = get_board_sections(game.board)
+    board = game.board
+    treasures = np.zeros((board.width, board.height), dtype=np.int8)
+    for cell, num_treasure in snapshot_data['treasure_counts']:
+        treasures.flat[cell] = num_treasure
+    decisions = np.array(game.decisions.decisions[:snapshot_data['num_decisions']], dtype=np.int16)
+    turn_starts = np.array(game.decisions.turn_starts[:snapshot_data['num_turns']], dtype=np.int32)
+    metadata = {
+        GAME: dict(game_id=game.game_id, random_seed=game.random_seed,
+                   display_all_info_each_turn=game.display_all_info_each_turn, auto_rng=game.auto_rng),
+        BOARD: {SEED: board.seed, CONFIG: board.get_config()},
+        PLAYERS: [dict(name=player.name, player_id=str(player.player_id)) for player in game.players],
+        INITIAL_SNAPSHOT: serialize_snapshot(game.initial_snapshot),
+        SNAPSHOT: snapshot_data
+    }
+    return encode_save(metadata, dict(board_sections, **{TREASURES: treasures, DECISIONS: decisions,
+                                                         TURN_STARTS: turn_starts}), compress=compress)
+
+
+class SaveFile:
+    # A save image opened through a read-only memory map. Sections are only decoded when they are first read, and
+    # uncompressed ones are numpy views straight onto the map, so opening a save does not depend on the board size.
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            try:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Save file {file_path} is empty.")
+        if len(self._buffer) < SAVE_FILE_HEADER.size:
+            raise ValueError(f"Save file {file_path} is too short to hold a save header.")
+        magic, version, self.flags, metadata_num_bytes, self.image_num_bytes = \
+            SAVE_FILE_HEADER.unpack_from(self._buffer)
+        if magic != SAVE_FILE_MAGIC:
+            raise ValueError(f"{file_path} is not a save file.")
+        if version != SAVE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported save format version {version} in {file_path}. "
+                             f"Expected version {SAVE_FORMAT_VERSION}.")
+        self.metadata = json.loads(self._buffer[SAVE_FILE_HEADER.size:SAVE_FILE_HEADER.size + metadata_num_bytes])
+        self._sections_start = _align(SAVE_FILE_HEADER.size + metadata_num_bytes)
+        self._arrays = {}
+
+    def get_array(self, name: str):
+        if name not in self._arrays:
+            dtype, shape, offset, num_bytes = self.metadata[SECTIONS][name]
+            start = self._sections_start + offset
+            if self.flags & COMPRESSED:
+                array = np.frombuffer(zlib.decompress(self._buffer[start:start + num_bytes]), dtype=dtype)
+            else:
+                array = np.frombuffer(self._buffer, dtype=dtype, count=num_bytes // np.dtype(dtype).itemsize,
+                                      offset=start)
+            self._arrays[name] = array.reshape(shape)
+        return self._arrays[name]
+
+    def get_trailing_bytes(self):
+        return self._buffer[self.image_num_bytes:]
+
+
+def load_board(save_file: SaveFile, auto_rng: bool = False):
+    board_data = save_file.metadata[BOARD]
+    board_arrays = BoardArrays(config=board_data[CONFIG],
+                               **{name: save_file.get_array(name) for name in BOARD_ARRAY_SECTIONS})
+    transition_kernel = TransitionKernel(landing_cells=save_file.get_array(LANDING_CELLS),
+                                         outcomes=save_file.get_array(OUTCOMES))
+    return Board.from_arrays(board_arrays, auto_rng=auto_rng, seed=board_data[SEED],
+                             transition_kernel=transition_kernel)
+
+
+def load_game(save_file: SaveFile, auto_rng: bool = False, snapshot_data: dict = None,
+              decisions: DecisionStream = None):
+    metadata = save_file.metadata
+    if snapshot_data is None:
+        snapshot_data = metadata[SNAPSHOT]
+    if decisions is None:
+        decisions = DecisionStream(decisions=save_file.get_array(DECISIONS).tolist(),
+                                   turn_starts=save_file.get_array(TURN_STARTS).tolist())
+    board = load_board(save_file, auto_rng=auto_rng)
+    players = [Player(name=player_data['name'], player_id=uuid.UUID(player_data['player_id']), board=board,
+                      auto_rng=auto_rng) for player_data in metadata[PLAYERS]]
+    game_data = metadata[GAME]
+    game = Game(board=board, players=players, game_id=game_data['game_id'], random_seed=game_data['random_seed'],
+                randomize_player_order=False, display_all_info_each_turn=game_data['display_all_info_each_turn'],
+                auto_rng=auto_rng, initial_snapshot=deserialize_snapshot(metadata[INITIAL_SNAPSHOT]),
+                decisions=decisions)
+    game.restore(deserialize_snapshot(snapshot_data))
+    return game
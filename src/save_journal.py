@@ -0,0 +1,130 @@
+import json
+import os
+
+from src.game import Game
+from src.game_snapshot import GameSnapshot, serialize_snapshot, PLAYER_ID
+from src.decisions import DecisionStream
+from src.save_format import SaveFile, encode_game, get_board_sections, load_game, SNAPSHOT, DECISIONS, TURN_STARTS
+
+COMPACT_EVERY_NUM_DELTAS = 256
+
+GAME = 'game'
+PLAYERS = 'players'
+PLAYER_STATES = 'player_states'
+TREASURE_COUNTS = 'treasure_counts'
+NUM_TURNS = 'num_turns'
+NUM_DECISIONS = 'num_decisions'
+
+
+def _diff_snapshots(previous_snapshot_data, snapshot_data):
+    # Only what changed: top level fields by name, player state fields by seat and treasure counts by cell (0 once a
+    # cell has no treasure left).
+    delta = {}
+    game_changes = {field: value for field, value in snapshot_data.items()
+                    if field not in (PLAYER_STATES, TREASURE_COUNTS) and previous_snapshot_data[field] != value}
+    if game_changes:
+        delta[GAME] = game_changes
+    player_changes = {}
+    for seat, (previous_player_state, player_state) in enumerate(zip(previous_snapshot_data[PLAYER_STATES],
+                                                                     snapshot_data[PLAYER_STATES])):
+        changes = {field: value for field, value in player_state.items() if previous_player_state[field] != value}
+        if changes:
+            player_changes[str(seat)] = changes
+    if player_changes:
+        delta[PLAYERS] = player_changes
+    previous_treasure_counts = dict(previous_snapshot_data[TREASURE_COUNTS])
+    treasure_counts = dict(snapshot_data[TREASURE_COUNTS])
+    treasure_changes = [[cell, treasure_counts.get(cell, 0)] for cell in sorted(previous_treasure_counts.keys() |
+                                                                                treasure_counts.keys())
+                        if previous_treasure_counts.get(cell, 0) != treasure_counts.get(cell, 0)]
+    if treasure_changes:
+        delta[TREASURE_COUNTS] = treasure_changes
+    return delta
+
+
+def _apply_delta(snapshot_data, delta):
+    snapshot_data.update(delta.get(GAME, {}))
+    for seat, changes in delta.get(PLAYERS, {}).items():
+        snapshot_data[PLAYER_STATES][int(seat)].update(changes)
+    treasure_counts = dict(snapshot_data[TREASURE_COUNTS])
+    for cell, num_treasure in delta.get(TREASURE_COUNTS, []):
+        if num_treasure > 0:
+            treasure_counts[cell] = num_treasure
+        else:
+            treasure_counts.pop(cell, None)
+    snapshot_data[TREASURE_COUNTS] = sorted([cell, num_treasure] for cell, num_treasure in treasure_counts.items())
+
+
+class SaveJournal:
+    # A save image (see save_format) followed by one JSON line per saved turn holding what changed since the previous
+    # save. Every compact_every_num_deltas deltas the file is rewritten as a single image.
+    def __init__(self, file_path: str, compact_every_num_deltas: int = COMPACT_EVERY_NUM_DELTAS,
+                 compress: bool = False):
+        self.file_path = file_path
+        self.compact_every_num_deltas = compact_every_num_deltas
+        self.compress = compress
+        self._snapshot_data = None
+        self._player_ids = None
+        self._num_deltas = 0
+        self._board = None
+        self._board_sections = None
+
+    def write_base(self, game: Game, snapshot: GameSnapshot = None):
+        if self._board is not game.board:
+            self._board = game.board
+            self._board_sections = get_board_sections(game.board)
+        if snapshot is None:
+            snapshot = game.snapshot()
+        snapshot_data = serialize_snapshot(snapshot)
+        image = encode_game(game, snapshot_data=snapshot_data, board_sections=self._board_sections,
+                            compress=self.compress)
+        tmp_file_path = f"{self.file_path}.tmp"
+        with open(tmp_file_path, 'wb') as f:
+            f.write(image)
+        os.replace(tmp_file_path, self.file_path)
+        self._snapshot_data = snapshot_data
+        self._player_ids = [player_state[PLAYER_ID] for player_state in snapshot.player_states]
+        self._num_deltas = 0
+
+    def append(self, game: Game, snapshot: GameSnapshot = None):
+        # snapshot defaults to the game's current state. Passing one in lets a snapshot taken earlier be written
+        # while the game carries on.
+        if snapshot is None:
+            snapshot = game.snapshot()
+        if self._snapshot_data is None or self._num_deltas >= self.compact_every_num_deltas or \
+                self._player_ids != [player_state[PLAYER_ID] for player_state in snapshot.player_states]:
+            self.write_base(game, snapshot=snapshot)
+            return
+        snapshot_data = serialize_snapshot(snapshot)
+        delta = _diff_snapshots(self._snapshot_data, snapshot_data)
+        if not delta:
+            return
+        # The decisions and turn starts made since the previous save, which the snapshot only counts.
+        new_decisions = game.decisions.decisions[self._snapshot_data[NUM_DECISIONS]:snapshot_data[NUM_DECISIONS]]
+        if new_decisions:
+            delta[DECISIONS] = new_decisions
+        new_turn_starts = game.decisions.turn_starts[self._snapshot_data[NUM_TURNS]:snapshot_data[NUM_TURNS]]
+        if new_turn_starts:
+            delta[TURN_STARTS] = new_turn_starts
+        with open(self.file_path, 'ab') as f:
+            f.write(json.dumps(delta).encode() + b'\n')
+        self._snapshot_data = snapshot_data
+        self._num_deltas += 1
+
+
+def load_game_from_journal(file_path: str, auto_rng: bool = False):
+    save_file = SaveFile(file_path)
+    snapshot_data = save_file.metadata[SNAPSHOT]
+    decisions = save_file.get_array(DECISIONS).tolist()
+    turn_starts = save_file.get_array(TURN_STARTS).tolist()
+    for line in save_file.get_trailing_bytes().splitlines():
+        try:
+            delta = json.loads(line)
+        except ValueError:
+            # The last delta may have been cut short by a crash while it was written.
+            break
+        _apply_delta(snapshot_data, delta)
+        decisions.extend(delta.get(DECISIONS, []))
+        turn_starts.extend(delta.get(TURN_STARTS, []))
+    return load_game(save_file, auto_rng=auto_rng, snapshot_data=snapshot_data,
+                     decisions=DecisionStream(decisions=decisions, turn_starts=turn_starts))
@@ -6,14 +6,19 @@ from typing import List, Tuple
 from src.items import RustyBullet, FirstAidKit, PileOfJunk
 from src.datatypes import PortalType, Direction
 from src.actions import AcquireTreasure, Action, LoseTurn, BuyItem, Heal, Teleport, Flush, AddPlayerXP
+from src.events import TileEnteredEvent
 from src.location import Location
 from src.datatypes import TileType
 from src.symbols import *
-from src.exceptions import NoTreasureOnTile, InvalidDirection
+from src.exceptions import NoTreasureOnTile, InvalidDirection, NoValidRiverPath
 from src.utils import generate_dice_roll_map
+from src.wall_index import DIRECTION_DELTAS
+from src.generation_budget import GenerationBudget
 
 
 class Tile(ABC):
+    # Acquiring treasure does not depend on the tile, so every tile offers the same action.
+    acquire_treasure_action = AcquireTreasure()
 
     def __init__(self, location: Location):
         self.location = location
@@ -28,9 +33,10 @@ class Tile(ABC):
         else:
             return self.symbol
 
-    @abstractmethod
     def announce_tile(self, player):
-        pass
+        if player.events.enabled:
+            player.events.emit(TileEnteredEvent(player.name, self.type, self.location.x, self.location.y,
+                                                found_treasure=self.has_treasure(), injured=player.is_injured()))
 
     def has_treasure(self):
         return self.num_treasure > 0
@@ -53,7 +59,7 @@ class Tile(ABC):
 
     def get_actions(self, player) -> List[Action]:
         if self.has_treasure():
-            return self._actions + [AcquireTreasure()]
+            return self._actions + [self.acquire_treasure_action]
         return self._actions
 
     @abstractmethod
@@ -69,13 +75,6 @@ class Safe(Tile):
         self.symbol = SAFE_SYMBOL
         self.type = TileType.SAFE
 
-    def announce_tile(self, player):
-        print(f"{player.name} walks into a {TileType.SAFE.name} clearing.")
-        if self.has_treasure():
-            print(f"{player.name} also stumbles across a pile of {TileType.TREASURE.name}")
-            if player.is_injured():
-                print(f"However, {player.name} is {player.status.name} so he/she cannot acquire the treasure.")
-
     def description(self):
         return f"You are safe."
 
@@ -89,13 +88,6 @@ class Marsh(Tile):
         self.xp = 1
         self._actions = [LoseTurn(is_mandatory=True), AddPlayerXP(amount=self.xp)]
 
-    def announce_tile(self, player):
-        print(f"{player.name} sinks into a {TileType.MARSH.name}.")
-        if self.has_treasure():
-            print(f"{player.name} also stumbles across a pile of {TileType.TREASURE.name}")
-            if player.is_injured():
-                print(f"However, {player.name} is {player.status.name} so he/she cannot acquire the treasure.")
-
     def description(self):
         return f"You lose your next turn."
 
@@ -116,20 +108,13 @@ class Shop(Tile):
         self.symbol = SHOP_SYMBOL
         self.type = TileType.SHOP
 
-    def announce_tile(self, player):
-        print(f"{player.name} enters a RANDOM ITEM {TileType.SHOP.name}.")
-        if self.has_treasure():
-            print(f"{player.name} also stumbles across a pile of {TileType.TREASURE.name}")
-            if player.is_injured():
-                print(f"However, {player.name} is {player.status.name} so he/she cannot acquire the treasure.")
-
     def get_actions(self, player) -> List[Action]:
         actions = []
         if not player.has_item():
             actions.extend(self._actions)
 
         if self.has_treasure():
-            actions.extend([AcquireTreasure()])
+            actions.append(self.acquire_treasure_action)
 
         return actions
 
@@ -145,20 +130,13 @@ class Hospital(Tile):
         self.type = TileType.HOSPITAL
         self._actions = [Heal(source=self.type)]
 
-    def announce_tile(self, player):
-        print(f"{player.name} enters a {TileType.HOSPITAL.name}.")
-        if self.has_treasure():
-            print(f"{player.name} also stumbles across a pile of {TileType.TREASURE.name}")
-            if player.is_injured():
-                print(f"However, {player.name} is {player.status.name} so he/she cannot acquire the treasure.")
-
     def get_actions(self, player) -> List[Action]:
         actions = []
         if player.is_injured():
             actions.extend(self._actions)
 
         if self.has_treasure():
-            actions.extend([AcquireTreasure()])
+            actions.append(self.acquire_treasure_action)
 
         return actions
 
@@ -177,13 +155,6 @@ class Portal(Tile, ABC):
         self.xp = 2
         self._actions = [Teleport(self.exit_location, is_mandatory=True), AddPlayerXP(amount=self.xp)]
 
-    def announce_tile(self, player):
-        print(f"{player.name} enters and exits a portal.")
-        if self.has_treasure():
-            print(f"{player.name} also stumbles across a pile of {TileType.TREASURE.name}")
-            if player.is_injured():
-                print(f"However, {player.name} is {player.status.name} so he/she cannot acquire the treasure.")
-
     def description(self):
         return f"You have landed on a portal tile."
 
@@ -207,13 +178,6 @@ class River(Tile, ABC):
         self.xp = 2
         self._actions = [Flush(self.direction, is_mandatory=True), AddPlayerXP(amount=self.xp)]
 
-    def announce_tile(self, player):
-        print(f"{player.name} swims into the {TileType.RIVER.name}.")
-        if self.has_treasure():
-            print(f"{player.name} also stumbles across a pile of {TileType.TREASURE.name}")
-            if player.is_injured():
-                print(f"However, {player.name} is {player.status.name} so he/she cannot acquire the treasure.")
-
     def description(self):
         return f"You have landed on a river tile."
 
@@ -236,10 +200,21 @@ class TileFactory:
             return treasure_tile
 
     @staticmethod
-    def create_full_river(board_height: int, max_num_turns: int, board_width: int, max_river_length: int):
-        possible_river_paths = _get_possible_river_paths(max_river_length=max_river_length, max_num_turns=max_num_turns,
-                                                         board_height=board_height, board_width=board_width)
-        return random.choice(possible_river_paths)
+    def create_full_river(board_height: int, max_num_turns: int, board_width: int, max_river_length: int,
+                          rng: random.Random, generation_budget: GenerationBudget = None):
+        if generation_budget is None:
+            generation_budget = GenerationBudget()
+            generation_budget.begin_phase('river')
+        for _ in range(2 * (board_height + board_width)):
+            river_start_tile = _get_river_start_tile(board_height=board_height, board_width=board_width, rng=rng)
+            river_path = _find_river_path(river_start_tile=river_start_tile, max_river_length=max_river_length,
+                                          max_num_turns=max_num_turns, board_height=board_height,
+                                          board_width=board_width, max_expansions=100 * max_river_length,
+                                          rng=rng, generation_budget=generation_budget)
+            if river_path is not None:
+                return river_path
+        raise NoValidRiverPath(f"Could not fit a river of {max_river_length} tiles with at most {max_num_turns} "
+                               f"bends on a {board_width}x{board_height} board.")
 
     @staticmethod
     def create_type_a_portal_tile(location: Location):
@@ -265,20 +240,20 @@ class TileFactory:
         return a_portal, b_portal, c_portal
 
 
-def _get_river_start_tile(board_height: int, board_width: int):
-    use_x_axis_edge = random.random() < 0.5
+def _get_river_start_tile(board_height: int, board_width: int, rng: random.Random):
+    use_x_axis_edge = rng.random() < 0.5
     max_x_coordinate, max_y_coordinate = board_width - 1, board_height - 1
 
     if use_x_axis_edge:
-        x = random.choice(range(board_width))
-        y = random.choice([0, max_y_coordinate])
+        x = rng.choice(range(board_width))
+        y = rng.choice([0, max_y_coordinate])
         if y == max_y_coordinate:
             init_direction = Direction.DOWN
         else:
             init_direction = Direction.UP
     else:
-        x = random.choice([0, max_x_coordinate])
-        y = random.choice(range(board_height))
+        x = rng.choice([0, max_x_coordinate])
+        y = rng.choice(range(board_height))
         if x == max_x_coordinate:
             init_direction = Direction.LEFT
         else:
@@ -287,58 +262,75 @@ def _get_river_start_tile(board_height: int, board_width: int):
     return River(location=Location(x=x, y=y), direction=init_direction)
 
 
-def _get_possible_river_paths(max_river_length: int, max_num_turns: int, board_height: int, board_width: int):
-    valid_river_paths = []
-    queue = []
-    possible_directions = [Direction.LEFT, Direction.RIGHT, Direction.UP, Direction.DOWN]
+def _steps_to_border(x: int, y: int, direction: Direction, board_height: int, board_width: int):
+    if direction == Direction.UP:
+        return board_height - 1 - y
+    if direction == Direction.DOWN:
+        return y
+    if direction == Direction.LEFT:
+        return x
+    return board_width - 1 - x
 
-    river_start_tile = _get_river_start_tile(board_height=board_height, board_width=board_width)
-    # print(f"river_start_tile: {river_start_tile}")
-    queue.append(([river_start_tile], max_num_turns))
-
-    while len(queue) != 0:
-        river_path, remaining_num_turns = queue.pop(0)
-        # print(f"Investigating river_path ({len(river_path)}) ({river_path[0].location}): {[str(river_tile)
-        # for river_tile in river_path]}")
-        if len(river_path) == max_river_length:
-            if _river_tile_exits_wall(river_path[-1], board_height=board_height, board_width=board_width):
-                return [river_path]
-        else:
-            last_river_tile = river_path[-1]
-            next_river_tile_location = last_river_tile.location.next_location(last_river_tile.direction)
-
-            if next_river_tile_location.in_bounds(board_height=board_height, board_width=board_width):
-                for direction in random.sample(possible_directions, len(possible_directions)):
-                    if _can_add_river_tile_in_this_direction(location=next_river_tile_location,
-                                                             direction=direction,
-                                                             river_tiles=river_path,
-                                                             board_height=board_width,
-                                                             board_width=board_width):
-                        neighbor_river_tile = River(location=next_river_tile_location, direction=direction)
-                        new_river_path = river_path + [neighbor_river_tile]
-                        if max_num_turns >= 0:
-                            if direction == last_river_tile.direction:
-                                queue.append((new_river_path, remaining_num_turns))
-                            else:
-                                if not remaining_num_turns <= 0:
-                                    queue.append((new_river_path, remaining_num_turns - 1))
-                        else:
-                            queue.append((new_river_path, remaining_num_turns))
-
-    print(f"Did not find valid river.")
-    return valid_river_paths
-
-
-def _can_add_river_tile_in_this_direction(location: Location, direction: Direction, river_tiles: List[River],
-                                          board_height: int, board_width: int):
-    river_tile_locations = [river_tile.location for river_tile in river_tiles]
-    candidate_next_river_tile_location = location.next_location(direction=direction)
-    # if candidate_next_river_tile_location.in_bounds(board_height=board_height, board_width=board_width):
-    if candidate_next_river_tile_location not in river_tile_locations:
-        return True
-    return False
-
-
-def _river_tile_exits_wall(river_tile: River, board_height: int, board_width: int):
-    return not river_tile.location.next_location(direction=river_tile.direction).in_bounds(board_height=board_height,
-                                                                                           board_width=board_width)
+
+def _find_river_path(river_start_tile: River, max_river_length: int, max_num_turns: int, board_height: int,
+                     board_width: int, max_expansions: int, rng: random.Random,
+                     generation_budget: GenerationBudget):
+    possible_directions = [Direction.LEFT, Direction.RIGHT, Direction.UP, Direction.DOWN]
+    visited = bytearray(board_width * board_height)
+
+    start_x, start_y = river_start_tile.location.get_coordinates()
+    visited[start_x * board_height + start_y] = 1
+    # Each entry is (x, y, direction, remaining_num_turns, untried directions for the next tile). The path is extended
+    # and backtracked in place instead of copying it for every branch.
+    path = [(start_x, start_y, river_start_tile.direction, max_num_turns, None)]
+    num_expansions = 0
+
+    while len(path) != 0:
+        x, y, direction, remaining_num_turns, untried_directions = path[-1]
+        x_delta, y_delta = DIRECTION_DELTAS[direction]
+        next_x, next_y = x + x_delta, y + y_delta
+        next_in_bounds = 0 <= next_x < board_width and 0 <= next_y < board_height
+
+        if len(path) == max_river_length:
+            if not next_in_bounds:
+                return [River(location=Location(x=x, y=y), direction=direction) for x, y, direction, _, _ in path]
+            untried_directions = []
+        elif untried_directions is None:
+            generation_budget.check()
+            num_expansions += 1
+            if num_expansions > max_expansions:
+                return None
+            num_remaining_tiles = max_river_length - len(path)
+            if next_in_bounds and min(next_x, next_y, board_width - 1 - next_x, board_height - 1 - next_y) < \
+                    num_remaining_tiles:
+                untried_directions = rng.sample(possible_directions, len(possible_directions))
+            else:
+                untried_directions = []
+            path[-1] = (x, y, direction, remaining_num_turns, untried_directions)
+
+        if len(untried_directions) == 0:
+            visited[x * board_height + y] = 0
+            path.pop()
+            continue
+
+        next_direction = untried_directions.pop()
+        next_remaining_num_turns = remaining_num_turns
+        if max_num_turns >= 0 and next_direction != direction:
+            if remaining_num_turns <= 0:
+                continue
+            next_remaining_num_turns -= 1
+
+        num_remaining_tiles = max_river_length - len(path)
+        if max_num_turns >= 0 and next_remaining_num_turns == 0 and \
+                _steps_to_border(next_x, next_y, next_direction, board_height, board_width) != num_remaining_tiles - 1:
+            continue
+
+        target_x, target_y = next_x + DIRECTION_DELTAS[next_direction][0], next_y + DIRECTION_DELTAS[next_direction][1]
+        if 0 <= target_x < board_width and 0 <= target_y < board_height and \
+                visited[target_x * board_height + target_y]:
+            continue
+
+        visited[next_x * board_height + next_y] = 1
+        path.append((next_x, next_y, next_direction, next_remaining_num_turns, None))
+
+    return None
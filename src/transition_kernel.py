@@ -0,0 +1,70 @@
+import numpy as np
+
+from src.datatypes import Direction, MoveOutcome, TileType
+from src.wall_index import DIRECTION_BITS
+
+
+class TransitionKernel:
+    # landing_cells[cell, direction.value - 1] is the cell a player ends a move on once the tile they step onto has
+    # flushed or teleported them, and outcomes[cell, direction.value - 1] is the MoveOutcome value of that move. Moves
+    # that are blocked or walk into an exit leave the player where they are, as does a flush into an exit when the
+    # player has no treasure.
+    def __init__(self, landing_cells: np.ndarray, outcomes: np.ndarray):
+        self.landing_cells = landing_cells
+        self.outcomes = outcomes
+
+    @staticmethod
+    def from_board(board):
+        num_cells = board.width * board.height
+        cells = np.arange(num_cells)
+        # Per-cell tables indexed by direction.value, so a river tile's direction can index them directly.
+        direction_bits = np.zeros(len(Direction) + 1, dtype=np.uint8)
+        next_cells = np.zeros((len(Direction) + 1, num_cells), dtype=np.int64)
+        for direction, bit in DIRECTION_BITS.items():
+            direction_bits[direction.value] = bit
+            next_cells[direction.value] = board.next_cells[direction]
+        exit_sides = np.zeros((len(Direction) + 1, num_cells), dtype=bool)
+        for ex in board.exits:
+            exit_sides[ex.direction.value, board.get_cell(ex.location)] = True
+
+        tile_types = np.zeros(num_cells, dtype=np.int8)
+        river_directions = np.zeros(num_cells, dtype=np.int8)
+        portal_exits = cells.copy()
+        for cell, location in enumerate(board.all_locations):
+            tile = board.grid[location.x][location.y]
+            tile_types[cell] = tile.type.value
+            if tile.type == TileType.RIVER:
+                river_directions[cell] = tile.direction.value
+            elif tile.type == TileType.PORTAL:
+                portal_exits[cell] = board.get_cell(tile.exit_location)
+        blocked = board.wall_index.blocked.reshape(num_cells)
+
+        landing_cells = np.zeros((num_cells, len(Direction)), dtype=np.int32)
+        outcomes = np.zeros((num_cells, len(Direction)), dtype=np.int8)
+        for direction in Direction:
+            is_blocked = (blocked & direction_bits[direction.value]) != 0
+            next_cell = np.where(is_blocked, cells, next_cells[direction.value])
+            next_tile_types = tile_types[next_cell]
+            flush_directions = river_directions[next_cell]
+            flush_blocked = (blocked[next_cell] & direction_bits[flush_directions]) != 0
+            flushed_cell = np.where(flush_blocked, next_cell, next_cells[flush_directions, next_cell])
+            is_river = next_tile_types == TileType.RIVER.value
+            is_portal = next_tile_types == TileType.PORTAL.value
+
+            landing_cells[:, direction.value - 1] = np.select(
+                [is_blocked, is_portal, is_river], [cells, portal_exits[next_cell], flushed_cell], next_cell)
+            outcomes[:, direction.value - 1] = np.select(
+                [is_blocked & exit_sides[direction.value], is_blocked, is_portal,
+                 is_river & flush_blocked & exit_sides[flush_directions, next_cell], is_river,
+                 next_tile_types == TileType.MARSH.value],
+                [MoveOutcome.EXIT.value, MoveOutcome.BLOCKED.value, MoveOutcome.TELEPORTED.value,
+                 MoveOutcome.FLUSHED_INTO_EXIT.value, MoveOutcome.FLUSHED.value, MoveOutcome.MARSH.value],
+                MoveOutcome.MOVED.value)
+        return TransitionKernel(landing_cells=landing_cells, outcomes=outcomes)
+
+    def landing_cell(self, cell: int, direction: Direction):
+        return int(self.landing_cells[cell, direction.value - 1])
+
+    def outcome(self, cell: int, direction: Direction):
+        return MoveOutcome(self.outcomes[cell, direction.value - 1])
+
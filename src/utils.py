@@ -1,5 +1,5 @@
 import os
-import _pickle as pickle
+import hashlib
 
 from src.constants import *
 
@@ -102,7 +102,7 @@ def generate_dice_roll_map(one=None, two=None, three=None, four=None, five=None,
 
 
 def get_backup_file_path(game_id):
-    return os.path.join(GAME_BACKUP_DIR, f'{game_id}.pkl')
+    return os.path.join(GAME_BACKUP_DIR, f'{game_id}.journal')
 
 
 def delete_game_backup(game_id):
@@ -114,20 +114,12 @@ def delete_game_backup(game_id):
         print(f"Save file {game_backup_file_path} does not exist. Nothing to delete.")
 
 
-def save_game_backup(game, game_id):
-    game_backup_file_path = get_backup_file_path(game_id)
-    with open(game_backup_file_path, 'wb+') as f:
-        pickle.dump(game, f)
-
-
-def load_game_from_backup(game_id):
-    game_backup_file_path = get_backup_file_path(game_id)
-    with open(game_backup_file_path, 'rb') as f:
-        game = pickle.load(f)
-    return game
-
-
 def manhattan_distance(loc_1, loc_2):
     x1, y1 = loc_1.get_coordinates()
     x2, y2 = loc_2.get_coordinates()
     return abs(x1 - x2) + abs(y1 - y2)
+
+
+def derive_seed(seed, *salt):
+    digest = hashlib.sha256(repr((seed,) + salt).encode()).digest()
+    return int.from_bytes(digest[:4], 'big')
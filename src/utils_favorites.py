@@ -1,10 +1,9 @@
 import os
 import json
 from enum import Enum
-import random
 
-from src.board import Board
 from src.game import Game
+from src.board_cache import BoardCache
 from src.constants import FAVORITE_GAMES_FILE_PATH, STR_GAME_BOARDS_DIR
 
 GAME_SEED = 'game_seed'
@@ -130,8 +129,7 @@ def save_str_board_for_game_config(favorite_game_key, game_config):
     random_seed = game_config[GAME_SEED]
     board_config = game_config[BOARD_CONFIG]
 
-    random.seed(random_seed)
-    board = Board(**board_config)
+    board = BoardCache().get_or_generate(seed=random_seed, board_config=board_config)
     game = Game(board=board, randomize_player_order=False, random_seed=random_seed)
     str_game_board_file_path = get_str_game_board_file_path(favorite_game_key)
     if not os.path.exists(STR_GAME_BOARDS_DIR):
@@ -139,8 +137,6 @@ def save_str_board_for_game_config(favorite_game_key, game_config):
     with open(str_game_board_file_path, "w+") as f:
         f.write(game.str_board())
 
-    random.seed()
-
 
 def get_str_game_board_file_path(favorite_game_key):
     return os.path.join(STR_GAME_BOARDS_DIR, f'{favorite_game_key}.txt')
@@ -0,0 +1,73 @@
+import numpy as np
+
+from src.datatypes import Direction
+
+DIRECTION_BITS = {
+    Direction.UP: 1,
+    Direction.DOWN: 2,
+    Direction.LEFT: 4,
+    Direction.RIGHT: 8
+}
+
+DIRECTION_DELTAS = {
+    Direction.UP: (0, 1),
+    Direction.DOWN: (0, -1),
+    Direction.LEFT: (-1, 0),
+    Direction.RIGHT: (1, 0)
+}
+
+class WallIndex:
+    def __init__(self, height: int, width: int, wall_edge_ids=()):
+        self.height = height
+        self.width = width
+        # blocked[x, y] holds one DIRECTION_BITS flag per side of the tile that cannot be crossed, including the
+        # outer border of the board.
+        self.blocked = np.zeros((width, height), dtype=np.uint8)
+        self.blocked[0, :] |= DIRECTION_BITS[Direction.LEFT]
+        self.blocked[width - 1, :] |= DIRECTION_BITS[Direction.RIGHT]
+        self.blocked[:, 0] |= DIRECTION_BITS[Direction.DOWN]
+        self.blocked[:, height - 1] |= DIRECTION_BITS[Direction.UP]
+        for wall_edge_id in wall_edge_ids:
+            self.add_wall(wall_edge_id)
+
+    @staticmethod
+    def from_blocked(blocked: np.ndarray):
+        wall_index = WallIndex(height=blocked.shape[1], width=blocked.shape[0])
+        wall_index.blocked = blocked
+        return wall_index
+
+    def add_wall(self, wall_edge_id: int):
+        cell, is_up_edge = divmod(wall_edge_id, 2)
+        x, y = divmod(cell, self.height)
+        if is_up_edge:
+            self.blocked[x, y] |= DIRECTION_BITS[Direction.UP]
+            self.blocked[x, y + 1] |= DIRECTION_BITS[Direction.DOWN]
+        else:
+            self.blocked[x, y] |= DIRECTION_BITS[Direction.RIGHT]
+            self.blocked[x + 1, y] |= DIRECTION_BITS[Direction.LEFT]
+
+    def is_blocked(self, x: int, y: int, direction: Direction):
+        return bool(self.blocked[x, y] & DIRECTION_BITS[direction])
+
+    def no_walls_block_straight_line(self, location_1, location_2):
+        assert location_1 != location_2, f"Cannot ask for blockers between the same locations."
+        assert location_1.x == location_2.x or location_1.y == location_2.y, \
+            f"There is no straight path between {str(location_1)} and {str(location_2)}"
+        if not location_1.in_bounds(board_height=self.height, board_width=self.width) or \
+                not location_2.in_bounds(board_height=self.height, board_width=self.width):
+            return False
+
+        if location_1.x == location_2.x:
+            direction = Direction.UP if location_2.y > location_1.y else Direction.DOWN
+        else:
+            direction = Direction.RIGHT if location_2.x > location_1.x else Direction.LEFT
+        bit = DIRECTION_BITS[direction]
+        x_delta, y_delta = DIRECTION_DELTAS[direction]
+
+        x, y = location_1.get_coordinates()
+        while (x, y) != (location_2.x, location_2.y):
+            if self.blocked[x, y] & bit:
+                return False
+            x += x_delta
+            y += y_delta
+        return True
@@ -6,16 +6,16 @@ import uuid
 import time
 import matplotlib.pyplot as plt
 
-from timeout_decorator.timeout_decorator import TimeoutError
-
 from src.game import Game
+from src.monte_carlo import run_monte_carlo
 from src.board import Board
+from src.board_cache import BoardCache
 from src.constants import *
 from src.utils_favorites import save_favorite_games, load_favorite_games, get_game_board_config, \
     GAME_SEED, BOARD_CONFIG, NUM_PLAYERS
-from src.utils import load_game_from_backup, get_backup_file_path, save_game_backup, get_yes_or_no_response, \
-    response_is_yes
-from src.exceptions import ZeroRemainingSafeTiles
+from src.save_journal import SaveJournal, load_game_from_journal
+from src.utils import get_backup_file_path, get_yes_or_no_response, response_is_yes
+from src.exceptions import ZeroRemainingSafeTiles, NoValidRiverPath, NoValidExitPlacement, GenerationBudgetExceeded
 
 
 def ask_for_board_config():
@@ -104,6 +104,9 @@ if __name__ == '__main__':
                         type=int, default=1)
     parser.add_argument("-n", "--num_auto_play_profile_times", help="Number of times to average auto play stats over",
                         type=int, default=1)
+    parser.add_argument("-w", "--num_workers", help="Number of worker processes to profile auto play games on "
+                                                    "(defaults to the number of cores).",
+                        type=int, default=os.cpu_count())
     args = parser.parse_args()
 
     if not os.path.exists(GAME_BACKUP_DIR):
@@ -147,17 +150,25 @@ if __name__ == '__main__':
                 player_names = [f"Player {i + 1}" for i in range(chosen_board_config[NUM_PLAYERS])]
             print()
 
-        random.seed(random_seed)
         print('Generating board (This may take a while)...')
         print()
         try:
-            board = Board(**board_config, auto_rng=args.auto_rng)
+            if args.unique_key is None:
+                board = Board(**board_config, auto_rng=args.auto_rng, seed=random_seed)
+            else:
+                board = BoardCache().get_or_generate(seed=random_seed, board_config=board_config,
+                                                     auto_rng=args.auto_rng)
         except ZeroRemainingSafeTiles as e:
             print(f"{e}. Too many non-safe tiles assigned to the board. Please assign less non-safe tiles.")
             exit(1)
-        except TimeoutError:
-            print(f"Cancelling program. Took longer than 15 seconds to generate the board. "
-                  f"Please play with a smaller board.")
+        except NoValidRiverPath as e:
+            print(f"{e} Please assign less river tiles or allow more river bends.")
+            exit(1)
+        except NoValidExitPlacement as e:
+            print(f"{e} Please assign less exits or play with a bigger board.")
+            exit(1)
+        except GenerationBudgetExceeded as e:
+            print(f"{e} Cancelling program. Please play with a smaller board.")
             exit(1)
         try:
             players = board.generate_safe_players(player_names=player_names)
@@ -173,42 +184,36 @@ if __name__ == '__main__':
               f"please run `./add_game_to_favorites '{json.dumps(current_game_board_config)}' <unique_key>`"
               f"so you can repeat this game.")
 
-        save_game_backup(game, game_id)
+        save_journal = SaveJournal(get_backup_file_path(game_id))
+        save_journal.write_base(game)
     else:
         try:
-            saved_game = load_game_from_backup(game_id=args.game_id)
-            random.seed(saved_game.random_seed)
-            game = Game.copy_from(game=saved_game, auto_rng=args.auto_rng)
+            game = load_game_from_journal(get_backup_file_path(game_id=args.game_id), auto_rng=args.auto_rng)
         except FileNotFoundError:
             print(f"No save file found for game {args.game_id} at {get_backup_file_path(game_id=args.game_id)}.")
             exit(1)
+        if game.game_over:
+            print(f"Game {game.game_id} is already over. Run `./replay_game {game.game_id} <turn>` to look back "
+                  f"at any of its turns.")
+            exit(0)
+        save_journal = SaveJournal(get_backup_file_path(game.game_id))
 
     game.display_all_info_each_turn = args.omniscient
     if not args.auto_play:
-        game.run(auto_play=False)
+        game.run(auto_play=False, save_journal=save_journal)
     else:
-        heat_map = game.original_board.get_heat_map()
+        heat_map = game.board.get_heat_map()
         plt.imshow(heat_map, cmap='Wistia')
         print(f"Board movement heat map:\n{heat_map}")
         print(f"Close heat map plot to continue.")
         plt.show()
 
-        list_of_time_taken_in_secs = []
-        list_of_num_executed_moves = []
-        for i in range(args.num_auto_play_profile_times):
-            time_taken_in_secs, num_executed_moves = game.run(auto_play=args.auto_play,
-                                                              auto_turn_time_secs=args.auto_play_turn_time)
-            print(f"Games played: {i}")
-            print(f"Time taken to complete the game: {time_taken_in_secs} seconds.")
-            print(f"{num_executed_moves} total moves made.")
-            list_of_time_taken_in_secs.append(time_taken_in_secs)
-            list_of_num_executed_moves.append(num_executed_moves)
-
-            print(f"Average time taken to complete game in sec (over {i + 1} games)): "
-                  f"{sum(list_of_time_taken_in_secs) / len(list_of_time_taken_in_secs)}")
-            print(f"List of times taken: {list_of_time_taken_in_secs}")
-            print(f"Average number of total moves made (over {i + 1} games): "
-                  f"{sum(list_of_num_executed_moves) / len(list_of_num_executed_moves)}")
-            print(f"List of moves made: {list_of_num_executed_moves}")
-
-            game.reset()
+        if args.num_auto_play_profile_times == 1:
+            game.run(auto_play=args.auto_play, auto_turn_time_secs=args.auto_play_turn_time, save_journal=save_journal)
+        else:
+            print(f"Profiling {args.num_auto_play_profile_times} headless auto play games on {args.num_workers} "
+                  f"workers...")
+            stats = run_monte_carlo(board=game.board, player_names=[player.name for player in game.players],
+                                    num_games=args.num_auto_play_profile_times, random_seed=game.random_seed,
+                                    num_workers=args.num_workers)
+            print(stats.report())
@@ -0,0 +1,36 @@
+import signal
+
+import pytest
+
+from src.game_snapshot import serialize_snapshot
+from src.save_journal import SaveJournal, load_game_from_journal
+from tests.utils import create_game
+
+
+@pytest.fixture(autouse=True)
+def restore_sigint_handler():
+    # Game.run installs its own SIGINT handler when it is not headless.
+    sigint_handler = signal.getsignal(signal.SIGINT)
+    yield
+    signal.signal(signal.SIGINT, sigint_handler)
+
+
+@pytest.mark.parametrize('seed', [1, 2])
+def test_autosaved_game_reloads_to_its_final_snapshot(tmp_path, seed):
+    file_path = str(tmp_path / 'game.journal')
+    game = create_game(seed)
+    save_journal = SaveJournal(file_path)
+    save_journal.write_base(game)
+    game.run(auto_play=True, auto_turn_time_secs=0, save_journal=save_journal)
+    assert game.autosave is None
+    loaded_game = load_game_from_journal(file_path, auto_rng=True)
+    assert loaded_game.game_over
+    assert serialize_snapshot(loaded_game.snapshot()) == serialize_snapshot(game.snapshot())
+    assert loaded_game.decisions.decisions == game.decisions.decisions
+
+
+def test_game_finishes_when_autosave_cannot_write(tmp_path):
+    game = create_game(0)
+    save_journal = SaveJournal(str(tmp_path / 'missing' / 'game.journal'))
+    game.run(auto_play=True, auto_turn_time_secs=0, save_journal=save_journal)
+    assert game.game_over
@@ -0,0 +1,23 @@
+from src.batch_simulator import BatchSimulator, ks_statistic, ks_critical_value
+from src.monte_carlo import run_monte_carlo
+from tests.utils import generate_board
+
+PLAYER_NAMES = ['Player 1', 'Player 2', 'Player 3']
+
+
+def test_simulated_game_lengths_match_monte_carlo_games():
+    board = generate_board(3)
+    num_games, num_reference_games = 1000, 200
+    stats = BatchSimulator(board=board, player_names=PLAYER_NAMES, num_slots=512, seed=3).run(num_games=num_games)
+    reference_stats = run_monte_carlo(board=board, player_names=PLAYER_NAMES, num_games=num_reference_games,
+                                      random_seed=3, num_workers=2)
+    assert len(stats.executed_moves) == num_games
+    assert ks_statistic(stats.executed_moves, reference_stats.executed_moves) <= \
+        ks_critical_value(num_games, num_reference_games, alpha=0.001)
+
+
+def test_ks_statistic_separates_different_distributions():
+    board = generate_board(3)
+    stats = BatchSimulator(board=board, player_names=PLAYER_NAMES, num_slots=512, seed=3).run(num_games=300)
+    assert ks_statistic(stats.executed_moves, stats.executed_moves) == 0
+    assert ks_statistic(stats.executed_moves, stats.executed_moves * 2) > ks_critical_value(300, 300, alpha=0.001)
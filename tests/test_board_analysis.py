@@ -0,0 +1,54 @@
+from collections import deque
+
+import pytest
+
+from src.board_analysis import analyze_board_paths, UNREACHABLE
+from src.datatypes import MoveOutcome
+from tests.utils import generate_board
+
+BOARD_CONFIGS = [{}, dict(height=10, width=12, num_inner_walls=40, num_treasures=3)]
+
+
+def get_move_distances(board, start_cell):
+    # Moves needed to reach every cell from start_cell, following the landing cells of the transition kernel.
+    kernel = board.transition_kernel
+    distances = {start_cell: 0}
+    queue = deque([start_cell])
+    while queue:
+        cell = queue.popleft()
+        for landing_cell, outcome in zip(kernel.landing_cells[cell], kernel.outcomes[cell]):
+            if outcome in (MoveOutcome.BLOCKED.value, MoveOutcome.EXIT.value):
+                continue
+            if int(landing_cell) not in distances:
+                distances[int(landing_cell)] = distances[cell] + 1
+                queue.append(int(landing_cell))
+    return distances
+
+
+def get_moves_to_exit(board, start_cell):
+    # Moves needed to leave the maze from start_cell, counting the move out through the exit.
+    outcomes = board.transition_kernel.outcomes
+    exiting_outcomes = (MoveOutcome.EXIT.value, MoveOutcome.FLUSHED_INTO_EXIT.value)
+    distances = get_move_distances(board, start_cell)
+    moves_to_exit = [distance + 1 for cell, distance in distances.items()
+                     if any(outcome in exiting_outcomes for outcome in outcomes[cell])]
+    return min(moves_to_exit) if moves_to_exit else None
+
+
+@pytest.mark.parametrize('board_config', BOARD_CONFIGS)
+@pytest.mark.parametrize('seed', range(3))
+def test_path_metrics_match_a_breadth_first_search_from_every_spawn(seed, board_config):
+    board = generate_board(seed, **board_config)
+    metrics = analyze_board_paths(board)
+    treasure_cells = [x * board.height + y for x in range(board.width) for y in range(board.height)
+                      if board.grid[x][y].has_treasure()]
+    treasure_moves_to_exit = {cell: get_moves_to_exit(board, cell) for cell in treasure_cells}
+    for i, spawn_cell in enumerate(metrics.spawn_cells.tolist()):
+        distances = get_move_distances(board, spawn_cell)
+        routes = [(distances[cell], treasure_moves_to_exit[cell]) for cell in treasure_cells
+                  if cell in distances and treasure_moves_to_exit[cell] is not None]
+        if not routes:
+            assert metrics.total[i] == metrics.spawn_to_treasure[i] == metrics.treasure_to_exit[i] == UNREACHABLE
+            continue
+        assert metrics.total[i] == min(to_treasure + to_exit for to_treasure, to_exit in routes)
+        assert (metrics.spawn_to_treasure[i], metrics.treasure_to_exit[i]) in routes
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from src.board_cache import BoardCache
+from src.board_serialization import serialize_board
+from tests.utils import generate_board
+
+BOARD_CONFIG = dict(height=8, width=8, river_max_num_turns=2, num_marshes=8, num_river_tiles=12, num_hospitals=1,
+                    num_shops=1, num_aa_portal_sets=1, num_ab_portal_sets=1, num_abc_portal_sets=1, num_treasures=2,
+                    num_inner_walls=20, num_exits=2)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_board_survives_cache_round_trip(tmp_path, seed):
+    board = generate_board(seed, **BOARD_CONFIG)
+    board_cache = BoardCache(cache_dir=str(tmp_path))
+    board_cache.put(seed, BOARD_CONFIG, board)
+    cached_board = board_cache.get(seed, BOARD_CONFIG, auto_rng=True)
+    assert serialize_board(cached_board) == serialize_board(board)
+    assert (cached_board.wall_index.blocked == board.wall_index.blocked).all()
+    assert (cached_board.transition_kernel.landing_cells == board.transition_kernel.landing_cells).all()
+    assert (cached_board.transition_kernel.outcomes == board.transition_kernel.outcomes).all()
+    assert cached_board.safe_locations == board.safe_locations
+
+
+def test_board_cache_misses_on_a_different_config(tmp_path):
+    board_cache = BoardCache(cache_dir=str(tmp_path))
+    board_cache.put(0, BOARD_CONFIG, generate_board(0, **BOARD_CONFIG))
+    assert board_cache.get(1, BOARD_CONFIG) is None
+    assert board_cache.get(0, dict(BOARD_CONFIG, num_inner_walls=10)) is None
+
+
+def test_board_cache_generates_and_stores_on_a_miss(tmp_path):
+    board_cache = BoardCache(cache_dir=str(tmp_path))
+    board = board_cache.get_or_generate(seed=4, board_config=BOARD_CONFIG)
+    assert serialize_board(board) == serialize_board(generate_board(4, **BOARD_CONFIG))
+    assert serialize_board(board_cache.get(4, BOARD_CONFIG)) == serialize_board(board)
+
+
+def test_board_cache_drops_corrupt_entries(tmp_path):
+    board_cache = BoardCache(cache_dir=str(tmp_path))
+    board_cache.put(0, BOARD_CONFIG, generate_board(0, **BOARD_CONFIG))
+    file_path = board_cache._get_file_path(BoardCache.key(0, BOARD_CONFIG))
+    with open(file_path, 'wb') as f:
+        f.write(b'not a board')
+    assert board_cache.get(0, BOARD_CONFIG) is None
+    assert not os.path.exists(file_path)
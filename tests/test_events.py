@@ -0,0 +1,22 @@
+import json
+
+from src.datatypes import EventType
+from src.events import JsonlSink, CounterSink
+from src.game import Game
+from tests.utils import generate_board
+
+
+def test_headless_game_closes_its_sinks_with_every_event_written(tmp_path):
+    file_path = str(tmp_path / 'events.jsonl')
+    board = generate_board(0)
+    players = board.generate_safe_players(['Player 1', 'Player 2', 'Player 3'])
+    jsonl_sink, counter_sink = JsonlSink(file_path), CounterSink()
+    game = Game(board=board, players=players, auto_rng=True, random_seed=0, event_sinks=[jsonl_sink, counter_sink])
+    game.run(auto_play=True, headless=True)
+    assert jsonl_sink._file.closed
+    with open(file_path) as f:
+        event_types = [json.loads(line)['type'] for line in f]
+    assert len(event_types) == sum(counter_sink.counts.values())
+    assert event_types[-1] == EventType.GAME_OVER.name
+    assert counter_sink.counts[EventType.TILE_ENTERED] == counter_sink.counts[EventType.MOVED]
+    assert counter_sink.counts[EventType.XP_GAINED] > 0
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+import src.board
+from src.board import _sample_spread_out_locations
+from src.exceptions import GenerationAttemptsExceeded
+from src.generation_budget import GenerationBudget
+from src.location import Location
+
+
+def get_cluster_locations(num_clusters):
+    # 4x2 clusters of locations, each too close together to hold two placements and far enough from the others.
+    return [Location(x=10 * cluster + x, y=y) for cluster in range(num_clusters) for x in range(4) for y in range(2)]
+
+
+def sample_spread_out_locations(candidate_locations, num_locations, seed=0):
+    return _sample_spread_out_locations(candidate_locations=candidate_locations, num_locations=num_locations,
+                                        min_manhattan_distance=5, rng=random.Random(seed),
+                                        generation_budget=GenerationBudget())
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_spread_out_locations_take_one_location_per_cluster(seed):
+    locations = sample_spread_out_locations(get_cluster_locations(4), num_locations=4, seed=seed)
+    assert sorted(location.x // 10 for location in locations) == [0, 1, 2, 3]
+
+
+def test_spread_out_locations_are_none_after_a_complete_search():
+    assert sample_spread_out_locations(get_cluster_locations(3), num_locations=4) is None
+
+
+def test_spread_out_locations_run_out_of_attempts_at_the_search_bound(monkeypatch):
+    monkeypatch.setattr(src.board, 'MAX_PLACEMENT_EXPANSIONS_PER_CANDIDATE', 0)
+    with pytest.raises(GenerationAttemptsExceeded):
+        sample_spread_out_locations(get_cluster_locations(4), num_locations=4)
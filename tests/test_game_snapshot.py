@@ -0,0 +1,49 @@
+import pytest
+
+from src.game_snapshot import serialize_snapshot, deserialize_snapshot
+from tests.utils import create_game, play_turns
+
+
+def get_tile_treasure_counts(board):
+    return {cell: board.get_tile(location).num_treasure for cell, location in enumerate(board.all_locations)
+            if board.get_tile(location).num_treasure > 0}
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_restore_round_trips_a_snapshot(seed):
+    game = create_game(seed)
+    play_turns(game, num_turns=40)
+    snapshot = game.snapshot()
+    play_turns(game, num_turns=40)
+    game.restore(snapshot)
+    assert serialize_snapshot(game.snapshot()) == serialize_snapshot(snapshot)
+    assert get_tile_treasure_counts(game.board) == snapshot.treasure_counts
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_reset_returns_to_the_initial_snapshot(seed):
+    game = create_game(seed)
+    play_turns(game)
+    assert game.game_over
+    game.reset()
+    assert serialize_snapshot(game.snapshot()) == serialize_snapshot(game.initial_snapshot)
+    assert get_tile_treasure_counts(game.board) == game.initial_snapshot.treasure_counts
+    assert not game.decisions.decisions
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_restored_game_plays_on_like_the_original(seed):
+    game = create_game(seed)
+    play_turns(game, num_turns=30)
+    snapshot, rng_state = game.snapshot(), game.rng.getstate()
+    expected_snapshots = play_turns(game, num_turns=60)
+    game.restore(snapshot)
+    game.rng.setstate(rng_state)
+    assert play_turns(game, num_turns=60) == expected_snapshots
+
+
+def test_snapshot_survives_serialization():
+    game = create_game(0)
+    play_turns(game, num_turns=25)
+    snapshot = game.snapshot()
+    assert vars(deserialize_snapshot(serialize_snapshot(snapshot))) == vars(snapshot)
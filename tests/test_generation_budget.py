@@ -0,0 +1,11 @@
+import pytest
+
+from src.exceptions import GenerationBudgetExceeded, GenerationAttemptsExceeded
+from tests.utils import generate_board
+
+
+def test_time_limit_gives_up_without_retrying():
+    with pytest.raises(GenerationBudgetExceeded) as exc_info:
+        generate_board(0, generation_time_limit_secs=0)
+    assert not isinstance(exc_info.value, GenerationAttemptsExceeded)
+    assert 'Could not generate the board' not in str(exc_info.value)
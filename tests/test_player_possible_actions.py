@@ -0,0 +1,62 @@
+import pytest
+
+from src.game_snapshot import PLAYER_ID
+from src.player import Player
+from tests.utils import create_game, play_turns
+
+NUM_SEEDS = 20
+
+
+def describe_actions(actions):
+    return [(type(action).__name__, action.description()) for action in actions]
+
+
+@pytest.fixture
+def uncached_possible_actions(monkeypatch):
+    get_possible_actions = Player.get_possible_actions
+
+    def get_uncached_possible_actions(self, *args, **kwargs):
+        self.invalidate_possible_actions()
+        return get_possible_actions(self, *args, **kwargs)
+
+    monkeypatch.setattr(Player, 'get_possible_actions', get_uncached_possible_actions)
+
+
+def play_game(seed):
+    game = create_game(seed)
+    snapshots = play_turns(game)
+    # Player ids are random, so they differ between two games of the same seed.
+    for snapshot_data in snapshots:
+        for player_state in snapshot_data['player_states']:
+            del player_state[PLAYER_ID]
+    return game.decisions.decisions, snapshots
+
+
+@pytest.fixture(scope='module')
+def cached_games():
+    return [play_game(seed) for seed in range(NUM_SEEDS)]
+
+
+def test_uncached_games_make_the_same_decisions(cached_games, uncached_possible_actions):
+    for seed in range(NUM_SEEDS):
+        assert play_game(seed) == cached_games[seed]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_cached_possible_actions_match_a_fresh_computation(monkeypatch, seed):
+    get_possible_actions = Player.get_possible_actions
+    num_cache_hits = 0
+
+    def get_checked_possible_actions(self, *args, **kwargs):
+        nonlocal num_cache_hits
+        cached_actions = self._possible_actions
+        actions = get_possible_actions(self, *args, **kwargs)
+        if actions is cached_actions:
+            num_cache_hits += 1
+        self.invalidate_possible_actions()
+        assert describe_actions(get_possible_actions(self, *args, **kwargs)) == describe_actions(actions)
+        return actions
+
+    monkeypatch.setattr(Player, 'get_possible_actions', get_checked_possible_actions)
+    play_turns(create_game(seed))
+    assert num_cache_hits > 0
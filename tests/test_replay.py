@@ -0,0 +1,76 @@
+import signal
+
+import pytest
+
+from src.exceptions import ReplayDiverged
+from src.game_snapshot import serialize_snapshot
+from src.replay import ReplayEngine
+from src.save_journal import SaveJournal, load_game_from_journal
+from tests.utils import create_game, play_turns
+
+
+def record_game(file_path, seed):
+    # Plays a whole game, saves it and returns the serialized snapshot taken before every turn and after the last.
+    game = create_game(seed)
+    snapshots = play_turns(game)
+    snapshots.append(serialize_snapshot(game.snapshot()))
+    SaveJournal(file_path).write_base(game)
+    return snapshots
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_replay_reproduces_the_final_snapshot(tmp_path, seed):
+    file_path = str(tmp_path / 'game.journal')
+    snapshots = record_game(file_path, seed)
+    replay_engine = ReplayEngine(load_game_from_journal(file_path, auto_rng=True), checkpoint_interval=10)
+    assert replay_engine.num_turns == len(snapshots) - 1
+    game = replay_engine.run()
+    assert game.game_over
+    assert serialize_snapshot(game.snapshot()) == snapshots[-1]
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_seek_reproduces_every_recorded_turn(tmp_path, seed):
+    file_path = str(tmp_path / 'game.journal')
+    snapshots = record_game(file_path, seed)
+    replay_engine = ReplayEngine(load_game_from_journal(file_path, auto_rng=True), checkpoint_interval=10)
+    num_turns = replay_engine.num_turns
+    # Forwards, backwards past checkpoints and back to the start.
+    for turn in [num_turns // 2, 3, num_turns, num_turns - 1, 11, 10, 0, 1] + list(range(num_turns, -1, -17)):
+        game = replay_engine.seek(turn)
+        assert serialize_snapshot(game.snapshot()) == snapshots[turn]
+    assert all(turn % 10 == 0 for turn in replay_engine.checkpoints)
+
+
+def test_seek_rejects_turns_outside_the_recording(tmp_path):
+    file_path = str(tmp_path / 'game.journal')
+    record_game(file_path, seed=3)
+    replay_engine = ReplayEngine(load_game_from_journal(file_path, auto_rng=True))
+    with pytest.raises(ValueError):
+        replay_engine.seek(replay_engine.num_turns + 1)
+    with pytest.raises(ValueError):
+        replay_engine.seek(-1)
+
+
+def test_replay_detects_missing_decisions(tmp_path):
+    file_path = str(tmp_path / 'game.journal')
+    record_game(file_path, seed=3)
+    game = load_game_from_journal(file_path, auto_rng=True)
+    del game.decisions.decisions[-5:]
+    with pytest.raises(ReplayDiverged):
+        ReplayEngine(game).run()
+
+
+def test_replay_of_an_autosaved_game_matches_it(tmp_path):
+    file_path = str(tmp_path / 'game.journal')
+    game = create_game(1)
+    save_journal = SaveJournal(file_path)
+    save_journal.write_base(game)
+    sigint_handler = signal.getsignal(signal.SIGINT)
+    try:
+        game.run(auto_play=True, auto_turn_time_secs=0, save_journal=save_journal)
+    finally:
+        signal.signal(signal.SIGINT, sigint_handler)
+    replay_engine = ReplayEngine(load_game_from_journal(file_path, auto_rng=True))
+    assert replay_engine.num_turns == len(game.decisions.turn_starts)
+    assert serialize_snapshot(replay_engine.run().snapshot()) == serialize_snapshot(game.snapshot())
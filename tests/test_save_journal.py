@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from src.game_snapshot import serialize_snapshot
+from src.save_journal import SaveJournal, load_game_from_journal
+from tests.utils import create_game, play_turns
+
+
+def record_journal(file_path, seed, num_turns, compact_every_num_deltas=256):
+    # Saves the game after every turn, as autosave does, and returns the serialized snapshot of each save.
+    game = create_game(seed)
+    save_journal = SaveJournal(file_path, compact_every_num_deltas=compact_every_num_deltas)
+    save_journal.write_base(game)
+    saved_snapshots = [serialize_snapshot(game.snapshot())]
+    for _ in range(num_turns):
+        if not play_turns(game, num_turns=1):
+            break
+        save_journal.append(game)
+        saved_snapshots.append(serialize_snapshot(game.snapshot()))
+    return game, saved_snapshots
+
+
+@pytest.mark.parametrize('compact_every_num_deltas', [256, 7])
+def test_journal_loads_the_last_saved_turn(tmp_path, compact_every_num_deltas):
+    file_path = str(tmp_path / 'game.journal')
+    game, saved_snapshots = record_journal(file_path, seed=1, num_turns=60,
+                                           compact_every_num_deltas=compact_every_num_deltas)
+    loaded_game = load_game_from_journal(file_path, auto_rng=True)
+    assert serialize_snapshot(loaded_game.snapshot()) == saved_snapshots[-1]
+    assert serialize_snapshot(loaded_game.initial_snapshot) == serialize_snapshot(game.initial_snapshot)
+    assert loaded_game.decisions.decisions == game.decisions.decisions
+    assert loaded_game.decisions.turn_starts == game.decisions.turn_starts
+
+
+@pytest.mark.parametrize('num_cut_bytes', [2, 10])
+def test_journal_skips_a_truncated_last_delta(tmp_path, num_cut_bytes):
+    file_path = str(tmp_path / 'game.journal')
+    game, saved_snapshots = record_journal(file_path, seed=1, num_turns=30)
+    # Cut the last delta short, as a crash in the middle of writing it would.
+    with open(file_path, 'rb+') as f:
+        f.truncate(os.path.getsize(file_path) - num_cut_bytes)
+    loaded_game = load_game_from_journal(file_path, auto_rng=True)
+    assert serialize_snapshot(loaded_game.snapshot()) == saved_snapshots[-2]
+    num_decisions = saved_snapshots[-2]['num_decisions']
+    assert loaded_game.decisions.decisions == game.decisions.decisions[:num_decisions]
+
+
+def test_game_from_journal_plays_on_and_saves_again(tmp_path):
+    file_path = str(tmp_path / 'game.journal')
+    record_journal(file_path, seed=2, num_turns=20)
+    loaded_game = load_game_from_journal(file_path, auto_rng=True)
+    for player in loaded_game.players:
+        player.narrate = False
+        player.events = loaded_game.events
+    save_journal = SaveJournal(file_path)
+    play_turns(loaded_game, num_turns=10)
+    save_journal.append(loaded_game)
+    reloaded_game = load_game_from_journal(file_path, auto_rng=True)
+    assert serialize_snapshot(reloaded_game.snapshot()) == serialize_snapshot(loaded_game.snapshot())
@@ -0,0 +1,94 @@
+import pytest
+
+from src.board import Board
+from src.borders import Exit
+from src.datatypes import Direction, MoveOutcome, TileType
+from src.exceptions import ExitFound, MoveBlockedByWall
+from src.location import Location
+from src.tiles import TileFactory, River
+from src.wall_index import DIRECTION_DELTAS
+from tests.test_wall_index import get_wall_pairs
+from tests.utils import generate_board
+
+
+def old_move(location, direction, board, wall_pairs):
+    # Location.move before the transition kernel: a pairwise wall check, then the exits on the way out of the board.
+    x_delta, y_delta = DIRECTION_DELTAS[direction]
+    next_location = Location(location.x + x_delta, location.y + y_delta)
+    if not next_location.in_bounds(board_height=board.height, board_width=board.width):
+        for ex in board.exits:
+            if location == ex.location and direction == ex.direction:
+                raise ExitFound('Exit found.')
+        raise MoveBlockedByWall(f'Cannot move {direction.name}. Blocked by wall.')
+    if (location, next_location) in wall_pairs or (next_location, location) in wall_pairs:
+        raise MoveBlockedByWall(f'Cannot move {direction.name}. Blocked by wall.')
+    return next_location
+
+
+def old_transition(location, direction, board, wall_pairs):
+    # What a move did to a player without treasure before the kernel, from Location.move and the tile's actions.
+    try:
+        next_location = old_move(location, direction, board, wall_pairs)
+    except ExitFound:
+        return location, MoveOutcome.EXIT
+    except MoveBlockedByWall:
+        return location, MoveOutcome.BLOCKED
+    tile = board.get_tile(next_location)
+    if tile.type == TileType.PORTAL:
+        return tile.exit_location, MoveOutcome.TELEPORTED
+    if tile.type == TileType.RIVER:
+        try:
+            return old_move(next_location, tile.direction, board, wall_pairs), MoveOutcome.FLUSHED
+        except ExitFound:
+            return next_location, MoveOutcome.FLUSHED_INTO_EXIT
+        except MoveBlockedByWall:
+            return next_location, MoveOutcome.FLUSHED
+    if tile.type == TileType.MARSH:
+        return next_location, MoveOutcome.MARSH
+    return next_location, MoveOutcome.MOVED
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_transition_kernel_matches_old_moves(seed):
+    board = generate_board(seed)
+    wall_pairs = get_wall_pairs(board)
+    for cell, location in enumerate(board.all_locations):
+        for direction in Direction:
+            landing_location, outcome = old_transition(location, direction, board, wall_pairs)
+            assert board.transition_kernel.outcome(cell, direction) == outcome
+            assert board.transition_kernel.landing_cell(cell, direction) == board.get_cell(landing_location)
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_location_move_matches_old_move(seed):
+    board = generate_board(seed)
+    wall_pairs = get_wall_pairs(board)
+    for location in board.all_locations:
+        for direction in Direction:
+            try:
+                expected = old_move(location, direction, board, wall_pairs)
+            except (ExitFound, MoveBlockedByWall) as e:
+                expected = type(e)
+            moved_location = location.copy()
+            try:
+                moved_location.move(direction, board)
+            except (ExitFound, MoveBlockedByWall) as e:
+                assert type(e) == expected
+            else:
+                assert moved_location == expected
+
+
+def test_transition_kernel_flushes_into_an_exit():
+    # Exit placement keeps exits off the end of rivers, so generated boards never flush a player out of the maze.
+    height, width = 4, 4
+    grid = [[TileFactory.create_static_tile(tile_type=TileType.SAFE, location=Location(x, y)) for y in range(height)]
+            for x in range(width)]
+    grid[0][1] = River(location=Location(0, 1), direction=Direction.LEFT)
+    board = Board(height=height, width=width, inner_walls=frozenset(), generate_contents=False, grid=grid,
+                  exits=[Exit(location=Location(0, 1), direction=Direction.LEFT)],
+                  safe_locations=[Location(3, 3)], seed=0)
+    landing_location, outcome = old_transition(Location(1, 1), Direction.LEFT, board, wall_pairs=set())
+    assert (landing_location, outcome) == (Location(0, 1), MoveOutcome.FLUSHED_INTO_EXIT)
+    cell = board.get_cell(Location(1, 1))
+    assert board.transition_kernel.outcome(cell, Direction.LEFT) == MoveOutcome.FLUSHED_INTO_EXIT
+    assert board.transition_kernel.landing_cell(cell, Direction.LEFT) == board.get_cell(Location(0, 1))
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from src.borders import get_wall_edge_locations
+from src.connectivity import WallConnectivity
+from tests.utils import generate_board
+
+
+def get_inner_edge_ids(height, width):
+    edge_ids = []
+    for x in range(width):
+        for y in range(height):
+            cell = x * height + y
+            if x + 1 < width:
+                edge_ids.append(2 * cell)
+            if y + 1 < height:
+                edge_ids.append(2 * cell + 1)
+    return edge_ids
+
+
+def walls_disconnect_board(height, width, inner_walls):
+    # The flood fill over pairs of wall locations that wall generation used before WallConnectivity.
+    wall_pairs = set()
+    for edge_id in inner_walls:
+        location_1, location_2 = get_wall_edge_locations(edge_id, board_height=height)
+        wall_pairs.add(frozenset([location_1.get_coordinates(), location_2.get_coordinates()]))
+    visited = {(0, 0)}
+    queue = [(0, 0)]
+    while queue:
+        x, y = queue.pop()
+        for neighbor in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= neighbor[0] < width and 0 <= neighbor[1] < height and neighbor not in visited and \
+                    frozenset([(x, y), neighbor]) not in wall_pairs:
+                visited.add(neighbor)
+                queue.append(neighbor)
+    return len(visited) != width * height
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_wall_connectivity_agrees_with_flood_fill_on_generated_boards(seed):
+    board = generate_board(seed)
+    connectivity = WallConnectivity(height=board.height, width=board.width)
+    for edge_id in sorted(board.inner_walls):
+        assert not connectivity.wall_disconnects_board(edge_id)
+        connectivity.add_wall(edge_id)
+    for edge_id in get_inner_edge_ids(board.height, board.width):
+        if edge_id not in board.inner_walls:
+            assert connectivity.wall_disconnects_board(edge_id) == \
+                walls_disconnect_board(board.height, board.width, set(board.inner_walls) | {edge_id})
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_wall_connectivity_agrees_with_flood_fill_while_walls_are_added(seed):
+    # Dense random walls close loops far more often than generated boards do.
+    height, width = 6, 7
+    rng = random.Random(seed)
+    connectivity = WallConnectivity(height=height, width=width)
+    inner_walls = set()
+    edge_ids = get_inner_edge_ids(height, width)
+    rng.shuffle(edge_ids)
+    for edge_id in edge_ids:
+        disconnects = walls_disconnect_board(height, width, inner_walls | {edge_id})
+        assert connectivity.wall_disconnects_board(edge_id) == disconnects
+        if not disconnects:
+            connectivity.add_wall(edge_id)
+            inner_walls.add(edge_id)
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from src.borders import get_wall_edge_locations
+from src.datatypes import Direction
+from src.location import Location
+from src.wall_index import WallIndex, DIRECTION_DELTAS
+from tests.utils import generate_board
+
+
+def get_wall_pairs(board):
+    wall_pairs = set()
+    for edge_id in board.inner_walls:
+        location_1, location_2 = get_wall_edge_locations(edge_id, board_height=board.height)
+        wall_pairs.add((location_1, location_2))
+    return wall_pairs
+
+
+def no_walls_block_straight_line(location_1, location_2, wall_pairs, board):
+    # A pairwise wall lookup for every edge the line crosses, not just the first one.
+    if not location_1.in_bounds(board_height=board.height, board_width=board.width) or \
+            not location_2.in_bounds(board_height=board.height, board_width=board.width):
+        return False
+    if location_1.x == location_2.x:
+        lower_y, higher_y = sorted((location_1.y, location_2.y))
+        steps = [(Location(location_1.x, y), Location(location_1.x, y + 1)) for y in range(lower_y, higher_y)]
+    else:
+        lower_x, higher_x = sorted((location_1.x, location_2.x))
+        steps = [(Location(x, location_1.y), Location(x + 1, location_1.y)) for x in range(lower_x, higher_x)]
+    return not any(step in wall_pairs or step[::-1] in wall_pairs for step in steps)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_wall_index_blocks_the_same_sides_as_pairwise_walls(seed):
+    board = generate_board(seed)
+    wall_pairs = get_wall_pairs(board)
+    wall_index = WallIndex(height=board.height, width=board.width, wall_edge_ids=board.inner_walls)
+    for location in board.all_locations:
+        for direction in Direction:
+            x_delta, y_delta = DIRECTION_DELTAS[direction]
+            next_location = Location(location.x + x_delta, location.y + y_delta)
+            expected = not next_location.in_bounds(board_height=board.height, board_width=board.width) or \
+                (location, next_location) in wall_pairs or (next_location, location) in wall_pairs
+            assert wall_index.is_blocked(location.x, location.y, direction) == expected
+    assert (wall_index.blocked == board.wall_index.blocked).all()
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_wall_index_straight_lines_match_pairwise_walls(seed):
+    board = generate_board(seed)
+    wall_pairs = get_wall_pairs(board)
+    rng = random.Random(seed)
+    for _ in range(500):
+        location_1 = rng.choice(board.all_locations)
+        if rng.random() < 0.5:
+            location_2 = Location(location_1.x, rng.choice([y for y in range(board.height) if y != location_1.y]))
+        else:
+            location_2 = Location(rng.choice([x for x in range(board.width) if x != location_1.x]), location_1.y)
+        assert board.wall_index.no_walls_block_straight_line(location_1, location_2) == \
+            no_walls_block_straight_line(location_1, location_2, wall_pairs, board)
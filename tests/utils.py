@@ -0,0 +1,30 @@
+from src.board import Board
+from src.exceptions import GameOver
+from src.game import Game
+from src.game_snapshot import serialize_snapshot
+
+
+def generate_board(seed: int, **board_config):
+    return Board(auto_rng=True, seed=seed, narrate=False, **board_config)
+
+
+def create_game(seed: int, num_players: int = 3, **board_config):
+    board = generate_board(seed, **board_config)
+    players = board.generate_safe_players([f"Player {i + 1}" for i in range(num_players)])
+    game = Game(board=board, players=players, game_id=f'test-{seed}', auto_rng=True, random_seed=seed)
+    for player in game.players:
+        player.narrate = False
+        player.events = game.events
+    return game
+
+
+def play_turns(game: Game, num_turns: int = None):
+    # Plays headless auto play turns one at a time and returns the serialized snapshot taken before each of them.
+    snapshots = []
+    while not game.game_over and (num_turns is None or len(snapshots) < num_turns):
+        snapshots.append(serialize_snapshot(game.snapshot()))
+        try:
+            game.play_turn(auto_play=True, auto_turn_time_secs=0, headless=True)
+        except GameOver:
+            pass
+    return snapshots